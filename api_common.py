@@ -0,0 +1,954 @@
+"""
+Request validation and response shaping shared by the Flask app (app.py)
+and its asyncio counterpart (async_app.py), so both answer every route
+identically.
+
+Nothing here touches the web framework or the database. Parsers take the
+decoded JSON body or the query-string MultiDict and raise ApiError for
+client errors; response builders return (payload, status) tuples that
+the apps pass to their own jsonify(). Payloads may hold datetimes and
+other driver types as-is; json_provider encodes them. The *_json_response
+builders return an already encoded body instead of a payload.
+"""
+import csv
+import hashlib
+import hmac
+import io
+import zlib
+from datetime import datetime, timedelta
+
+from badge_tokens import BadgeError, signer as badge_signer
+from config import Config
+from employee_import import EMPLOYEE_ID_PATTERN, read_csv, read_json
+from json_provider import dumps, splice_json
+from queries import EMPLOYEE_FIELDS, EMPLOYEE_SUMMARY_SORTS
+
+
+class ApiError(Exception):
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+    def response(self):
+        return {'success': False, 'message': self.message}, self.status
+
+
+class BadgeRejected(ApiError):
+    """A scanned code denied by badge_tokens before any database access."""
+
+    def __init__(self, error):
+        super().__init__(error.message, 403)
+        self.reason = error.reason
+
+    def response(self):
+        return {
+            'success': False,
+            'message': f'Akses ditolak. {self.message}',
+            'timestamp': datetime.now().isoformat(),
+            'status': 'DENIED',
+            'reason': self.reason
+        }, self.status
+
+
+def database_unavailable():
+    return {
+        'success': False,
+        'message': 'Database connection error'
+    }, 500
+
+
+def error_response(e):
+    if isinstance(e, ApiError):
+        return e.response()
+    return {
+        'success': False,
+        'message': f'Terjadi kesalahan: {str(e)}'
+    }, 500
+
+
+def metrics_unavailable_response():
+    return {
+        'success': False,
+        'message': 'Metrics tidak aktif (METRICS_ENABLED=False atau prometheus_client tidak terpasang)'
+    }, 404
+
+
+def home_response():
+    return {
+        'message': 'QR Scanner Backend API with PostgreSQL',
+        'version': '2.0.0',
+        'database': 'PostgreSQL',
+        'endpoints': {
+            'scan': '/api/scan',
+            'scan_batch': '/api/scan/batch',
+            'logs': '/api/logs',
+            'logs_export': '/api/logs/export',
+            'logs_stream': '/api/logs/stream',
+            'employees': '/api/employees',
+            'employees_import': '/api/employees/import',
+            'employees_status': '/api/employees/status',
+            'employees_summary': '/api/employees/summary',
+            'badges': '/api/badges',
+            'statistics': '/api/statistics',
+            'pool': '/api/pool',
+            'cache': '/api/cache',
+            'log_writer': '/api/log-writer',
+            'health': '/api/health',
+            'health_live': '/api/health/live',
+            'health_ready': '/api/health/ready',
+            'metrics': '/metrics'
+        }
+    }, 200
+
+
+# Conditional GET
+
+def make_etag(*parts):
+    """Strong ETag from a version marker (e.g. get_employees_version())."""
+    digest = hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match uses the weak comparison, so a W/ prefix is ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+
+def cache_headers(etag):
+    """
+    Browsers revalidate every time (max-age=0); a shared cache such as the
+    bundled nginx may reuse the response for HTTP_CACHE_SHARED_MAX_AGE
+    seconds.
+    """
+    if Config.HTTP_CACHE_SHARED_MAX_AGE > 0:
+        cache_control = f'public, max-age=0, s-maxage={Config.HTTP_CACHE_SHARED_MAX_AGE}'
+    else:
+        cache_control = 'no-cache'
+    return {'ETag': etag, 'Cache-Control': cache_control}
+
+
+# Scans
+
+# scan_logs.device_id is VARCHAR(100) (migrations/0008)
+MAX_DEVICE_ID_LENGTH = 100
+
+
+def _device_id(value):
+    """Normalized device_id or None; ValueError if it would not fit scan_logs."""
+    if not value:
+        return None
+    device_id = str(value)
+    if len(device_id) > MAX_DEVICE_ID_LENGTH:
+        raise ValueError(f'device_id maksimal {MAX_DEVICE_ID_LENGTH} karakter')
+    return device_id
+
+
+def parse_scan_request(data):
+    """
+    `employee_id` holds the scanned QR content: a signed badge token or,
+    while legacy badges are accepted, a plain employee ID. Raises
+    BadgeRejected for codes that must be denied without a lookup.
+    Returns (employee_id, device_id); the optional device_id tells gates
+    behind the same proxy apart when debouncing repeat scans.
+    """
+    if not data or 'employee_id' not in data:
+        raise ApiError('Employee ID tidak ditemukan dalam request')
+    try:
+        employee_id = badge_signer.read(data['employee_id'])
+    except BadgeError as e:
+        raise BadgeRejected(e) from None
+    try:
+        device_id = _device_id(data.get('device_id'))
+    except ValueError as e:
+        raise ApiError(str(e)) from None
+    return employee_id, device_id
+
+
+def scan_response(employee_id, scan):
+    if scan['outcome'] == 'NOT_FOUND':
+        return {
+            'success': False,
+            'message': f'Akses ditolak. ID karyawan {employee_id} tidak terdaftar atau tidak aktif',
+            'employee_id': employee_id,
+            'timestamp': datetime.now().isoformat(),
+            'status': 'DENIED'
+        }, 403
+
+    if scan['outcome'] == 'ALREADY_SCANNED':
+        return {
+            'success': False,
+            'message': f'Akses ditolak untuk karyawan {employee_id}. Anda sudah melakukan scan hari ini',
+            'employee_id': employee_id,
+            'employee_name': scan['name'],
+            'employee_department': scan['department'],
+            'employee_position': scan['position'],
+            'timestamp': datetime.now().isoformat(),
+            'status': 'DENIED',
+            'reason': 'ALREADY_SCANNED_TODAY'
+        }, 403
+
+    return {
+        'success': True,
+        'message': f'Akses diterima untuk karyawan {employee_id}',
+        'employee_id': employee_id,
+        'employee_name': scan['name'],
+        'employee_department': scan['department'],
+        'employee_position': scan['position'],
+        'timestamp': datetime.now().isoformat(),
+        'status': 'ALLOWED'
+    }, 200
+
+
+def parse_client_time(value, timezone=None):
+    """
+    Device timestamp as a naive datetime in `timezone` (the database's, so
+    it lands on the same attendance day as a live scan); None means "now".
+    A timestamp without an offset is taken to be in that zone already.
+    """
+    if value in (None, ''):
+        return None
+    if not isinstance(value, str):
+        raise ValueError('scanned_at must be an ISO 8601 string')
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone).replace(tzinfo=None)
+    return parsed
+
+
+def parse_scan_batch(data, timezone=None):
+    """
+    Validate a /api/scan/batch body. Returns (results, accepted): `results`
+    has one slot per scan, already filled for invalid ones, and `accepted`
+    lists (index, employee_id, scan_time, device_id) for the rest.
+    `timezone` is DatabaseManager.timezone; scan times are wall-clock
+    times in it, like scan_logs.scan_time.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('scans'), list):
+        raise ApiError('Daftar scans diperlukan')
+
+    if len(data['scans']) > Config.SCAN_BATCH_MAX_SIZE:
+        raise ApiError(f'Maksimal {Config.SCAN_BATCH_MAX_SIZE} scan per request', 413)
+
+    received_at = datetime.now(timezone).replace(tzinfo=None)
+    latest_allowed = received_at + timedelta(seconds=Config.SCAN_BATCH_MAX_CLOCK_SKEW)
+    earliest_allowed = received_at - timedelta(seconds=Config.SCAN_BATCH_MAX_AGE)
+    try:
+        default_device = _device_id(data.get('device_id'))
+    except ValueError as e:
+        raise ApiError(str(e)) from None
+
+    results = [None] * len(data['scans'])
+    accepted = []
+
+    for index, entry in enumerate(data['scans']):
+        try:
+            if not isinstance(entry, dict) or not str(entry.get('employee_id') or '').strip():
+                raise ValueError('Employee ID tidak ditemukan')
+            scan_time = parse_client_time(entry.get('scanned_at'), timezone) or received_at
+            if scan_time > latest_allowed:
+                raise ValueError('Waktu scan berada di masa depan')
+            if scan_time < earliest_allowed:
+                raise ValueError(f'Waktu scan lebih dari {Config.SCAN_BATCH_MAX_AGE / 3600:g} jam yang lalu')
+            # Expiry is judged on receipt: scanned_at is the client's claim,
+            # and backdating it must not revive an expired badge
+            employee_id = badge_signer.read(entry['employee_id'])
+            device_id = _device_id(entry.get('device_id')) or default_device
+        except BadgeError as e:
+            results[index] = {
+                'index': index,
+                'employee_id': None,
+                'success': False,
+                'message': f'Akses ditolak. {e.message}',
+                'status': 'DENIED',
+                'reason': e.reason
+            }
+            continue
+        except ValueError as e:
+            results[index] = {
+                'index': index,
+                'employee_id': entry.get('employee_id') if isinstance(entry, dict) else None,
+                'success': False,
+                'message': f'Scan tidak valid: {str(e)}',
+                'status': 'DENIED',
+                'reason': 'INVALID_SCAN'
+            }
+            continue
+
+        accepted.append((index, employee_id, scan_time, device_id))
+
+    return results, accepted
+
+
+def batch_scan_item(index, employee_id, scan):
+    item = {
+        'index': index,
+        'employee_id': employee_id,
+        'timestamp': scan['scan_time'].isoformat()
+    }
+
+    if scan['outcome'] == 'NOT_FOUND':
+        item.update({
+            'success': False,
+            'message': f'Akses ditolak. ID karyawan {employee_id} tidak terdaftar atau tidak aktif',
+            'status': 'DENIED'
+        })
+        return item
+
+    item.update({
+        'employee_name': scan['name'],
+        'employee_department': scan['department'],
+        'employee_position': scan['position']
+    })
+
+    if scan['outcome'] == 'ALREADY_SCANNED':
+        item.update({
+            'success': False,
+            'message': f'Akses ditolak untuk karyawan {employee_id}. Anda sudah melakukan scan hari ini',
+            'status': 'DENIED',
+            'reason': 'ALREADY_SCANNED_TODAY'
+        })
+    else:
+        item.update({
+            'success': True,
+            'message': f'Akses diterima untuk karyawan {employee_id}',
+            'status': 'ALLOWED'
+        })
+    return item
+
+
+def scan_batch_response(results, accepted, scans):
+    for (index, employee_id, _, _), scan in zip(accepted, scans):
+        results[index] = batch_scan_item(index, employee_id, scan)
+
+    allowed = sum(1 for result in results if result['status'] == 'ALLOWED')
+
+    return {
+        'success': True,
+        'total': len(results),
+        'allowed': allowed,
+        'denied': len(results) - allowed,
+        'results': results
+    }, 200
+
+
+# Badges
+
+BADGE_ISSUE_MAX_SIZE = 1000
+
+
+def check_badge_issue_auth(authorization):
+    """POST /api/badges mints valid badges, so it needs BADGE_ISSUE_API_KEY."""
+    if not Config.BADGE_ISSUE_API_KEY:
+        raise ApiError('Penerbitan badge lewat API tidak aktif (BADGE_ISSUE_API_KEY kosong)', 404)
+    scheme, _, key = (authorization or '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(key.strip(), Config.BADGE_ISSUE_API_KEY):
+        raise ApiError('Tidak diizinkan', 401)
+    if not badge_signer.active_key_id:
+        raise ApiError('BADGE_SIGNING_KEYS belum diset, badge tidak bisa diterbitkan', 503)
+
+
+def parse_badge_issue_request(data):
+    """Body: {"employee_ids": [...], "ttl_days": 365}; returns (employee_ids, ttl_days)."""
+    if not isinstance(data, dict) or not isinstance(data.get('employee_ids'), list) or not data['employee_ids']:
+        raise ApiError('Daftar employee_ids diperlukan')
+    if len(data['employee_ids']) > BADGE_ISSUE_MAX_SIZE:
+        raise ApiError(f'Maksimal {BADGE_ISSUE_MAX_SIZE} badge per request', 413)
+
+    ttl_days = data.get('ttl_days')
+    if ttl_days is not None:
+        if isinstance(ttl_days, bool) or not isinstance(ttl_days, (int, float)) or not 0 < ttl_days <= 3650:
+            raise ApiError('ttl_days harus antara 0 dan 3650 hari')
+
+    employee_ids = list(dict.fromkeys(str(employee_id).strip().upper() for employee_id in data['employee_ids']))
+    return employee_ids, ttl_days
+
+
+def issue_badges(employees, ttl_days=None):
+    """
+    Sign a badge for each of `employees` (rows with employee_id and name).
+    Returns (badges, rejected); rejected lists employees whose ID cannot be
+    put in a token, e.g. one containing ':' saved before IDs were validated.
+    Raises ValueError only when there is no signing key at all.
+    """
+    if not badge_signer.active_key_id:
+        raise ValueError('BADGE_SIGNING_KEYS is not set, badges cannot be issued')
+
+    badges = []
+    rejected = []
+    for employee in employees:
+        try:
+            token, expires_at = badge_signer.issue(employee['employee_id'], ttl_days)
+        except ValueError as e:
+            rejected.append({'employee_id': employee['employee_id'], 'error': str(e)})
+            continue
+        badges.append({
+            'employee_id': employee['employee_id'],
+            'name': employee['name'],
+            'token': token,
+            'expires_at': expires_at
+        })
+    return badges, rejected
+
+
+def badge_issue_response(employee_ids, employees, ttl_days=None):
+    badges, rejected = issue_badges(employees, ttl_days)
+    found = {employee['employee_id'] for employee in employees}
+
+    return {
+        'success': True,
+        'key_id': badge_signer.active_key_id,
+        'issued': len(badges),
+        'badges': badges,
+        'rejected': rejected,
+        'not_found': [employee_id for employee_id in employee_ids if employee_id not in found]
+    }, 200
+
+
+# Scan logs
+
+def parse_logs_args(args):
+    cursor = args.get('cursor')
+    keyset = cursor is not None or args.get('pagination') == 'cursor'
+    limit = args.get('limit', 50, type=int)
+
+    return {
+        # Keyset mode: constant-time pages regardless of depth
+        'keyset': keyset,
+        'limit': max(1, min(limit, 1000)) if keyset else limit,
+        'offset': args.get('offset', 0, type=int),
+        'cursor': cursor or None,
+        'employee_id': args.get('employee_id'),
+        'status': args.get('status')
+    }
+
+
+def invalid_cursor_response():
+    return {
+        'success': False,
+        'message': 'Cursor tidak valid'
+    }, 400
+
+
+def logs_page_response(page, limit):
+    logs = page['logs']
+
+    return {
+        'success': True,
+        'logs': logs,
+        'count': len(logs),
+        'limit': limit,
+        'next_cursor': page['next_cursor'],
+        'prev_cursor': page['prev_cursor']
+    }, 200
+
+
+def logs_response(logs, limit, offset):
+    return {
+        'success': True,
+        'logs': logs,
+        'total': len(logs),
+        'limit': limit,
+        'offset': offset
+    }, 200
+
+
+def logs_json_response(logs_json, total, limit, offset):
+    """logs_response() for a page already encoded by PostgreSQL (JSON_AGG_ENABLED)."""
+    return splice_json({
+        'success': True,
+        'total': total,
+        'limit': limit,
+        'offset': offset
+    }, 'logs', logs_json), 200
+
+
+SCAN_STATUSES = ('SUCCESS', 'DENIED', 'ERROR')
+
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    # Tell nginx not to buffer the stream
+    'X-Accel-Buffering': 'no'
+}
+
+
+def parse_stream_args(args, last_event_id=None):
+    """
+    Query string of GET /api/logs/stream: status (comma-separated),
+    department and employee_id filters. The resume point comes from the
+    Last-Event-ID header or, for clients that cannot set it, ?last_event_id.
+    """
+    statuses = None
+    if args.get('status'):
+        statuses = {status.strip().upper() for status in args['status'].split(',') if status.strip()}
+        unknown = statuses.difference(SCAN_STATUSES)
+        if unknown:
+            raise ApiError(f"Status tidak valid: {', '.join(sorted(unknown))}")
+
+    last_event_id = last_event_id or args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    employee_id = args.get('employee_id')
+
+    return {
+        'statuses': statuses,
+        'department': args.get('department'),
+        'employee_id': employee_id.strip().upper() if employee_id else None,
+        'last_event_id': last_event_id
+    }
+
+
+def stream_unavailable_response():
+    return {
+        'success': False,
+        'message': 'Live stream tidak tersedia'
+    }, 503
+
+
+def stream_busy_response():
+    return {
+        'success': False,
+        'message': 'Terlalu banyak koneksi live stream, coba lagi nanti'
+    }, 503
+
+
+def sse_event(event):
+    return f"id: {event['id']}\nevent: scan\ndata: {dumps(event)}\n\n"
+
+
+def sse_comment(text):
+    return f': {text}\n\n'
+
+
+def sse_retry(milliseconds):
+    return f'retry: {milliseconds}\n\n'
+
+
+EXPORT_COLUMNS = [
+    'id', 'employee_id', 'employee_name', 'department', 'scan_time',
+    'status', 'ip_address', 'user_agent', 'additional_info', 'device_id'
+]
+
+
+def _parse_export_bound(value, end=False):
+    """Parse an ISO date/datetime; a bare end date includes that whole day."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+def parse_export_args(args):
+    export_format = args.get('format', 'csv').lower()
+    if export_format not in ('csv', 'ndjson'):
+        raise ApiError('Format harus csv atau ndjson')
+
+    try:
+        start_time = _parse_export_bound(args.get('start_date'))
+        end_time = _parse_export_bound(args.get('end_date'), end=True)
+    except ValueError:
+        raise ApiError('Format tanggal tidak valid (gunakan YYYY-MM-DD)')
+
+    use_gzip = args.get('gzip', 'false').lower() == 'true'
+    filename = f"scan_logs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    if use_gzip:
+        mimetype = 'application/gzip'
+        filename += '.gz'
+
+    return {
+        'format': export_format,
+        'start_time': start_time,
+        'end_time': end_time,
+        'employee_id': args.get('employee_id'),
+        'status': args.get('status'),
+        'chunk_size': max(100, min(args.get('chunk_size', 5000, type=int), 50000)),
+        'gzip': use_gzip,
+        'mimetype': mimetype,
+        'headers': {'Content-Disposition': f'attachment; filename={filename}'}
+    }
+
+
+class ExportEncoder:
+    """
+    Turns chunks of export rows into body bytes: a CSV header then rows, or
+    one JSON object per line, optionally gzip-compressed. The apps drive it
+    from their own (sync or async) iteration over the chunks.
+    """
+
+    def __init__(self, export_format, use_gzip=False):
+        self.export_format = export_format
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if use_gzip else None
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _output(self, text):
+        data = text.encode('utf-8')
+        if self._compressor:
+            return self._compressor.compress(data)
+        return data
+
+    def start(self):
+        if self.export_format != 'csv':
+            return b''
+        self._writer.writerow(EXPORT_COLUMNS)
+        return self.encode([])
+
+    def encode(self, rows):
+        if self.export_format == 'csv':
+            for row in rows:
+                self._writer.writerow([
+                    row[column].isoformat() if column == 'scan_time' and row[column] else row[column]
+                    for column in EXPORT_COLUMNS
+                ])
+            text = self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        else:
+            text = ''.join(f'{dumps(row)}\n' for row in rows)
+        return self._output(text)
+
+    def finish(self):
+        return self._compressor.flush() if self._compressor else b''
+
+
+# Employees
+
+# Any of these switches GET /api/employees from the full list to a search page
+_EMPLOYEE_SEARCH_ARGS = ('q', 'department', 'position', 'is_active', 'fields', 'limit', 'cursor')
+
+
+def parse_employees_args(args):
+    """
+    Without search arguments GET /api/employees returns the whole list
+    (active_only=true|false) as before. With any of q, match
+    (prefix|substring), department, position, is_active (true|false|all),
+    fields (comma-separated columns), limit, cursor or pagination=cursor it
+    returns keyset pages ordered by name.
+    """
+    active_only = args.get('active_only', 'true').lower() == 'true'
+    search = args.get('pagination') == 'cursor' or any(name in args for name in _EMPLOYEE_SEARCH_ARGS)
+
+    if not search:
+        return {'search': False, 'active_only': active_only}
+
+    match = args.get('match', 'prefix')
+    if match not in ('prefix', 'substring'):
+        raise ApiError('match harus prefix atau substring')
+
+    is_active = args.get('is_active', 'true' if active_only else 'all').lower()
+    if is_active not in ('true', 'false', 'all'):
+        raise ApiError('is_active harus true, false atau all')
+
+    fields = EMPLOYEE_FIELDS
+    if args.get('fields'):
+        fields = tuple(dict.fromkeys(field.strip() for field in args['fields'].split(',') if field.strip()))
+        unknown = [field for field in fields if field not in EMPLOYEE_FIELDS]
+        if unknown or not fields:
+            raise ApiError(f"fields hanya boleh berisi: {', '.join(EMPLOYEE_FIELDS)}")
+
+    return {
+        'search': True,
+        'limit': max(1, min(args.get('limit', 50, type=int), 1000)),
+        'cursor': args.get('cursor') or None,
+        'q': (args.get('q') or '').strip() or None,
+        'match': match,
+        'department': args.get('department') or None,
+        'position': args.get('position') or None,
+        'is_active': None if is_active == 'all' else is_active == 'true',
+        'fields': fields
+    }
+
+
+def employees_search_etag(version, args):
+    """ETag of one search page: the employees change marker plus the query."""
+    return make_etag('employees_search', *version, *sorted(args.items()))
+
+
+def employees_page_response(page, limit):
+    employees = page['employees']
+
+    return {
+        'success': True,
+        'employees': employees,
+        'count': len(employees),
+        'limit': limit,
+        'next_cursor': page['next_cursor']
+    }, 200
+
+
+def employees_response(employees):
+    return {
+        'success': True,
+        'employees': employees,
+        'total': len(employees)
+    }, 200
+
+
+def employees_etag(version, active_only):
+    return make_etag('employees', active_only, Config.JSON_AGG_ENABLED, *version)
+
+
+def employees_json_response(employees_json, total):
+    """employees_response() for rows already encoded by PostgreSQL (JSON_AGG_ENABLED)."""
+    return splice_json({
+        'success': True,
+        'total': total
+    }, 'employees', employees_json), 200
+
+
+def parse_employee_summary_args(args):
+    sort = args.get('sort', 'total_scans')
+    if sort not in EMPLOYEE_SUMMARY_SORTS:
+        raise ApiError(f"sort harus salah satu dari: {', '.join(EMPLOYEE_SUMMARY_SORTS)}")
+
+    order = args.get('order', 'desc').lower()
+    if order not in ('asc', 'desc'):
+        raise ApiError('order harus asc atau desc')
+
+    employee_id = args.get('employee_id')
+
+    return {
+        'department': args.get('department') or None,
+        'employee_id': employee_id.strip().upper() if employee_id else None,
+        'sort': sort,
+        'descending': order == 'desc',
+        'limit': max(1, min(args.get('limit', 50, type=int), 1000)),
+        'offset': max(0, args.get('offset', 0, type=int))
+    }
+
+
+def employee_summary_etag(info):
+    """The view only changes when it is refreshed."""
+    return make_etag('employee_summary', info['refreshed_at'])
+
+
+def employee_summary_response(rows, total, info, args):
+    return {
+        'success': True,
+        'period_start': info['period_start'],
+        'refreshed_at': info['refreshed_at'],
+        'total': total,
+        'limit': args['limit'],
+        'offset': args['offset'],
+        'employees': rows
+    }, 200
+
+
+def employee_summary_refresh_response(result):
+    return {
+        'success': True,
+        **result
+    }, 200
+
+
+def parse_new_employee(data):
+    if not data or 'employee_id' not in data or 'name' not in data:
+        raise ApiError('Employee ID dan name diperlukan')
+
+    employee_id = str(data['employee_id']).strip().upper()
+    # Same rule as the bulk import; badge tokens rely on it (no ':')
+    if not EMPLOYEE_ID_PATTERN.match(employee_id) or len(employee_id) > 50:
+        raise ApiError('Employee ID hanya boleh berisi huruf, angka, titik, "_" dan "-" (maksimal 50 karakter)')
+
+    return (
+        employee_id,
+        data['name'].strip(),
+        data.get('department', '').strip(),
+        data.get('position', '').strip()
+    )
+
+
+def add_employee_response(success, employee_id, name):
+    if success:
+        return {
+            'success': True,
+            'message': f'Karyawan {employee_id} berhasil ditambahkan',
+            'employee_id': employee_id,
+            'name': name
+        }, 201
+
+    return {
+        'success': False,
+        'message': 'Employee ID sudah ada'
+    }, 400
+
+
+def is_csv_upload(mimetype):
+    return mimetype in ('text/csv', 'application/csv')
+
+
+def parse_import_request(args, stream=None, data=None):
+    """
+    Rows and mode for /api/employees/import. Pass the body `stream` for
+    CSV uploads, otherwise the decoded JSON `data`.
+    """
+    mode = args.get('mode', 'upsert')
+
+    try:
+        if stream is not None:
+            rows = read_csv(stream)
+        else:
+            if isinstance(data, dict):
+                mode = data.get('mode', mode)
+                data = data.get('employees')
+            rows = read_json(data)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ApiError(f'Format data tidak valid: {str(e)}')
+
+    if mode not in ('upsert', 'insert'):
+        raise ApiError("mode harus 'upsert' atau 'insert'")
+
+    return rows, mode
+
+
+def import_error_response(e):
+    """Errors raised while the import is streaming its input."""
+    if isinstance(e, (ValueError, UnicodeDecodeError, csv.Error)):
+        return ApiError(f'Format data tidak valid: {str(e)}').response()
+    return error_response(e)
+
+
+def import_response(result):
+    return {
+        'success': True,
+        'message': f"{result['inserted']} karyawan ditambahkan, {result['updated']} diperbarui, "
+                   f"{result['rejected']} ditolak",
+        **result
+    }, 200
+
+
+def parse_employees_status_request(data):
+    if (not data or not isinstance(data.get('employee_ids'), list)
+            or not isinstance(data.get('is_active'), bool)):
+        raise ApiError('employee_ids (array) dan is_active (boolean) diperlukan')
+
+    return [str(employee_id) for employee_id in data['employee_ids']], data['is_active']
+
+
+def employees_status_response(result, is_active):
+    status_text = "diaktifkan" if is_active else "dinonaktifkan"
+
+    return {
+        'success': True,
+        'message': f"{len(result['updated'])} karyawan berhasil {status_text}",
+        **result
+    }, 200
+
+
+def employee_status_response(employee_id, is_active, success):
+    if success:
+        status_text = "diaktifkan" if is_active else "dinonaktifkan"
+        return {
+            'success': True,
+            'message': f'Karyawan {employee_id} berhasil {status_text}'
+        }, 200
+
+    return {
+        'success': False,
+        'message': f'Karyawan {employee_id} tidak ditemukan'
+    }, 404
+
+
+# Statistics and service status
+
+def parse_statistics_args(args):
+    granularity = args.get('granularity', 'day')
+    if granularity not in ('day', 'hour'):
+        raise ApiError('Granularity harus day atau hour')
+
+    return {
+        'start_date': args.get('start_date'),
+        'end_date': args.get('end_date'),
+        'granularity': granularity,
+        'department': args.get('department'),
+        'by_department': args.get('by_department', 'false').lower() == 'true'
+    }
+
+
+def statistics_etag(version, args):
+    """`version` covers the rollup rows in range; `args` tells the shapes apart."""
+    return make_etag('statistics', version, sorted(args.items()))
+
+
+def statistics_response(stats, granularity):
+    return {
+        'success': True,
+        'granularity': granularity,
+        'statistics': stats
+    }, 200
+
+
+def stats_response(**stats):
+    return {
+        'success': True,
+        **stats
+    }, 200
+
+
+def liveness_response():
+    """The process is up and serving requests; never touches the database."""
+    return {
+        'status': 'alive',
+        'timestamp': datetime.now().isoformat()
+    }, 200
+
+
+def readiness_response(readiness=None):
+    """
+    `readiness` is the manager's get_readiness(), the verdict of its
+    background check; None when there is no database manager at all.
+    """
+    if readiness is None:
+        readiness = {'ready': False, 'reasons': ['database not configured'], 'checked_at': None, 'checks': {}}
+
+    return {
+        'status': 'ready' if readiness['ready'] else 'not_ready',
+        'timestamp': datetime.now().isoformat(),
+        'checked_at': readiness['checked_at'],
+        'reasons': readiness['reasons'],
+        'checks': readiness['checks']
+    }, 200 if readiness['ready'] else 503
+
+
+def health_response(readiness=None, services=None):
+    """
+    `readiness` is the manager's get_readiness() and `services` its
+    get_service_stats(); pass neither when there is no database manager.
+    Built from the cached readiness check, so it runs no query either;
+    answers 503 whenever /api/health/ready would.
+    """
+    ready = bool(readiness and readiness['ready'])
+    database = (readiness or {}).get('checks', {}).get('database')
+    if database is None:
+        db_info = {
+            'status': 'not_connected',
+            'type': 'PostgreSQL'
+        }
+    else:
+        db_info = {**database, 'type': 'PostgreSQL'}
+
+    services = services or {}
+    employee_cache = services.get('employee_cache') or {}
+
+    return {
+        'status': 'healthy' if ready else 'degraded',
+        'timestamp': datetime.now().isoformat(),
+        'database': db_info,
+        'reasons': readiness['reasons'] if readiness else ['database not configured'],
+        'pool': services.get('pool'),
+        'employee_cache': services.get('employee_cache'),
+        'scan_bitmap': services.get('scan_bitmap'),
+        'log_writer': services.get('log_writer'),
+        'total_active_employees': employee_cache.get('size') if employee_cache.get('enabled') else None
+    }, 200 if ready else 503
@@ -1,4 +1,5 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import json
 import os
@@ -6,106 +7,120 @@ from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from database import DatabaseManager
 from config import Config
+import api_common as api
+import metrics
+import query_profiler
+from json_provider import FastJSONProviderMixin
 import psycopg2
 
+class JSONProvider(FastJSONProviderMixin, DefaultJSONProvider):
+    pass
+
 app = Flask(__name__)
+app.json = JSONProvider(app)
 CORS(app)
 
 app.config['SECRET_KEY'] = Config.SECRET_KEY
 
 db_manager = None
 
-try:
-    db_manager = DatabaseManager()
-    print("✓ Database connection established successfully")
-    print("✓ Database tables initialized")
-except Exception as e:
-    print(f"✗ Failed to initialize database: {e}")
-    print(f"✗ Error type: {type(e).__name__}")
-    import traceback
-    traceback.print_exc()
-    db_manager = None
+def init_database():
+    """
+    Create this process's DatabaseManager (pool, cache listener, bitmap,
+    log writer). Under gunicorn it runs in each worker after the fork, see
+    wsgi.py; otherwise it runs when this module is imported.
+    """
+    global db_manager
+    
+    try:
+        db_manager = DatabaseManager()
+        print("✓ Database connection established successfully")
+        print("✓ Database tables initialized")
+    except Exception as e:
+        print(f"✗ Failed to initialize database: {e}")
+        print(f"✗ Error type: {type(e).__name__}")
+        import traceback
+        traceback.print_exc()
+        db_manager = None
+
+def close_database():
+    """Flush queued scan logs and close the pool and listener."""
+    global db_manager
+    
+    if db_manager:
+        db_manager.close()
+        db_manager = None
+
+if not Config.DB_DEFER_INIT:
+    init_database()
+
+def _reply(result):
+    payload, status = result
+    return jsonify(payload), status
+
+def _reply_json(result):
+    body, status = result
+    return Response(f'{body}\n', status=status, mimetype='application/json')
+
+def _reply_cached(result, etag, encoded=False):
+    response = _reply_json(result) if encoded else jsonify(result[0])
+    response.status_code = result[1]
+    response.headers.update(api.cache_headers(etag))
+    return response
+
+def _not_modified(etag):
+    return Response(status=304, headers=api.cache_headers(etag))
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_started = metrics.request_started()
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else '<unmatched>'
+    metrics.request_finished(g.pop('metrics_started', None), route, request.method, response.status_code)
+    return response
+
+@app.before_request
+def start_query_profile():
+    query_profiler.start_request(request.url_rule.rule if request.url_rule else None)
+
+@app.after_request
+def add_server_timing(response):
+    server_timing = query_profiler.finish_request()
+    if server_timing:
+        response.headers['Server-Timing'] = server_timing
+        response.headers['Timing-Allow-Origin'] = '*'
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    if not metrics.enabled:
+        return _reply(api.metrics_unavailable_response())
+    
+    return Response(metrics.render(), mimetype=metrics.CONTENT_TYPE)
 
 @app.route('/')
 def home():
-    return jsonify({
-        'message': 'QR Scanner Backend API with PostgreSQL',
-        'version': '2.0.0',
-        'database': 'PostgreSQL',
-        'endpoints': {
-            'scan': '/api/scan',
-            'logs': '/api/logs',
-            'employees': '/api/employees',
-            'statistics': '/api/statistics'
-        }
-    })
+    payload, _ = api.home_response()
+    return jsonify(payload)
 
 @app.route('/api/scan', methods=['POST'])
 def scan_qr():
     if not db_manager:
-        return jsonify({
-            'success': False,
-            'message': 'Database connection error'
-        }), 500
+        return _reply(api.database_unavailable())
     
     try:
-        data = request.get_json()
-        
-        if not data or 'employee_id' not in data:
-            return jsonify({
-                'success': False,
-                'message': 'Employee ID tidak ditemukan dalam request'
-            }), 400
-        
-        employee_id = data['employee_id'].strip().upper()
+        employee_id, device_id = api.parse_scan_request(request.get_json(silent=True))
         ip_address = request.remote_addr
         user_agent = request.headers.get('User-Agent', '')
         
-        employee = db_manager.get_employee_by_id(employee_id)
+        scan = db_manager.process_scan(employee_id, ip_address, user_agent, device_id)
         
-        if not employee:
-            db_manager.log_scan_attempt(employee_id, 'DENIED', ip_address, user_agent, 'Employee not found')
-            
-            return jsonify({
-                'success': False,
-                'message': f'Akses ditolak. ID karyawan {employee_id} tidak terdaftar atau tidak aktif',
-                'employee_id': employee_id,
-                'timestamp': datetime.now().isoformat(),
-                'status': 'DENIED'
-            }), 403
-        
-        # Check if employee already scanned today with SUCCESS status
-        already_scanned = db_manager.check_scan_today(employee_id)
-        
-        if already_scanned:
-            db_manager.log_scan_attempt(employee_id, 'DENIED', ip_address, user_agent, 'Already scanned today')
-            
-            return jsonify({
-                'success': False,
-                'message': f'Akses ditolak untuk karyawan {employee_id}. Anda sudah melakukan scan hari ini',
-                'employee_id': employee_id,
-                'employee_name': employee['name'],
-                'employee_department': employee.get('department', ''),
-                'employee_position': employee.get('position', ''),
-                'timestamp': datetime.now().isoformat(),
-                'status': 'DENIED',
-                'reason': 'ALREADY_SCANNED_TODAY'
-            }), 403
-        
-        # Employee found and hasn't scanned today - allow access
-        db_manager.log_scan_attempt(employee_id, 'SUCCESS', ip_address, user_agent, 'Access granted')
-        
-        return jsonify({
-            'success': True,
-            'message': f'Akses diterima untuk karyawan {employee_id}',
-            'employee_id': employee_id,
-            'employee_name': employee['name'],
-            'employee_department': employee.get('department', ''),
-            'employee_position': employee.get('position', ''),
-            'timestamp': datetime.now().isoformat(),
-            'status': 'ALLOWED'
-        }), 200
+        return _reply(api.scan_response(employee_id, scan))
             
+    except api.ApiError as e:
+        return _reply(e.response())
     except Exception as e:
         if db_manager:
             db_manager.log_scan_attempt(
@@ -116,261 +131,404 @@ def scan_qr():
                 str(e)
             )
         
-        return jsonify({
-            'success': False,
-            'message': f'Terjadi kesalahan: {str(e)}'
-        }), 500
+        return _reply(api.error_response(e))
+
+@app.route('/api/scan/batch', methods=['POST'])
+def scan_qr_batch():
+    """
+    Replay scans queued by an offline gate device. Body:
+    {"device_id": "...", "scans": [{"employee_id": "...", "scanned_at": "...", "device_id": "..."}]}
+    The per-scan device_id overrides the top-level one and scanned_at
+    defaults to the time the batch was received.
+    """
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    
+    try:
+        results, accepted = api.parse_scan_batch(request.get_json(silent=True), db_manager.timezone)
+        
+        scans = db_manager.record_scan_batch(
+            [(employee_id, scan_time, device_id) for _, employee_id, scan_time, device_id in accepted],
+            request.remote_addr,
+            request.headers.get('User-Agent', '')
+        )
+        
+        return _reply(api.scan_batch_response(results, accepted, scans))
+        
+    except Exception as e:
+        return _reply(api.error_response(e))
 
 @app.route('/api/logs', methods=['GET'])
 def get_logs():
     if not db_manager:
-        return jsonify({
-            'success': False,
-            'message': 'Database connection error'
-        }), 500
+        return _reply(api.database_unavailable())
     
     try:
-        limit = request.args.get('limit', 50, type=int)
-        offset = request.args.get('offset', 0, type=int)
-        employee_id = request.args.get('employee_id')
-        status = request.args.get('status')
+        args = api.parse_logs_args(request.args)
+        
+        if args['keyset']:
+            try:
+                page = db_manager.get_scan_logs_page(
+                    args['limit'], args['cursor'], args['employee_id'], args['status']
+                )
+            except ValueError:
+                return _reply(api.invalid_cursor_response())
+            
+            return _reply(api.logs_page_response(page, args['limit']))
         
-        logs = db_manager.get_scan_logs(limit, offset, employee_id, status)
+        if Config.JSON_AGG_ENABLED:
+            logs_json, total = db_manager.get_scan_logs_json(
+                args['limit'], args['offset'], args['employee_id'], args['status']
+            )
+            
+            return _reply_json(api.logs_json_response(logs_json, total, args['limit'], args['offset']))
         
-        for log in logs:
-            if log['scan_time']:
-                log['scan_time'] = log['scan_time'].isoformat()
+        logs = db_manager.get_scan_logs(args['limit'], args['offset'], args['employee_id'], args['status'])
         
-        return jsonify({
-            'success': True,
-            'logs': logs,
-            'total': len(logs),
-            'limit': limit,
-            'offset': offset
-        }), 200
+        return _reply(api.logs_response(logs, args['limit'], args['offset']))
         
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Terjadi kesalahan: {str(e)}'
-        }), 500
+        return _reply(api.error_response(e))
+
+@app.route('/api/logs/export', methods=['GET'])
+def export_logs():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    
+    try:
+        args = api.parse_export_args(request.args)
+    except api.ApiError as e:
+        return _reply(e.response())
+    
+    try:
+        chunks = db_manager.iter_scan_logs(
+            args['start_time'],
+            args['end_time'],
+            args['employee_id'],
+            args['status'],
+            args['chunk_size']
+        )
+        # Pull the first chunk now so query errors still produce a JSON 500
+        first = next(chunks, None)
+    except Exception as e:
+        return _reply(api.error_response(e))
+    
+    def body():
+        encoder = api.ExportEncoder(args['format'], args['gzip'])
+        try:
+            yield encoder.start()
+            if first is not None:
+                yield encoder.encode(first)
+                for rows in chunks:
+                    yield encoder.encode(rows)
+            yield encoder.finish()
+        finally:
+            chunks.close()
+    
+    return Response(
+        stream_with_context(body()),
+        mimetype=args['mimetype'],
+        headers=args['headers']
+    )
+
+@app.route('/api/logs/stream', methods=['GET'])
+def stream_logs():
+    """
+    Server-sent events, one `scan` event per new scan_logs row, optionally
+    filtered by ?status=, ?department= and ?employee_id=. Reconnecting
+    clients send Last-Event-ID and receive what they missed.
+    """
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    if not db_manager.scan_stream:
+        return _reply(api.stream_unavailable_response())
+    
+    try:
+        args = api.parse_stream_args(request.args, request.headers.get('Last-Event-ID'))
+    except api.ApiError as e:
+        return _reply(e.response())
+    
+    broker = db_manager.scan_stream
+    subscription, replay, complete = broker.subscribe(
+        args['statuses'], args['department'], args['employee_id'], args['last_event_id']
+    )
+    if subscription is None:
+        return _reply(api.stream_busy_response())
+    
+    try:
+        if not complete:
+            # Resume point older than the in-memory history
+            backfill = db_manager.get_scan_events_after(args['last_event_id'], Config.SCAN_STREAM_HISTORY)
+            subscription.skip(event['id'] for event in backfill)
+            replay = [event for event in backfill if subscription.matches(event)]
+    except Exception as e:
+        broker.unsubscribe(subscription)
+        return _reply(api.error_response(e))
+    
+    def body():
+        try:
+            yield api.sse_retry(3000)
+            for event in replay:
+                yield api.sse_event(event)
+            
+            while True:
+                events = subscription.get(Config.SCAN_STREAM_HEARTBEAT)
+                if subscription.closed:
+                    # Fell too far behind; the client reconnects and resumes
+                    break
+                if not events:
+                    # Keeps proxies from timing out and detects gone clients
+                    yield api.sse_comment('keepalive')
+                for event in events:
+                    yield api.sse_event(event)
+        finally:
+            broker.unsubscribe(subscription)
+    
+    return Response(body(), mimetype='text/event-stream', headers=api.SSE_HEADERS)
 
 @app.route('/api/employees', methods=['GET'])
 def get_employees():
     if not db_manager:
-        return jsonify({
-            'success': False,
-            'message': 'Database connection error'
-        }), 500
+        return _reply(api.database_unavailable())
     
     try:
-        active_only = request.args.get('active_only', 'true').lower() == 'true'
-        employees = db_manager.get_employees(active_only)
+        args = api.parse_employees_args(request.args)
         
-        for employee in employees:
-            if employee['created_at']:
-                employee['created_at'] = employee['created_at'].isoformat()
-            if employee['updated_at']:
-                employee['updated_at'] = employee['updated_at'].isoformat()
+        if args['search']:
+            etag = api.employees_search_etag(db_manager.get_employees_version(False), args)
+            if api.etag_matches(request.headers.get('If-None-Match'), etag):
+                return _not_modified(etag)
         
-        return jsonify({
-            'success': True,
-            'employees': employees,
-            'total': len(employees)
-        }), 200
+            search = {name: value for name, value in args.items() if name != 'search'}
+            try:
+                page = db_manager.search_employees(**search)
+            except ValueError:
+                return _reply(api.invalid_cursor_response())
+        
+            return _reply_cached(api.employees_page_response(page, args['limit']), etag)
+        
+        active_only = args['active_only']
+        
+        # The version query is far cheaper than the list; a matching
+        # If-None-Match skips the list entirely
+        etag = api.employees_etag(db_manager.get_employees_version(active_only), active_only)
+        if api.etag_matches(request.headers.get('If-None-Match'), etag):
+            return _not_modified(etag)
+        
+        if Config.JSON_AGG_ENABLED:
+            employees_json, total = db_manager.get_employees_json(active_only)
+            
+            return _reply_cached(api.employees_json_response(employees_json, total), etag, encoded=True)
+        
+        employees = db_manager.get_employees(active_only)
+        
+        return _reply_cached(api.employees_response(employees), etag)
         
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Terjadi kesalahan: {str(e)}'
-        }), 500
+        return _reply(api.error_response(e))
 
 @app.route('/api/employees', methods=['POST'])
 def add_employee():
     if not db_manager:
-        return jsonify({
-            'success': False,
-            'message': 'Database connection error'
-        }), 500
+        return _reply(api.database_unavailable())
     
     try:
-        data = request.get_json()
-        
-        if not data or 'employee_id' not in data or 'name' not in data:
-            return jsonify({
-                'success': False,
-                'message': 'Employee ID dan name diperlukan'
-            }), 400
-        
-        employee_id = data['employee_id'].strip().upper()
-        name = data['name'].strip()
-        department = data.get('department', '').strip()
-        position = data.get('position', '').strip()
+        employee_id, name, department, position = api.parse_new_employee(request.get_json(silent=True))
         
         success = db_manager.add_employee(employee_id, name, department, position)
         
-        if success:
-            return jsonify({
-                'success': True,
-                'message': f'Karyawan {employee_id} berhasil ditambahkan',
-                'employee_id': employee_id,
-                'name': name
-            }), 201
+        return _reply(api.add_employee_response(success, employee_id, name))
+        
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/employees/import', methods=['POST'])
+def import_employees():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    
+    try:
+        if api.is_csv_upload(request.mimetype):
+            rows, mode = api.parse_import_request(request.args, stream=request.stream)
         else:
-            return jsonify({
-                'success': False,
-                'message': 'Employee ID sudah ada'
-            }), 400
+            rows, mode = api.parse_import_request(request.args, data=request.get_json(silent=True))
+        
+        result = db_manager.import_employees(rows, mode)
         
+        return _reply(api.import_response(result))
+        
+    except Exception as e:
+        return _reply(api.import_error_response(e))
+
+@app.route('/api/employees/status', methods=['POST'])
+def bulk_update_employee_status():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    
+    try:
+        employee_ids, is_active = api.parse_employees_status_request(request.get_json(silent=True))
+        
+        result = db_manager.set_employees_status(employee_ids, is_active)
+        
+        return _reply(api.employees_status_response(result, is_active))
+        
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/employees/summary', methods=['GET'])
+def get_employee_summary():
+    """
+    Per-employee attendance totals for the last 30 days, from the
+    employee_scan_summary materialized view. Query: department,
+    employee_id, sort, order (asc|desc), limit, offset.
+    """
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    
+    try:
+        args = api.parse_employee_summary_args(request.args)
+    
+        info = db_manager.get_employee_summary_info()
+        etag = api.employee_summary_etag(info)
+        if api.etag_matches(request.headers.get('If-None-Match'), etag):
+            return _not_modified(etag)
+    
+        rows, total = db_manager.get_employee_scan_summary(**args)
+    
+        return _reply_cached(api.employee_summary_response(rows, total, info, args), etag)
+    
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/employees/summary/refresh', methods=['POST'])
+def refresh_employee_summary():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    
+    try:
+        result = db_manager.refresh_employee_summary()
+    
+        return _reply(api.employee_summary_refresh_response(result))
+    
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/badges', methods=['POST'])
+def issue_badges():
+    """
+    Sign QR badge tokens for active employees. Body:
+    {"employee_ids": ["..."], "ttl_days": 365}; needs
+    "Authorization: Bearer <BADGE_ISSUE_API_KEY>".
+    """
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    
+    try:
+        api.check_badge_issue_auth(request.headers.get('Authorization'))
+        employee_ids, ttl_days = api.parse_badge_issue_request(request.get_json(silent=True))
+    
+        employees = db_manager.get_active_employees_by_ids(employee_ids)
+    
+        return _reply(api.badge_issue_response(employee_ids, employees, ttl_days))
+    
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Terjadi kesalahan: {str(e)}'
-        }), 500
+        return _reply(api.error_response(e))
 
 @app.route('/api/employees/<employee_id>', methods=['DELETE'])
 def remove_employee(employee_id):
     if not db_manager:
-        return jsonify({
-            'success': False,
-            'message': 'Database connection error'
-        }), 500
+        return _reply(api.database_unavailable())
     
     try:
         employee_id = employee_id.strip().upper()
         
         success = db_manager.update_employee_status(employee_id, False)
         
-        if success:
-            return jsonify({
-                'success': True,
-                'message': f'Karyawan {employee_id} berhasil dinonaktifkan'
-            }), 200
-        else:
-            return jsonify({
-                'success': False,
-                'message': f'Karyawan {employee_id} tidak ditemukan'
-            }), 404
+        return _reply(api.employee_status_response(employee_id, False, success))
         
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Terjadi kesalahan: {str(e)}'
-        }), 500
+        return _reply(api.error_response(e))
 
 @app.route('/api/employees/<employee_id>', methods=['PUT'])
 def update_employee(employee_id):
     if not db_manager:
-        return jsonify({
-            'success': False,
-            'message': 'Database connection error'
-        }), 500
+        return _reply(api.database_unavailable())
     
     try:
         employee_id = employee_id.strip().upper()
-        data = request.get_json()
+        data = request.get_json(silent=True)
         
         is_active = data.get('is_active', True)
         
         success = db_manager.update_employee_status(employee_id, is_active)
         
-        if success:
-            status_text = "diaktifkan" if is_active else "dinonaktifkan"
-            return jsonify({
-                'success': True,
-                'message': f'Karyawan {employee_id} berhasil {status_text}'
-            }), 200
-        else:
-            return jsonify({
-                'success': False,
-                'message': f'Karyawan {employee_id} tidak ditemukan'
-            }), 404
+        return _reply(api.employee_status_response(employee_id, is_active, success))
         
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Terjadi kesalahan: {str(e)}'
-        }), 500
+        return _reply(api.error_response(e))
 
 @app.route('/api/statistics', methods=['GET'])
 def get_statistics():
     if not db_manager:
-        return jsonify({
-            'success': False,
-            'message': 'Database connection error'
-        }), 500
+        return _reply(api.database_unavailable())
     
     try:
-        start_date = request.args.get('start_date')
-        end_date = request.args.get('end_date')
+        args = api.parse_statistics_args(request.args)
         
-        stats = db_manager.get_scan_statistics(start_date, end_date)
+        etag = api.statistics_etag(db_manager.get_scan_statistics_version(**args), args)
+        if api.etag_matches(request.headers.get('If-None-Match'), etag):
+            return _not_modified(etag)
         
-        for stat in stats:
-            if stat['scan_date']:
-                stat['scan_date'] = stat['scan_date'].isoformat()
+        stats = db_manager.get_scan_statistics(**args)
         
-        return jsonify({
-            'success': True,
-            'statistics': stats
-        }), 200
+        return _reply_cached(api.statistics_response(stats, args['granularity']), etag)
         
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Terjadi kesalahan: {str(e)}'
-        }), 500
+        return _reply(api.error_response(e))
+
+@app.route('/api/cache', methods=['GET'])
+def cache_stats():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    
+    return _reply(api.stats_response(
+        employee_cache=db_manager.get_cache_stats(),
+        scan_bitmap=db_manager.get_scan_bitmap_stats(),
+        scan_debounce=db_manager.get_scan_debounce_stats()
+    ))
+
+@app.route('/api/log-writer', methods=['GET'])
+def log_writer_stats():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    
+    return _reply(api.stats_response(log_writer=db_manager.get_log_writer_stats()))
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    db_status = 'connected'
-    db_info = {}
-    total_employees = 0
+    if not db_manager:
+        return _reply(api.health_response())
     
-    if db_manager:
-        try:
-            conn = db_manager.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('SELECT version() as version')
-            result = cursor.fetchone()
-            db_version = result['version'] if result else 'Unknown'
-            
-            cursor.execute('SELECT COUNT(*) as count FROM employees WHERE is_active = TRUE')
-            result = cursor.fetchone()
-            total_employees = result['count'] if result else 0
-            
-            cursor.close()
-            conn.close()
-            
-            db_info = {
-                'status': 'connected',
-                'version': db_version,
-                'type': 'PostgreSQL'
-            }
-        except Exception as e:
-            db_status = 'error'
-            db_info = {
-                'status': 'error',
-                'error': str(e),
-                'type': 'PostgreSQL'
-            }
-    else:
-        db_status = 'not_connected'
-        db_info = {
-            'status': 'not_connected',
-            'type': 'PostgreSQL'
-        }
-    
-    return jsonify({
-        'status': 'healthy' if db_status == 'connected' else 'degraded',
-        'timestamp': datetime.now().isoformat(),
-        'database': db_info,
-        'total_active_employees': total_employees
-    }), 200
+    return _reply(api.health_response(db_manager.get_readiness(), db_manager.get_service_stats()))
+
+@app.route('/api/health/live', methods=['GET'])
+def liveness_check():
+    return _reply(api.liveness_response())
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    return _reply(api.readiness_response(db_manager.get_readiness() if db_manager else None))
+
+@app.route('/api/pool', methods=['GET'])
+def pool_stats():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    
+    return _reply(api.stats_response(pool=db_manager.get_pool_stats()))
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     host = os.environ.get('HOST', '0.0.0.0')
-    debug = os.environ.get('DEBUG', 'True').lower() == 'true'
+    debug = os.environ.get('DEBUG', 'False').lower() == 'true'
     
     app.run(debug=debug, host=host, port=port)
\ No newline at end of file
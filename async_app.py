@@ -0,0 +1,524 @@
+"""
+asyncio variant of app.py for ASGI servers, e.g.
+
+    hypercorn async_app:app --bind 0.0.0.0:5000
+
+Routes, validation and responses are the ones in app.py (both use
+api_common), backed by AsyncDatabaseManager so one process can keep many
+scans and log queries in flight while they wait on PostgreSQL.
+"""
+import asyncio
+import io
+import os
+
+from quart import Quart, request, jsonify, Response, g
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
+
+import api_common as api
+from async_database import AsyncDatabaseManager
+from config import Config
+from json_provider import FastJSONProviderMixin
+import metrics
+import query_profiler
+
+class JSONProvider(FastJSONProviderMixin, DefaultJSONProvider):
+    pass
+
+app = cors(Quart(__name__))
+app.json = JSONProvider(app)
+
+app.config['SECRET_KEY'] = Config.SECRET_KEY
+
+db_manager = None
+
+@app.before_serving
+async def open_database():
+    global db_manager
+
+    manager = AsyncDatabaseManager()
+    try:
+        await manager.open()
+        db_manager = manager
+        print("✓ Database connection established successfully")
+        print("✓ Database tables initialized")
+    except Exception as e:
+        print(f"✗ Failed to initialize database: {e}")
+        print(f"✗ Error type: {type(e).__name__}")
+        import traceback
+        traceback.print_exc()
+        await manager.close()
+        db_manager = None
+
+@app.after_serving
+async def close_database():
+    if db_manager:
+        await db_manager.close()
+
+def _reply(result):
+    payload, status = result
+    return jsonify(payload), status
+
+def _reply_json(result):
+    body, status = result
+    return Response(f'{body}\n', status=status, mimetype='application/json')
+
+def _reply_cached(result, etag, encoded=False):
+    response = _reply_json(result) if encoded else jsonify(result[0])
+    response.status_code = result[1]
+    response.headers.update(api.cache_headers(etag))
+    return response
+
+def _not_modified(etag):
+    return Response(status=304, headers=api.cache_headers(etag))
+
+@app.before_request
+async def start_request_metrics():
+    g.metrics_started = metrics.request_started()
+
+@app.after_request
+async def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else '<unmatched>'
+    metrics.request_finished(g.pop('metrics_started', None), route, request.method, response.status_code)
+    return response
+
+@app.before_request
+async def start_query_profile():
+    query_profiler.start_request(request.url_rule.rule if request.url_rule else None)
+
+@app.after_request
+async def add_server_timing(response):
+    server_timing = query_profiler.finish_request()
+    if server_timing:
+        response.headers['Server-Timing'] = server_timing
+        response.headers['Timing-Allow-Origin'] = '*'
+    return response
+
+@app.route('/metrics', methods=['GET'])
+async def prometheus_metrics():
+    if not metrics.enabled:
+        return _reply(api.metrics_unavailable_response())
+
+    return Response(metrics.render(), mimetype=metrics.CONTENT_TYPE)
+
+@app.route('/')
+async def home():
+    payload, _ = api.home_response()
+    return jsonify(payload)
+
+@app.route('/api/scan', methods=['POST'])
+async def scan_qr():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        employee_id, device_id = api.parse_scan_request(await request.get_json(silent=True))
+        ip_address = request.remote_addr
+        user_agent = request.headers.get('User-Agent', '')
+
+        scan = await db_manager.process_scan(employee_id, ip_address, user_agent, device_id)
+
+        return _reply(api.scan_response(employee_id, scan))
+
+    except api.ApiError as e:
+        return _reply(e.response())
+    except Exception as e:
+        await db_manager.log_scan_attempt(
+            employee_id if 'employee_id' in locals() else 'UNKNOWN',
+            'ERROR',
+            request.remote_addr,
+            request.headers.get('User-Agent', ''),
+            str(e)
+        )
+
+        return _reply(api.error_response(e))
+
+@app.route('/api/scan/batch', methods=['POST'])
+async def scan_qr_batch():
+    """Replay scans queued by an offline gate device; see app.scan_qr_batch()."""
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        results, accepted = api.parse_scan_batch(await request.get_json(silent=True), db_manager.timezone)
+
+        scans = await db_manager.record_scan_batch(
+            [(employee_id, scan_time, device_id) for _, employee_id, scan_time, device_id in accepted],
+            request.remote_addr,
+            request.headers.get('User-Agent', '')
+        )
+
+        return _reply(api.scan_batch_response(results, accepted, scans))
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/logs', methods=['GET'])
+async def get_logs():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        args = api.parse_logs_args(request.args)
+
+        if args['keyset']:
+            try:
+                page = await db_manager.get_scan_logs_page(
+                    args['limit'], args['cursor'], args['employee_id'], args['status']
+                )
+            except ValueError:
+                return _reply(api.invalid_cursor_response())
+
+            return _reply(api.logs_page_response(page, args['limit']))
+
+        if Config.JSON_AGG_ENABLED:
+            logs_json, total = await db_manager.get_scan_logs_json(
+                args['limit'], args['offset'], args['employee_id'], args['status']
+            )
+
+            return _reply_json(api.logs_json_response(logs_json, total, args['limit'], args['offset']))
+
+        logs = await db_manager.get_scan_logs(args['limit'], args['offset'], args['employee_id'], args['status'])
+
+        return _reply(api.logs_response(logs, args['limit'], args['offset']))
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/logs/export', methods=['GET'])
+async def export_logs():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        args = api.parse_export_args(request.args)
+    except api.ApiError as e:
+        return _reply(e.response())
+
+    chunks = db_manager.iter_scan_logs(
+        args['start_time'],
+        args['end_time'],
+        args['employee_id'],
+        args['status'],
+        args['chunk_size']
+    )
+    try:
+        # Pull the first chunk now so query errors still produce a JSON 500
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+    async def body():
+        encoder = api.ExportEncoder(args['format'], args['gzip'])
+        try:
+            yield encoder.start()
+            if first is not None:
+                yield encoder.encode(first)
+                async for rows in chunks:
+                    yield encoder.encode(rows)
+            yield encoder.finish()
+        finally:
+            await chunks.aclose()
+
+    return Response(body(), mimetype=args['mimetype'], headers=args['headers'])
+
+@app.route('/api/logs/stream', methods=['GET'])
+async def stream_logs():
+    """Server-sent scan events; see app.stream_logs()."""
+    if not db_manager:
+        return _reply(api.database_unavailable())
+    if not db_manager.scan_stream:
+        return _reply(api.stream_unavailable_response())
+
+    try:
+        args = api.parse_stream_args(request.args, request.headers.get('Last-Event-ID'))
+    except api.ApiError as e:
+        return _reply(e.response())
+
+    loop = asyncio.get_running_loop()
+    ready = asyncio.Event()
+
+    broker = db_manager.scan_stream
+    subscription, replay, complete = broker.subscribe(
+        args['statuses'], args['department'], args['employee_id'], args['last_event_id'],
+        wakeup=lambda: loop.call_soon_threadsafe(ready.set)
+    )
+    if subscription is None:
+        return _reply(api.stream_busy_response())
+
+    try:
+        if not complete:
+            backfill = await db_manager.get_scan_events_after(args['last_event_id'], Config.SCAN_STREAM_HISTORY)
+            subscription.skip(event['id'] for event in backfill)
+            replay = [event for event in backfill if subscription.matches(event)]
+    except Exception as e:
+        broker.unsubscribe(subscription)
+        return _reply(api.error_response(e))
+
+    async def body():
+        try:
+            yield api.sse_retry(3000)
+            for event in replay:
+                yield api.sse_event(event)
+
+            while True:
+                try:
+                    await asyncio.wait_for(ready.wait(), Config.SCAN_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    pass
+                ready.clear()
+                events = subscription.drain()
+                if subscription.closed:
+                    break
+                if not events:
+                    yield api.sse_comment('keepalive')
+                for event in events:
+                    yield api.sse_event(event)
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = Response(body(), mimetype='text/event-stream', headers=api.SSE_HEADERS)
+    response.timeout = None
+    return response
+
+@app.route('/api/employees', methods=['GET'])
+async def get_employees():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        args = api.parse_employees_args(request.args)
+
+        if args['search']:
+            etag = api.employees_search_etag(await db_manager.get_employees_version(False), args)
+            if api.etag_matches(request.headers.get('If-None-Match'), etag):
+                return _not_modified(etag)
+
+            search = {name: value for name, value in args.items() if name != 'search'}
+            try:
+                page = await db_manager.search_employees(**search)
+            except ValueError:
+                return _reply(api.invalid_cursor_response())
+
+            return _reply_cached(api.employees_page_response(page, args['limit']), etag)
+
+        active_only = args['active_only']
+
+        # The version query is far cheaper than the list; a matching
+        # If-None-Match skips the list entirely
+        etag = api.employees_etag(await db_manager.get_employees_version(active_only), active_only)
+        if api.etag_matches(request.headers.get('If-None-Match'), etag):
+            return _not_modified(etag)
+
+        if Config.JSON_AGG_ENABLED:
+            employees_json, total = await db_manager.get_employees_json(active_only)
+
+            return _reply_cached(api.employees_json_response(employees_json, total), etag, encoded=True)
+
+        employees = await db_manager.get_employees(active_only)
+
+        return _reply_cached(api.employees_response(employees), etag)
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/employees', methods=['POST'])
+async def add_employee():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        employee_id, name, department, position = api.parse_new_employee(await request.get_json(silent=True))
+
+        success = await db_manager.add_employee(employee_id, name, department, position)
+
+        return _reply(api.add_employee_response(success, employee_id, name))
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/employees/import', methods=['POST'])
+async def import_employees():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        if api.is_csv_upload(request.mimetype):
+            body = io.BytesIO(await request.get_data())
+            rows, mode = api.parse_import_request(request.args, stream=body)
+        else:
+            rows, mode = api.parse_import_request(request.args, data=await request.get_json(silent=True))
+
+        result = await db_manager.import_employees(rows, mode)
+
+        return _reply(api.import_response(result))
+
+    except Exception as e:
+        return _reply(api.import_error_response(e))
+
+@app.route('/api/employees/status', methods=['POST'])
+async def bulk_update_employee_status():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        employee_ids, is_active = api.parse_employees_status_request(await request.get_json(silent=True))
+
+        result = await db_manager.set_employees_status(employee_ids, is_active)
+
+        return _reply(api.employees_status_response(result, is_active))
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/employees/summary', methods=['GET'])
+async def get_employee_summary():
+    """Per-employee attendance totals; see app.get_employee_summary()."""
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        args = api.parse_employee_summary_args(request.args)
+
+        info = await db_manager.get_employee_summary_info()
+        etag = api.employee_summary_etag(info)
+        if api.etag_matches(request.headers.get('If-None-Match'), etag):
+            return _not_modified(etag)
+
+        rows, total = await db_manager.get_employee_scan_summary(**args)
+
+        return _reply_cached(api.employee_summary_response(rows, total, info, args), etag)
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/employees/summary/refresh', methods=['POST'])
+async def refresh_employee_summary():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        result = await db_manager.refresh_employee_summary()
+
+        return _reply(api.employee_summary_refresh_response(result))
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/badges', methods=['POST'])
+async def issue_badges():
+    """Sign QR badge tokens for active employees; see app.issue_badges()."""
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        api.check_badge_issue_auth(request.headers.get('Authorization'))
+        employee_ids, ttl_days = api.parse_badge_issue_request(await request.get_json(silent=True))
+
+        employees = await db_manager.get_active_employees_by_ids(employee_ids)
+
+        return _reply(api.badge_issue_response(employee_ids, employees, ttl_days))
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/employees/<employee_id>', methods=['DELETE'])
+async def remove_employee(employee_id):
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        employee_id = employee_id.strip().upper()
+
+        success = await db_manager.update_employee_status(employee_id, False)
+
+        return _reply(api.employee_status_response(employee_id, False, success))
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/employees/<employee_id>', methods=['PUT'])
+async def update_employee(employee_id):
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        employee_id = employee_id.strip().upper()
+        data = await request.get_json(silent=True)
+
+        is_active = data.get('is_active', True)
+
+        success = await db_manager.update_employee_status(employee_id, is_active)
+
+        return _reply(api.employee_status_response(employee_id, is_active, success))
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/statistics', methods=['GET'])
+async def get_statistics():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    try:
+        args = api.parse_statistics_args(request.args)
+
+        etag = api.statistics_etag(await db_manager.get_scan_statistics_version(**args), args)
+        if api.etag_matches(request.headers.get('If-None-Match'), etag):
+            return _not_modified(etag)
+
+        stats = await db_manager.get_scan_statistics(**args)
+
+        return _reply_cached(api.statistics_response(stats, args['granularity']), etag)
+
+    except Exception as e:
+        return _reply(api.error_response(e))
+
+@app.route('/api/cache', methods=['GET'])
+async def cache_stats():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    return _reply(api.stats_response(
+        employee_cache=db_manager.get_cache_stats(),
+        scan_bitmap=db_manager.get_scan_bitmap_stats(),
+        scan_debounce=db_manager.get_scan_debounce_stats()
+    ))
+
+@app.route('/api/log-writer', methods=['GET'])
+async def log_writer_stats():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    return _reply(api.stats_response(log_writer=db_manager.get_log_writer_stats()))
+
+@app.route('/api/health', methods=['GET'])
+async def health_check():
+    if not db_manager:
+        return _reply(api.health_response())
+
+    return _reply(api.health_response(db_manager.get_readiness(), db_manager.get_service_stats()))
+
+@app.route('/api/health/live', methods=['GET'])
+async def liveness_check():
+    return _reply(api.liveness_response())
+
+@app.route('/api/health/ready', methods=['GET'])
+async def readiness_check():
+    return _reply(api.readiness_response(db_manager.get_readiness() if db_manager else None))
+
+@app.route('/api/pool', methods=['GET'])
+async def pool_stats():
+    if not db_manager:
+        return _reply(api.database_unavailable())
+
+    return _reply(api.stats_response(pool=db_manager.get_pool_stats()))
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5000))
+    host = os.environ.get('HOST', '0.0.0.0')
+    debug = os.environ.get('DEBUG', 'False').lower() == 'true'
+
+    app.run(debug=debug, host=host, port=port)
@@ -0,0 +1,790 @@
+import asyncio
+import time
+
+import psycopg
+from psycopg import AsyncClientCursor
+from psycopg.rows import dict_row, tuple_row
+from psycopg.types.string import TextLoader
+from psycopg_pool import AsyncConnectionPool
+
+import queries
+from config import Config
+import metrics
+import query_profiler
+from database import (
+    EMPLOYEES_CHANNEL, TIMED_METHODS, DatabaseManager, build_employee_page, build_log_page,
+    decode_employee_cursor, decode_log_cursor
+)
+from employee_cache import EmployeeCache
+from health_probe import ReadinessProbe
+from scan_bitmap import ScannedTodayBitmap
+from scan_debounce import ScanDebouncer
+from scan_log_writer import ScanLogWriter
+from scan_stream import SCAN_LOGS_CHANNEL, ScanEventBroker, parse_notification
+
+
+class ProfilingAsyncCursor(AsyncClientCursor):
+    """psycopg 3 counterpart of database.ProfilingCursor."""
+
+    async def execute(self, query, params=None, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = await super().execute(query, params, **kwargs)
+        except psycopg.Error as e:
+            duration = time.perf_counter() - started
+            statement = self._statement_text(query)
+            if query_profiler.observe(statement, duration):
+                query_profiler.log_slow_query(statement, params, duration, error=str(e).strip())
+            raise
+
+        duration = time.perf_counter() - started
+        statement = self._statement_text(query)
+        if query_profiler.observe(statement, duration):
+            plan = None
+            if query_profiler.sample_explain(statement):
+                plan = await self._explain(statement, params)
+            query_profiler.log_slow_query(statement, params, duration, plan)
+        return result
+
+    def _statement_text(self, query):
+        if isinstance(query, bytes):
+            return query.decode('utf-8', 'replace')
+        if isinstance(query, str):
+            return query
+        return query.as_string(self.connection)
+
+    async def _explain(self, statement, params):
+        conn = self.connection
+        cursor = AsyncClientCursor(conn, row_factory=tuple_row)
+        begin, rollback = (
+            ('BEGIN', 'ROLLBACK') if conn.autocommit else
+            ('SAVEPOINT query_profiler_explain', 'ROLLBACK TO SAVEPOINT query_profiler_explain')
+        )
+        try:
+            await cursor.execute(begin)
+            try:
+                await cursor.execute('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + statement, params)
+                return (await cursor.fetchone())[0]
+            finally:
+                await cursor.execute(rollback)
+        except psycopg.Error as e:
+            return {'error': str(e).strip()}
+        finally:
+            await cursor.close()
+
+
+class ProfilingAsyncConnectionPool(AsyncConnectionPool):
+    """Reports the time spent waiting for a connection as the request's "connect" timing."""
+
+    async def getconn(self, timeout=None):
+        started = time.perf_counter()
+        try:
+            return await super().getconn(timeout)
+        finally:
+            query_profiler.record_connect(time.perf_counter() - started)
+
+
+class AsyncDatabaseManager:
+    """
+    asyncio counterpart of DatabaseManager for async_app.py, built on a
+    psycopg 3 AsyncConnectionPool. It runs the same SQL (queries.py) and
+    shares the employee cache, scanned-today bitmap and log writer
+    classes, so a scan is decided exactly as in the Flask app.
+
+    Startup work and rare bulk operations (migrations, partition
+    maintenance, COPY imports) are delegated to a DatabaseManager without
+    runtime services, run in a worker thread. The batched log writer also
+    uses that manager's psycopg2 connections from its own thread. Its pool
+    is kept to 1..ASYNC_ADMIN_POOL_MAX_SIZE connections so a process does
+    not hold two full-size pools.
+    """
+
+    def __init__(self, database_url=None):
+        self.database_url = database_url or Config.DATABASE_URL
+        self.pool = None
+        self.admin = None
+        self.employee_cache = None
+        self.scanned_today = None
+        self.scan_debounce = None
+        self.log_writer = None
+        self.scan_stream = None
+        self.readiness = None
+        self._listener_connected = asyncio.Event()
+        self._employee_cache_stale = False
+        self._stream_listener_connected = asyncio.Event()
+        self._tasks = []
+
+    @property
+    def timezone(self):
+        """The database TimeZone; see DatabaseManager.load_timezone()."""
+        return self.admin.timezone if self.admin else None
+
+    async def open(self):
+        self.admin = await asyncio.to_thread(
+            DatabaseManager, self.database_url, runtime_services=False,
+            pool_min_size=1,
+            pool_max_size=Config.ASYNC_ADMIN_POOL_MAX_SIZE
+        )
+
+        self.pool = ProfilingAsyncConnectionPool(
+            self.database_url,
+            min_size=Config.DB_POOL_MIN_SIZE,
+            max_size=Config.DB_POOL_MAX_SIZE,
+            timeout=Config.DB_POOL_TIMEOUT,
+            max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+            kwargs={'row_factory': dict_row, 'cursor_factory': ProfilingAsyncCursor},
+            configure=self._configure_connection,
+            open=False
+        )
+        await self.pool.open(wait=True)
+        print(f"✓ Async connection pool ready (min={Config.DB_POOL_MIN_SIZE}, max={Config.DB_POOL_MAX_SIZE})")
+
+        await self.init_system_settings()
+
+        if Config.SCAN_STREAM_ENABLED:
+            await self.init_scan_stream()
+
+        if Config.EMPLOYEE_CACHE_ENABLED:
+            await self.init_employee_cache(listen=Config.EMPLOYEE_CACHE_LISTEN)
+
+        if Config.SCAN_BITMAP_ENABLED:
+            await self.init_scan_bitmap()
+
+        if Config.SCAN_DEBOUNCE_WINDOW > 0:
+            self.scan_debounce = ScanDebouncer(Config.SCAN_DEBOUNCE_WINDOW, Config.SCAN_DEBOUNCE_MAX_KEYS)
+
+        if Config.LOG_WRITER_ENABLED:
+            # Never block the event loop waiting for queue space; a full
+            # queue falls back to an awaited insert instead.
+            self.log_writer = ScanLogWriter(
+                self.admin.get_connection,
+                max_queue_size=Config.LOG_WRITER_QUEUE_SIZE,
+                batch_size=Config.LOG_WRITER_BATCH_SIZE,
+                flush_interval=Config.LOG_WRITER_FLUSH_INTERVAL,
+                enqueue_timeout=0
+            )
+
+        if Config.SCAN_LOGS_MAINTENANCE_INTERVAL > 0:
+            self._tasks.append(asyncio.create_task(self._run_partition_maintenance()))
+
+        if Config.EMPLOYEE_SUMMARY_REFRESH_INTERVAL > 0:
+            self._tasks.append(asyncio.create_task(self._run_summary_refresh()))
+
+        if metrics.enabled:
+            self._tasks.append(asyncio.create_task(self._run_metrics_refresh()))
+
+        self.readiness = ReadinessProbe(
+            interval=Config.HEALTH_PROBE_INTERVAL,
+            failure_threshold=Config.HEALTH_FAILURE_THRESHOLD,
+            max_db_latency_ms=Config.HEALTH_MAX_DB_LATENCY_MS,
+            max_pool_waiting=Config.HEALTH_MAX_POOL_WAITING,
+            max_log_queue_ratio=Config.HEALTH_MAX_LOG_QUEUE_RATIO
+        )
+        self._tasks.append(asyncio.create_task(self._run_readiness_checks()))
+
+    @staticmethod
+    async def _configure_connection(conn):
+        # psycopg2 returns inet columns as strings; do the same so rows
+        # serialise identically in both apps.
+        conn.adapters.register_loader('inet', TextLoader)
+
+    async def close(self):
+        if self.readiness:
+            self.readiness.mark_stopping()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self.log_writer:
+            await asyncio.to_thread(self.log_writer.close)
+        if self.scanned_today:
+            self.scanned_today.close()
+        if self.pool:
+            await self.pool.close()
+        if self.admin:
+            self.admin.close()
+
+    async def _fetch_all(self, query, params=None):
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(query, params)
+            return await cursor.fetchall()
+
+    async def _fetch_one(self, query, params=None):
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(query, params)
+            return await cursor.fetchone()
+
+    # Employee cache and scan bitmap
+
+    async def init_employee_cache(self, listen=True):
+        self.employee_cache = EmployeeCache(
+            self.admin._fetch_employee_by_id,
+            self.admin._fetch_active_employees,
+            negative_max_size=Config.EMPLOYEE_CACHE_NEGATIVE_MAX_SIZE
+        )
+
+        if listen:
+            # Start listening before warming so no change can slip in between
+            self._tasks.append(asyncio.create_task(self._listen_employee_changes()))
+            try:
+                await asyncio.wait_for(self._listener_connected.wait(), 10)
+            except asyncio.TimeoutError:
+                # Set before warming: whenever LISTEN lands, changes since
+                # this snapshot are caught up
+                self._employee_cache_stale = True
+                print("⚠ Employee change listener not connected yet; cache will resync when it is")
+
+        await self._warm_employee_cache()
+        print(f"✓ Employee cache warmed ({self.employee_cache.stats()['size']} active employees)")
+
+    async def _warm_employee_cache(self):
+        generation = self.employee_cache.generation
+        employees = await self._fetch_all(queries.SELECT_ACTIVE_EMPLOYEES)
+        return self.employee_cache.replace_all(employees, generation)
+
+    async def _resync_employee_cache(self):
+        self.employee_cache.invalidate_all()
+        await self._warm_employee_cache()
+
+    async def _listen_employee_changes(self):
+        first_connect = True
+
+        while True:
+            try:
+                conn = await psycopg.AsyncConnection.connect(self.database_url, autocommit=True)
+                async with conn:
+                    await conn.execute(f'LISTEN {EMPLOYEES_CHANNEL}')
+
+                    if not first_connect or self._employee_cache_stale:
+                        self._employee_cache_stale = False
+                        await self._resync_employee_cache()
+                    first_connect = False
+                    self._listener_connected.set()
+
+                    async for notify in conn.notifies():
+                        if notify.payload and notify.payload != '*':
+                            self.employee_cache.invalidate(notify.payload)
+                        else:
+                            await self._resync_employee_cache()
+
+            except (psycopg.Error, OSError) as e:
+                print(f"⚠ Notification listener disconnected: {e}")
+            finally:
+                self._listener_connected.clear()
+
+            await asyncio.sleep(2)
+
+    # System settings
+
+    async def init_system_settings(self):
+        self._tasks.append(asyncio.create_task(self._listen_system_settings()))
+        await asyncio.to_thread(self.admin.load_system_settings)
+
+    async def _listen_system_settings(self):
+        first_connect = True
+
+        while True:
+            try:
+                conn = await psycopg.AsyncConnection.connect(self.database_url, autocommit=True)
+                async with conn:
+                    await conn.execute(f'LISTEN {query_profiler.SETTINGS_CHANNEL}')
+
+                    if not first_connect:
+                        await asyncio.to_thread(self.admin.load_system_settings)
+                    first_connect = False
+
+                    async for _ in conn.notifies():
+                        await asyncio.to_thread(self.admin.load_system_settings)
+
+            except (psycopg.Error, OSError) as e:
+                print(f"⚠ System settings listener disconnected: {e}")
+
+            await asyncio.sleep(2)
+
+    # Live scan stream
+
+    async def init_scan_stream(self):
+        self.scan_stream = ScanEventBroker(
+            history_size=Config.SCAN_STREAM_HISTORY,
+            client_buffer=Config.SCAN_STREAM_CLIENT_BUFFER,
+            max_clients=Config.SCAN_STREAM_MAX_CLIENTS
+        )
+        self._tasks.append(asyncio.create_task(self._listen_scan_logs()))
+        try:
+            await asyncio.wait_for(self._stream_listener_connected.wait(), 10)
+        except asyncio.TimeoutError:
+            print("⚠ Scan stream listener not connected yet")
+
+    async def _resync_scan_stream(self):
+        last_event_id = self.scan_stream.last_event_id
+        if last_event_id is not None:
+            self.scan_stream.publish(await self.get_scan_events_after(last_event_id, Config.SCAN_STREAM_HISTORY))
+
+    async def _listen_scan_logs(self):
+        first_connect = True
+
+        while True:
+            try:
+                conn = await psycopg.AsyncConnection.connect(self.database_url, autocommit=True)
+                async with conn:
+                    await conn.execute(f'LISTEN {SCAN_LOGS_CHANNEL}')
+
+                    if not first_connect:
+                        await self._resync_scan_stream()
+                    first_connect = False
+                    self._stream_listener_connected.set()
+
+                    async for notify in conn.notifies():
+                        self.scan_stream.publish(parse_notification(notify.payload))
+
+            except (psycopg.Error, OSError) as e:
+                print(f"⚠ Scan stream listener disconnected: {e}")
+            finally:
+                self._stream_listener_connected.clear()
+
+            await asyncio.sleep(2)
+
+    async def get_scan_events_after(self, after_id, limit):
+        try:
+            return await self._fetch_all(*queries.scan_events_after_query(after_id, limit))
+        except psycopg.Error as e:
+            print(f"Error getting scan events: {e}")
+            raise
+
+    async def init_scan_bitmap(self):
+        result = await self._fetch_one(queries.SELECT_SCANNED_TODAY)
+
+        try:
+            self.scanned_today = ScannedTodayBitmap(
+                Config.SCAN_BITMAP_PATH,
+                capacity=Config.SCAN_BITMAP_CAPACITY,
+                timezone=result['timezone']
+            )
+        except (OSError, KeyError) as e:
+            print(f"⚠ Shared scan bitmap unavailable, using database only: {e}")
+            return
+
+        self.scanned_today.add_many(result['ordinals'], day=result['today'].toordinal())
+        print(f"✓ Scan bitmap warmed ({len(result['ordinals'])} employees scanned today, "
+              f"database TimeZone {result['timezone']})")
+
+    async def _run_partition_maintenance(self):
+        while True:
+            await asyncio.sleep(Config.SCAN_LOGS_MAINTENANCE_INTERVAL)
+            try:
+                await asyncio.to_thread(self.admin.maintain_scan_log_partitions)
+            except Exception:
+                pass
+
+    async def _run_summary_refresh(self):
+        interval = Config.EMPLOYEE_SUMMARY_REFRESH_INTERVAL
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh_employee_summary(max_age=interval / 2)
+            except Exception:
+                pass
+
+    async def _run_metrics_refresh(self):
+        while True:
+            await asyncio.sleep(Config.METRICS_GAUGE_INTERVAL)
+            try:
+                metrics.refresh_gauges(self.get_service_stats())
+            except Exception as e:
+                print(f"⚠ Metrics gauge refresh failed: {e}")
+
+    # Stats
+
+    def get_pool_stats(self):
+        if not self.pool:
+            return {'enabled': False}
+
+        stats = self.pool.get_stats()
+        stats['enabled'] = True
+        return stats
+
+    def get_cache_stats(self):
+        if not self.employee_cache:
+            return {'enabled': False}
+
+        stats = self.employee_cache.stats()
+        stats['enabled'] = True
+        stats['listening'] = self._listener_connected.is_set()
+        return stats
+
+    def get_log_writer_stats(self):
+        if not self.log_writer:
+            return {'enabled': False}
+
+        stats = self.log_writer.stats()
+        stats['enabled'] = True
+        return stats
+
+    def get_scan_bitmap_stats(self):
+        if not self.scanned_today:
+            return {'enabled': False}
+
+        stats = self.scanned_today.stats()
+        stats['enabled'] = True
+        return stats
+
+    def get_scan_debounce_stats(self):
+        if not self.scan_debounce:
+            return {'enabled': False}
+
+        stats = self.scan_debounce.stats()
+        stats['enabled'] = True
+        return stats
+
+    def get_scan_stream_stats(self):
+        if not self.scan_stream:
+            return {'enabled': False}
+
+        stats = self.scan_stream.stats()
+        stats['enabled'] = True
+        stats['listening'] = self._stream_listener_connected.is_set()
+        return stats
+
+    def get_service_stats(self):
+        return {
+            'pool': self.get_pool_stats(),
+            'employee_cache': self.get_cache_stats(),
+            'scan_bitmap': self.get_scan_bitmap_stats(),
+            'scan_debounce': self.get_scan_debounce_stats(),
+            'log_writer': self.get_log_writer_stats(),
+            'scan_stream': self.get_scan_stream_stats()
+        }
+
+    # Readiness
+
+    async def check_readiness(self):
+        started = time.perf_counter()
+        version, error = None, None
+        try:
+            version = (await self._fetch_one('SELECT version() as version'))['version']
+        except Exception as e:
+            error = e
+
+        self.readiness.update(time.perf_counter() - started, error, self.get_service_stats(), version)
+
+    async def _run_readiness_checks(self):
+        while True:
+            try:
+                await self.check_readiness()
+            except Exception as e:
+                print(f"⚠ Readiness check failed: {e}")
+            await asyncio.sleep(Config.HEALTH_PROBE_INTERVAL)
+
+    def get_readiness(self):
+        if not self.readiness:
+            return {'ready': False, 'reasons': ['readiness check disabled'], 'checked_at': None, 'checks': {}}
+        return self.readiness.result()
+
+    # Scans
+
+    async def log_scan_attempt(self, employee_id, status, ip_address=None, user_agent=None,
+                               additional_info=None, durable=None):
+        if durable is None:
+            durable = status == 'SUCCESS' and not Config.LOG_WRITER_ASYNC_SUCCESS
+
+        if self.log_writer and not durable:
+            if self.log_writer.submit(employee_id, status, ip_address, user_agent, additional_info):
+                return
+
+        try:
+            async with self.pool.connection() as conn:
+                await conn.execute(queries.INSERT_SCAN_LOG, (employee_id, status, ip_address, user_agent, additional_info))
+        except psycopg.Error as e:
+            print(f"Error logging scan attempt: {e}")
+            raise
+
+    async def process_scan(self, employee_id, ip_address=None, user_agent=None, device_id=None):
+        """Same decision path as DatabaseManager.process_scan()."""
+        source = device_id or ip_address
+        if self.scan_debounce:
+            scan = self.scan_debounce.get(employee_id, source)
+            if scan is not None:
+                metrics.scan_debounced()
+                return scan
+
+        scan = await self._decide_scan(employee_id, ip_address, user_agent)
+
+        if self.scan_debounce:
+            return self.scan_debounce.remember(employee_id, source, scan)
+        return scan
+
+    async def _decide_scan(self, employee_id, ip_address, user_agent):
+        if self.employee_cache:
+            employee = await self.get_employee_by_id(employee_id)
+
+            if employee is None:
+                await self.log_scan_attempt(employee_id, 'DENIED', ip_address, user_agent, 'Employee not found')
+                return {'outcome': 'NOT_FOUND'}
+
+            if self.scanned_today and self.scanned_today.contains(employee['id']):
+                await self.log_scan_attempt(employee_id, 'DENIED', ip_address, user_agent, 'Already scanned today')
+                return {
+                    'outcome': 'ALREADY_SCANNED',
+                    'ordinal': employee['id'],
+                    'name': employee['name'],
+                    'department': employee['department'],
+                    'position': employee['position']
+                }
+
+        scan = await self.record_scan(employee_id, ip_address, user_agent)
+        scan_date = scan.pop('scan_date')
+
+        if self.scanned_today and scan['outcome'] != 'NOT_FOUND':
+            self.scanned_today.add(scan['ordinal'], scan_date.toordinal())
+
+        return scan
+
+    async def record_scan(self, employee_id, ip_address=None, user_agent=None):
+        try:
+            return await self._fetch_one(queries.RECORD_SCAN, {
+                'employee_id': employee_id,
+                'ip_address': ip_address,
+                'user_agent': user_agent
+            })
+        except psycopg.Error as e:
+            print(f"Error recording scan: {e}")
+            raise
+
+    async def record_scan_batch(self, scans, ip_address=None, user_agent=None):
+        if not scans:
+            return []
+
+        employee_ids, scan_times, device_ids = (list(column) for column in zip(*scans))
+
+        try:
+            results = await self._fetch_all(queries.RECORD_SCAN_BATCH, {
+                'employee_ids': employee_ids,
+                'scan_times': scan_times,
+                'device_ids': device_ids,
+                'ip_address': ip_address,
+                'user_agent': user_agent
+            })
+        except psycopg.Error as e:
+            print(f"Error recording scan batch: {e}")
+            raise
+
+        today = results[0]['today'] if results else None
+        scanned_today = [
+            result['ordinal'] for result in results
+            if result['outcome'] != 'NOT_FOUND' and result['scan_date'] == today
+        ]
+        for result in results:
+            del result['scan_date'], result['today']
+
+        if self.scanned_today and scanned_today:
+            self.scanned_today.add_many(scanned_today, day=today.toordinal())
+
+        return results
+
+    # Scan logs
+
+    async def get_scan_logs(self, limit=50, offset=0, employee_id=None, status=None):
+        try:
+            return await self._fetch_all(*queries.scan_logs_query(limit, offset, employee_id, status))
+        except psycopg.Error as e:
+            print(f"Error getting scan logs: {e}")
+            raise
+
+    async def get_scan_logs_json(self, limit=50, offset=0, employee_id=None, status=None):
+        try:
+            result = await self._fetch_one(*queries.json_agg_query(
+                *queries.scan_logs_query(limit, offset, employee_id, status)
+            ))
+        except psycopg.Error as e:
+            print(f"Error getting scan logs: {e}")
+            raise
+        return result['rows'], result['count']
+
+    async def get_scan_logs_page(self, limit=50, cursor=None, employee_id=None, status=None):
+        direction, after_time, after_id = decode_log_cursor(cursor) if cursor else ('next', None, None)
+
+        try:
+            rows = await self._fetch_all(*queries.scan_logs_page_query(
+                limit, direction, after_time, after_id, employee_id, status
+            ))
+        except psycopg.Error as e:
+            print(f"Error getting scan logs page: {e}")
+            raise
+
+        return build_log_page(rows, limit, direction, cursor)
+
+    async def iter_scan_logs(self, start_time=None, end_time=None, employee_id=None, status=None,
+                             chunk_size=5000):
+        """Async generator of row lists; see DatabaseManager.iter_scan_logs()."""
+        try:
+            async with self.pool.connection() as conn:
+                async with conn.cursor(name='scan_logs_export') as cursor:
+                    cursor.itersize = chunk_size
+                    await cursor.execute(*queries.scan_logs_export_query(start_time, end_time, employee_id, status))
+
+                    while True:
+                        rows = await cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        yield rows
+        except psycopg.Error as e:
+            print(f"Error exporting scan logs: {e}")
+            raise
+
+    # Employees
+
+    async def get_employees(self, active_only=True):
+        try:
+            return await self._fetch_all(*queries.employees_query(active_only))
+        except psycopg.Error as e:
+            print(f"Error getting employees: {e}")
+            raise
+
+    async def search_employees(self, limit=50, cursor=None, q=None, match='prefix', department=None,
+                               position=None, is_active=True, fields=queries.EMPLOYEE_FIELDS):
+        after_name, after_id = decode_employee_cursor(cursor) if cursor else (None, None)
+
+        try:
+            rows = await self._fetch_all(*queries.employee_search_query(
+                limit, after_name, after_id, q, match, department, position, is_active, fields
+            ))
+        except psycopg.Error as e:
+            print(f"Error searching employees: {e}")
+            raise
+
+        return build_employee_page(rows, limit, fields)
+
+    async def get_active_employees_by_ids(self, employee_ids):
+        try:
+            return await self._fetch_all(queries.SELECT_ACTIVE_EMPLOYEES_BY_IDS, (list(employee_ids),))
+        except psycopg.Error as e:
+            print(f"Error getting employees: {e}")
+            raise
+
+    async def get_employees_json(self, active_only=True):
+        try:
+            result = await self._fetch_one(*queries.json_agg_query(*queries.employees_query(active_only)))
+        except psycopg.Error as e:
+            print(f"Error getting employees: {e}")
+            raise
+        return result['rows'], result['count']
+
+    async def get_employees_version(self, active_only=True):
+        try:
+            result = await self._fetch_one(*queries.employees_version_query(active_only))
+        except psycopg.Error as e:
+            print(f"Error getting employees version: {e}")
+            raise
+        return (result['count'], result['last_updated'], result['updated_sum'])
+
+    async def get_employee_by_id(self, employee_id):
+        if not self.employee_cache:
+            return await self._fetch_one(queries.SELECT_ACTIVE_EMPLOYEE, (employee_id,))
+
+        found, employee, generation = self.employee_cache.lookup(employee_id)
+        if found:
+            return employee
+
+        employee = await self._fetch_one(queries.SELECT_ACTIVE_EMPLOYEE, (employee_id,))
+        self.employee_cache.fill(employee_id, employee, generation)
+        return employee
+
+    def _invalidate_employee(self, employee_id):
+        if self.employee_cache:
+            self.employee_cache.invalidate(employee_id)
+
+    async def add_employee(self, employee_id, name, department=None, position=None):
+        try:
+            async with self.pool.connection() as conn:
+                await conn.execute(queries.INSERT_EMPLOYEE, (employee_id, name, department, position))
+        except psycopg.IntegrityError:
+            return False
+        except psycopg.Error as e:
+            print(f"Error adding employee: {e}")
+            raise
+
+        self._invalidate_employee(employee_id)
+        return True
+
+    async def update_employee_status(self, employee_id, is_active):
+        try:
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(queries.UPDATE_EMPLOYEE_STATUS, (is_active, employee_id))
+                affected_rows = cursor.rowcount
+        except psycopg.Error as e:
+            print(f"Error updating employee status: {e}")
+            raise
+
+        self._invalidate_employee(employee_id)
+        return affected_rows > 0
+
+    async def import_employees(self, rows, mode='upsert'):
+        result = await asyncio.to_thread(self.admin.import_employees, rows, mode)
+        if (result['inserted'] or result['updated']) and self.employee_cache:
+            self.employee_cache.invalidate_all()
+        return result
+
+    async def set_employees_status(self, employee_ids, is_active):
+        result = await asyncio.to_thread(self.admin.set_employees_status, employee_ids, is_active)
+        if result['updated'] and self.employee_cache:
+            self.employee_cache.invalidate_all()
+        return result
+
+    # Statistics
+
+    async def get_scan_statistics(self, start_date=None, end_date=None, granularity='day',
+                                  department=None, by_department=False):
+        query, params = queries.scan_statistics_query(start_date, end_date, granularity, department, by_department)
+
+        try:
+            return await self._fetch_all(query, params)
+        except psycopg.Error as e:
+            print(f"Error getting scan statistics: {e}")
+            raise
+
+    async def get_employee_scan_summary(self, department=None, employee_id=None, sort='total_scans',
+                                        descending=True, limit=50, offset=0):
+        query, params = queries.employee_summary_query(department, employee_id, sort, descending, limit, offset)
+        count_query, count_params = queries.employee_summary_count_query(department, employee_id)
+
+        try:
+            async with self.pool.connection() as conn:
+                cursor = await conn.execute(query, params)
+                rows = await cursor.fetchall()
+                cursor = await conn.execute(count_query, count_params)
+                return rows, (await cursor.fetchone())['total']
+        except psycopg.Error as e:
+            print(f"Error getting employee scan summary: {e}")
+            raise
+
+    async def get_employee_summary_info(self):
+        try:
+            return await self._fetch_one(queries.SELECT_EMPLOYEE_SUMMARY_INFO)
+        except psycopg.Error as e:
+            print(f"Error getting employee summary info: {e}")
+            raise
+
+    async def refresh_employee_summary(self, max_age=None):
+        return await asyncio.to_thread(self.admin.refresh_employee_summary, max_age)
+
+    async def get_scan_statistics_version(self, start_date=None, end_date=None, granularity='day',
+                                          department=None, by_department=False):
+        query, params = queries.scan_statistics_version_query(start_date, end_date, granularity, department)
+
+        try:
+            result = await self._fetch_one(query, params)
+        except psycopg.Error as e:
+            print(f"Error getting scan statistics version: {e}")
+            raise
+        return f"{result['scans']}-{result['buckets']}-{result['digest']}"
+
+
+# Only the methods this class defines; imports, bulk status changes and
+# summary refreshes are delegated to, and timed inside, the admin DatabaseManager
+ASYNC_TIMED_METHODS = [name for name in TIMED_METHODS
+                       if name in vars(AsyncDatabaseManager)
+                       and name not in ('import_employees', 'set_employees_status', 'refresh_employee_summary')]
+
+metrics.instrument(AsyncDatabaseManager, ASYNC_TIMED_METHODS)
+query_profiler.instrument(AsyncDatabaseManager, ASYNC_TIMED_METHODS)
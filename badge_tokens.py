@@ -0,0 +1,163 @@
+"""
+Signed badge payloads for the QR codes printed on employee badges.
+
+A badge token carries the employee ID, when it was issued and when it
+expires, signed with HMAC-SHA256 under one of the BADGE_SIGNING_KEYS:
+
+    QR1:<key id>:<employee id>:<issued at>:<expires at>:<signature>
+
+Times are Unix seconds and the signature is the first 16 bytes of the MAC,
+base64url without padding, which keeps the QR code small. POST
+/api/employees and the bulk import only accept IDs matching
+employee_import.EMPLOYEE_ID_PATTERN, which has no ':', so the ID stays
+readable in the token; issue() refuses older IDs that do contain one.
+
+POST /api/scan verifies the token in-process before any database access,
+so forged, corrupted and expired codes cost no query and no scan_logs row.
+Codes that are not tokens are plain employee IDs printed before signing
+existed; they are accepted only while BADGE_ACCEPT_LEGACY_IDS is on, and
+only when they match EMPLOYEE_ID_PATTERN, so arbitrary scanned text is
+denied without a lookup.
+
+Rotation: put the new key first in BADGE_SIGNING_KEYS (it signs new
+badges) and keep the old ones after it (they still verify) until every
+badge has been reissued; removing a key revokes the badges it signed.
+"""
+import base64
+import hashlib
+import hmac
+import re
+import secrets
+import time
+from datetime import datetime
+
+from config import Config
+from employee_import import EMPLOYEE_ID_PATTERN
+
+PREFIX = 'QR1'
+
+MAX_EMPLOYEE_ID_LENGTH = 50
+
+_SIGNATURE_BYTES = 16
+_KEY_ID = re.compile(r'^[A-Za-z0-9_-]{1,16}$')
+
+
+class BadgeError(ValueError):
+    """A scanned code that must be denied without looking anything up."""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+        self.message = message
+
+
+def parse_keys(value):
+    """'kid:secret,kid:secret' -> {kid: secret bytes}, in order; the first one signs."""
+    keys = {}
+    for entry in (value or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        key_id, sep, secret = entry.partition(':')
+        key_id, secret = key_id.strip(), secret.strip()
+        if not sep or not _KEY_ID.match(key_id) or not secret:
+            raise ValueError(f"BADGE_SIGNING_KEYS entry '{key_id}' must look like <key id>:<secret>, "
+                             f"with a key id of up to 16 letters, digits, '-' or '_'")
+        if len(secret) < 16:
+            raise ValueError(f"BADGE_SIGNING_KEYS secret for '{key_id}' is shorter than 16 characters")
+        keys[key_id] = secret.encode('utf-8')
+    return keys
+
+
+def new_key(key_id=None):
+    """A fresh BADGE_SIGNING_KEYS entry; the key id defaults to today's date."""
+    return f"{key_id or datetime.now().strftime('%Y%m%d')}:{secrets.token_urlsafe(32)}"
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+class BadgeSigner:
+
+    def __init__(self, keys, accept_legacy=True, clock_skew=300):
+        self.keys = dict(keys)
+        self.accept_legacy = accept_legacy
+        self.clock_skew = clock_skew
+
+    @property
+    def active_key_id(self):
+        return next(iter(self.keys), None)
+
+    def _signature(self, key, message):
+        return _b64(hmac.new(key, message.encode('utf-8'), hashlib.sha256).digest()[:_SIGNATURE_BYTES])
+
+    def issue(self, employee_id, ttl_days=None, issued_at=None):
+        """Token for `employee_id`; returns (token, expires_at as a datetime)."""
+        key_id = self.active_key_id
+        if key_id is None:
+            raise ValueError('BADGE_SIGNING_KEYS is not set, badges cannot be issued')
+
+        employee_id = str(employee_id).strip().upper()
+        if not employee_id or ':' in employee_id or len(employee_id) > MAX_EMPLOYEE_ID_LENGTH:
+            raise ValueError(f'invalid employee_id {employee_id!r}')
+
+        issued_at = int(issued_at if issued_at is not None else time.time())
+        expires_at = issued_at + int((ttl_days or Config.BADGE_TOKEN_TTL_DAYS) * 86400)
+
+        message = f'{PREFIX}:{key_id}:{employee_id}:{issued_at}:{expires_at}'
+        token = f'{message}:{self._signature(self.keys[key_id], message)}'
+        return token, datetime.fromtimestamp(expires_at)
+
+    def read(self, code, at=None):
+        """
+        Employee ID for a scanned code, verified if it is a token. `at`
+        (Unix seconds) is when the scan happened, for expiry; defaults to
+        now. Raises BadgeError.
+        """
+        code = str(code).strip()
+        if not code.startswith(PREFIX + ':'):
+            return self._read_legacy(code)
+
+        parts = code.split(':')
+        if len(parts) != 6:
+            raise BadgeError('INVALID_BADGE', 'Kode QR tidak valid')
+        _, key_id, employee_id, issued_at, expires_at, signature = parts
+
+        key = self.keys.get(key_id)
+        if key is None:
+            raise BadgeError('UNKNOWN_BADGE_KEY', 'Kode QR ditandatangani dengan kunci yang tidak dikenal')
+
+        expected = self._signature(key, code[:code.rindex(':')])
+        if not hmac.compare_digest(expected, signature):
+            raise BadgeError('INVALID_BADGE', 'Kode QR tidak valid')
+
+        # Signed, so these are ours; still guard against a malformed issuer
+        try:
+            issued_at, expires_at = int(issued_at), int(expires_at)
+        except ValueError:
+            raise BadgeError('INVALID_BADGE', 'Kode QR tidak valid') from None
+
+        at = at if at is not None else time.time()
+        if at >= expires_at:
+            raise BadgeError('BADGE_EXPIRED', 'Kode QR sudah kedaluwarsa, minta badge baru')
+        if issued_at > at + self.clock_skew:
+            raise BadgeError('INVALID_BADGE', 'Kode QR belum berlaku')
+
+        return employee_id
+
+    def _read_legacy(self, code):
+        if not self.accept_legacy:
+            raise BadgeError('LEGACY_BADGE_DISABLED', 'Badge lama tanpa tanda tangan tidak lagi diterima')
+
+        employee_id = code.upper()
+        if len(employee_id) > MAX_EMPLOYEE_ID_LENGTH or not EMPLOYEE_ID_PATTERN.match(employee_id):
+            raise BadgeError('INVALID_BADGE', 'Kode QR tidak valid')
+        return employee_id
+
+
+signer = BadgeSigner(
+    parse_keys(Config.BADGE_SIGNING_KEYS),
+    accept_legacy=Config.BADGE_ACCEPT_LEGACY_IDS,
+    clock_skew=Config.BADGE_CLOCK_SKEW
+)
@@ -0,0 +1,627 @@
+"""
+Gate-rush benchmark for the scan API.
+
+Creates (or reuses) a dedicated database, seeds it with employees and
+historical scan logs, boots the app against it and drives the workloads
+below at a fixed concurrency, then reports throughput and p50/p95/p99
+latency per endpoint and outcome:
+
+    rush     every reserved employee badges in once (ALLOWED)
+    repeat   badges that were already used today (DENIED)
+    admin    dashboards polling GET /api/logs and GET /api/statistics
+    mixed    the rest of the employees badge in, with some repeat scans,
+             while --pollers dashboards poll the admin endpoints
+
+    python benchmark.py                                   # gunicorn, all scenarios
+    python benchmark.py --server async --python /path/to/async-venv/bin/python
+    python benchmark.py --employees 20000 --history-scans 1000000 --concurrency 64
+    python benchmark.py --scenarios rush,admin --output results.json
+    python benchmark.py --no-seed --compare baseline.json --max-regression 0.15
+
+--output writes the results as JSON; --compare reads such a file and exits
+with status 1 when a throughput dropped or a p95 grew by more than
+--max-regression. --server none benchmarks an already running server
+(--url) whose database is --db-name.
+
+The benchmark database defaults to <DB_NAME>_bench and is dropped and
+recreated unless --no-seed is given; with --no-seed only today's scans
+are cleared so the rush starts from an empty day. Either way the database
+is written to, so the benchmark refuses DB_NAME itself and, without
+--force, any name not ending in _bench.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from urllib.parse import urlsplit
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor
+
+from config import Config
+from database import DatabaseManager
+from scan_log_partitions import add_months, create_partition
+from schema_migrations import migrate
+
+SCENARIOS = ('rush', 'repeat', 'admin', 'mixed')
+
+DEPARTMENTS = ('Operations', 'Warehouse', 'Finance', 'IT', 'HR', 'Sales', 'Security', 'Maintenance')
+
+ADMIN_REQUESTS = (
+    ('GET', '/api/logs?limit=50'),
+    ('GET', '/api/statistics'),
+)
+
+# Outcome label for POST /api/scan responses, as in metrics.py
+SCAN_OUTCOMES = {200: 'ALLOWED', 403: 'DENIED', 400: 'INVALID'}
+
+
+def database_url(db_name):
+    return f"postgresql://{Config.DB_USER}:{Config.DB_PASSWORD}@{Config.DB_HOST}:{Config.DB_PORT}/{db_name}"
+
+
+# Database setup
+
+def check_benchmark_database(db_name, force=False):
+    """Error message if `db_name` must not be dropped or cleared, else None."""
+    if db_name == Config.DB_NAME:
+        return f"--db-name {db_name} is the application database (DB_NAME); refusing to drop or clear it"
+    if not db_name.endswith('_bench') and not force:
+        return f"--db-name {db_name} does not end in _bench; pass --force if it really is a scratch database"
+    return None
+
+
+def recreate_database(db_name):
+    if db_name == Config.DB_NAME:
+        raise ValueError(f'refusing to drop the application database {db_name}')
+
+    conn = psycopg2.connect(database_url('postgres'))
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql.SQL('DROP DATABASE IF EXISTS {}').format(sql.Identifier(db_name)))
+            cursor.execute(sql.SQL('CREATE DATABASE {}').format(sql.Identifier(db_name)))
+    finally:
+        conn.close()
+
+
+def seed_database(url, employees, history_days, history_scans):
+    """
+    Insert `employees` active employees and `history_scans` scan_logs rows
+    spread over the `history_days` days before today (about one in ten
+    DENIED), with the matching daily_attendance rows. The statistics
+    rollup is kept up to date by its trigger.
+    """
+    conn = psycopg2.connect(url, cursor_factory=RealDictCursor)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SET LOCAL app.suppress_employee_notify = 'on'")
+            cursor.execute('DELETE FROM employees')
+            cursor.execute('''
+                INSERT INTO employees (employee_id, name, department, position)
+                SELECT 'B' || lpad(i::text, 7, '0'),
+                       'Bench Employee ' || i,
+                       (%s::text[])[1 + i %% %s],
+                       CASE WHEN i %% 25 = 0 THEN 'Supervisor' ELSE 'Staff' END
+                FROM generate_series(1, %s) AS i
+            ''', (list(DEPARTMENTS), len(DEPARTMENTS), employees))
+
+            month = date.fromordinal(date.today().toordinal() - history_days).replace(day=1)
+            while month <= date.today():
+                create_partition(cursor, month)
+                month = add_months(month, 1)
+
+            if history_scans and history_days:
+                # Nobody is listening yet; skip building a NOTIFY per row
+                cursor.execute('ALTER TABLE scan_logs DISABLE TRIGGER notify_scan_logs_inserted')
+                cursor.execute('''
+                    INSERT INTO scan_logs (employee_id, scan_time, status, ip_address, user_agent, device_id)
+                    SELECT 'B' || lpad((1 + (i * 7919) %% %(employees)s)::text, 7, '0'),
+                           CURRENT_DATE - (1 + i %% %(days)s) * INTERVAL '1 day'
+                               + INTERVAL '6 hours' + random() * INTERVAL '10 hours',
+                           CASE WHEN i %% 10 = 0 THEN 'DENIED' ELSE 'SUCCESS' END,
+                           ('10.0.' || (i %% 200) || '.' || (1 + i %% 250))::inet,
+                           'benchmark',
+                           'gate-' || (1 + i %% 8)
+                    FROM generate_series(1, %(scans)s) AS i
+                ''', {'employees': employees, 'days': history_days, 'scans': history_scans})
+                cursor.execute('ALTER TABLE scan_logs ENABLE TRIGGER notify_scan_logs_inserted')
+
+                cursor.execute('''
+                    INSERT INTO daily_attendance (employee_id, scan_date, first_scan_time)
+                    SELECT employee_id, scan_time::date, MIN(scan_time)
+                    FROM scan_logs
+                    WHERE status = 'SUCCESS'
+                    GROUP BY employee_id, scan_time::date
+                    ON CONFLICT (employee_id, scan_date) DO NOTHING
+                ''')
+        conn.commit()
+
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute('ANALYZE')
+    finally:
+        conn.close()
+
+
+def clear_today(url):
+    conn = psycopg2.connect(url)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('DELETE FROM daily_attendance WHERE scan_date >= CURRENT_DATE')
+            cursor.execute('DELETE FROM scan_logs WHERE scan_time >= CURRENT_DATE')
+        conn.commit()
+    finally:
+        conn.close()
+
+    admin = DatabaseManager(url, use_pool=False, runtime_services=False, auto_migrate=False)
+    try:
+        admin.rebuild_scan_statistics(start_date=date.today())
+    finally:
+        admin.close()
+
+
+def unscanned_employees(url):
+    conn = psycopg2.connect(url)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('''
+                SELECT e.employee_id FROM employees e
+                WHERE e.is_active
+                AND NOT EXISTS (
+                    SELECT 1 FROM daily_attendance a
+                    WHERE a.employee_id = e.employee_id AND a.scan_date = CURRENT_DATE
+                )
+            ''')
+            return [row[0] for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+
+# Server
+
+class AppServer:
+    """The app under test, running as a child process on 127.0.0.1."""
+
+    def __init__(self, kind, db_name, port, python, log_path, workers=None):
+        self.kind = kind
+        self.port = port
+        self.url = f'http://127.0.0.1:{port}'
+        self.log_path = log_path
+        self.process = None
+        self.env = dict(
+            os.environ,
+            DB_NAME=db_name,
+            HOST='127.0.0.1',
+            PORT=str(port),
+            DEBUG='False',
+            # Keep the node-wide bitmap and metrics files of this run apart
+            SCAN_BITMAP_PATH=os.path.join(os.path.dirname(log_path), 'scanned_today.bitmap'),
+            METRICS_MULTIPROC_DIR=os.path.join(os.path.dirname(log_path), 'metrics'),
+        )
+        if workers:
+            self.env['GUNICORN_WORKERS'] = str(workers)
+
+        if kind == 'gunicorn':
+            self.command = [python, '-m', 'gunicorn', '-c', 'gunicorn.conf.py']
+        elif kind == 'async':
+            self.command = [python, '-m', 'hypercorn', 'async_app:app',
+                            '--bind', f'127.0.0.1:{port}', '--workers', str(workers or 1)]
+        else:
+            self.command = [python, 'app.py']
+
+    def start(self, timeout=60):
+        log = open(self.log_path, 'wb')
+        self.process = subprocess.Popen(
+            self.command, cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=self.env, stdout=log, stderr=subprocess.STDOUT
+        )
+        log.close()
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'{self.kind} exited with {self.process.returncode}, see {self.log_path}')
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=2)
+                conn.request('GET', '/api/health/ready')
+                if conn.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.5)
+        self.stop()
+        raise RuntimeError(f'{self.kind} did not become ready within {timeout}s, see {self.log_path}')
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+# Load generation
+
+class Recorder:
+    """Latencies per endpoint label, merged from the client threads."""
+
+    def __init__(self):
+        self.samples = {}
+        self.statuses = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def merge(self, samples, statuses, errors):
+        with self._lock:
+            for label, values in samples.items():
+                self.samples.setdefault(label, []).extend(values)
+            for key, count in statuses.items():
+                self.statuses[key] = self.statuses.get(key, 0) + count
+            for label, count in errors.items():
+                self.errors[label] = self.errors.get(label, 0) + count
+
+
+class Client:
+    """One simulated gate or dashboard: a keep-alive connection and its own tallies."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.conn = None
+        # Each simulated gate is its own device, as far as scan debouncing goes
+        self.device_id = f'bench-{threading.get_ident()}'
+        self.samples = {}
+        self.statuses = {}
+        self.errors = {}
+
+    def request(self, method, path, body=None, label=None):
+        label = label or f'{method} {path.split("?")[0]}'
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        started = time.perf_counter()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.conn = None
+            self.errors[label] = self.errors.get(label, 0) + 1
+            return None
+        elapsed = time.perf_counter() - started
+
+        if method == 'POST' and path == '/api/scan':
+            label = f'{label} ({SCAN_OUTCOMES.get(response.status, "ERROR")})'
+        self.samples.setdefault(label, []).append(elapsed)
+        key = (label, response.status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if response.status >= 500:
+            self.errors[label] = self.errors.get(label, 0) + 1
+        return response.status
+
+    def scan(self, employee_id):
+        return self.request('POST', '/api/scan', json.dumps({'employee_id': employee_id, 'device_id': self.device_id}))
+
+    def close(self, recorder):
+        if self.conn is not None:
+            self.conn.close()
+        recorder.merge(self.samples, self.statuses, self.errors)
+
+
+class BadgeQueue:
+    """
+    Employees that have not badged in yet; each is handed out once. Queues
+    may share their `scanned` list, which repeat scans draw from.
+    """
+
+    def __init__(self, employee_ids, scanned=None):
+        self._ids = list(employee_ids)
+        self._lock = threading.Lock()
+        self.scanned = [] if scanned is None else scanned
+
+    def take(self):
+        with self._lock:
+            if not self._ids:
+                return None
+            employee_id = self._ids.pop()
+            self.scanned.append(employee_id)
+            return employee_id
+
+    def already_scanned(self):
+        scanned = self.scanned
+        return random.choice(scanned) if scanned else None
+
+
+def run_clients(url, count, work, duration):
+    """Run `work(client, stop)` on `count` threads until it returns or `duration` passes."""
+    recorder = Recorder()
+    stop = threading.Event()
+
+    def worker():
+        client = Client(url)
+        try:
+            work(client, stop)
+        finally:
+            client.close(recorder)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(count)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    deadline = started + duration
+    for thread in threads:
+        thread.join(max(0, deadline - time.perf_counter()))
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return recorder, time.perf_counter() - started
+
+
+def rush(url, args, badges):
+    def work(client, stop):
+        while not stop.is_set():
+            employee_id = badges.take()
+            if employee_id is None:
+                return
+            client.scan(employee_id)
+    return run_clients(url, args.concurrency, work, args.duration)
+
+
+def repeat(url, args, badges):
+    def work(client, stop):
+        while not stop.is_set():
+            employee_id = badges.already_scanned()
+            if employee_id is None:
+                return
+            client.scan(employee_id)
+    return run_clients(url, args.concurrency, work, args.duration)
+
+
+def admin(url, args, badges):
+    def work(client, stop):
+        while not stop.is_set():
+            method, path = random.choice(ADMIN_REQUESTS)
+            client.request(method, path)
+    return run_clients(url, args.concurrency, work, args.duration)
+
+
+def mixed(url, args, badges):
+    gates = max(1, args.concurrency - args.pollers)
+    roles = ['dashboard'] * args.pollers + ['gate'] * gates
+    lock = threading.Lock()
+
+    def work(client, stop):
+        with lock:
+            role = roles.pop()
+        while not stop.is_set():
+            if role == 'dashboard':
+                method, path = random.choice(ADMIN_REQUESTS)
+                client.request(method, path)
+                stop.wait(args.poll_interval)
+            elif random.random() < args.repeat_ratio and badges.scanned:
+                client.scan(badges.already_scanned())
+            else:
+                employee_id = badges.take()
+                if employee_id is None:
+                    # Everyone is in; the dashboards stop with the gates
+                    stop.set()
+                    return
+                client.scan(employee_id)
+
+    return run_clients(url, gates + args.pollers, work, args.duration)
+
+
+# Reporting
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(recorder, elapsed):
+    endpoints = {}
+    for label in sorted(set(recorder.samples) | set(recorder.errors)):
+        values = sorted(recorder.samples.get(label, []))
+        endpoints[label] = {
+            'requests': len(values),
+            'errors': recorder.errors.get(label, 0),
+            'throughput_rps': round(len(values) / elapsed, 1) if elapsed else 0.0,
+            'mean_ms': round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+            'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+            'max_ms': round(values[-1] * 1000, 2) if values else 0.0,
+            'statuses': {
+                str(status): count for (key, status), count in sorted(recorder.statuses.items()) if key == label
+            },
+        }
+    total = sum(endpoint['requests'] for endpoint in endpoints.values())
+    return {
+        'elapsed_s': round(elapsed, 3),
+        'requests': total,
+        'errors': sum(endpoint['errors'] for endpoint in endpoints.values()),
+        'throughput_rps': round(total / elapsed, 1) if elapsed else 0.0,
+        'endpoints': endpoints,
+    }
+
+
+def print_scenario(name, result):
+    print(f"\n{name}: {result['requests']} requests in {result['elapsed_s']}s "
+          f"({result['throughput_rps']} req/s, {result['errors']} errors)")
+    print(f"  {'endpoint':<32} {'count':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, endpoint in result['endpoints'].items():
+        print(f"  {label:<32} {endpoint['requests']:>7} {endpoint['throughput_rps']:>8} "
+              f"{endpoint['p50_ms']:>8} {endpoint['p95_ms']:>8} {endpoint['p99_ms']:>8} {endpoint['max_ms']:>8}")
+
+
+def compare(results, baseline, max_regression):
+    """Print the change against a previous --output file; returns the regressions found."""
+    regressions = []
+    print(f"\nCompared with {baseline['meta'].get('git_commit') or 'baseline'} "
+          f"(regression threshold {max_regression:.0%}):")
+
+    for name, result in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        for label, endpoint in result['endpoints'].items():
+            old = previous['endpoints'].get(label)
+            if not old or not old['requests'] or not endpoint['requests']:
+                continue
+
+            throughput = endpoint['throughput_rps'] / old['throughput_rps'] - 1 if old['throughput_rps'] else 0.0
+            p95 = endpoint['p95_ms'] / old['p95_ms'] - 1 if old['p95_ms'] else 0.0
+            flags = []
+            if throughput < -max_regression:
+                flags.append('throughput')
+            if p95 > max_regression:
+                flags.append('p95')
+            if flags:
+                regressions.append((name, label, flags))
+            print(f"  {name:<7} {label:<32} req/s {throughput:+7.1%}  p95 {p95:+7.1%}"
+                  f"{'  REGRESSION (' + ', '.join(flags) + ')' if flags else ''}")
+
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the scan API under gate-rush workloads')
+    parser.add_argument('--server', choices=('gunicorn', 'async', 'flask', 'none'), default='gunicorn',
+                        help='How to run the app; none uses an already running server at --url')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Server to use with --server none')
+    parser.add_argument('--port', type=int, default=5090, help='Port for the server started by the benchmark')
+    parser.add_argument('--workers', type=int, help='GUNICORN_WORKERS / hypercorn --workers')
+    parser.add_argument('--python', default=sys.executable, help='Interpreter that runs the server')
+    parser.add_argument('--db-name', default=f'{Config.DB_NAME}_bench', help='Database to seed and benchmark')
+    parser.add_argument('--no-seed', action='store_true', help='Reuse the seeded database, only clear today')
+    parser.add_argument('--force', action='store_true',
+                        help='Allow a --db-name without the _bench suffix (never DB_NAME itself)')
+    parser.add_argument('--employees', type=int, default=5000)
+    parser.add_argument('--history-days', type=int, default=30)
+    parser.add_argument('--history-scans', type=int, default=200000)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f'Comma-separated, run in order (default {",".join(SCENARIOS)})')
+    parser.add_argument('--concurrency', type=int, default=32, help='Client threads per scenario')
+    parser.add_argument('--duration', type=float, default=20, help='Longest a scenario may run, in seconds')
+    parser.add_argument('--pollers', type=int, default=4, help='Dashboards polling during the mixed scenario')
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between a dashboard\'s polls')
+    parser.add_argument('--repeat-ratio', type=float, default=0.2, help='Share of repeat scans in the mixed scenario')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='Results JSON from an earlier run to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.1,
+                        help='Allowed throughput drop / p95 growth before --compare fails (0.1 = 10%%)')
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    problem = check_benchmark_database(args.db_name, args.force)
+    if problem:
+        parser.error(problem)
+
+    url = database_url(args.db_name)
+    if not args.no_seed:
+        print(f"Seeding {args.db_name}: {args.employees} employees, "
+              f"{args.history_scans} scans over {args.history_days} days")
+        started = time.perf_counter()
+        recreate_database(args.db_name)
+        migrate(url)
+        seed_database(url, args.employees, args.history_days, args.history_scans)
+        print(f"✓ Seeded in {time.perf_counter() - started:.1f}s")
+    else:
+        clear_today(url)
+
+    employee_ids = unscanned_employees(url)
+    random.shuffle(employee_ids)
+    # The rush takes half the badges when the mixed scenario needs the rest
+    split = len(employee_ids) // 2 if 'mixed' in scenarios and 'rush' in scenarios else len(employee_ids)
+    rush_badges = BadgeQueue(employee_ids[:split])
+    mixed_badges = BadgeQueue(employee_ids[split:], scanned=rush_badges.scanned)
+
+    workdir = tempfile.mkdtemp(prefix='qr_benchmark_')
+    server = None
+    if args.server != 'none':
+        server = AppServer(args.server, args.db_name, args.port, args.python,
+                           os.path.join(workdir, 'server.log'), args.workers)
+        print(f"Starting {args.server} (log: {server.log_path})")
+        server.start()
+    base_url = server.url if server else args.url
+
+    results = {
+        'meta': {
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'server': args.server,
+            'workers': args.workers,
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'database': args.db_name,
+            'employees': args.employees,
+            'history_days': args.history_days,
+            'history_scans': args.history_scans,
+            'concurrency': args.concurrency,
+            'duration': args.duration,
+            'pollers': args.pollers,
+            'repeat_ratio': args.repeat_ratio,
+        },
+        'scenarios': {},
+    }
+
+    workloads = {'rush': rush, 'repeat': repeat, 'admin': admin, 'mixed': mixed}
+    try:
+        for name in scenarios:
+            if name == 'repeat' and not rush_badges.scanned:
+                print(f"\n{name}: skipped, no employee has badged in yet (run rush or mixed first)")
+                continue
+            badges = mixed_badges if name == 'mixed' else rush_badges
+            recorder, elapsed = workloads[name](base_url, args, badges)
+            results['scenarios'][name] = summarize(recorder, elapsed)
+            print_scenario(name, results['scenarios'][name])
+    finally:
+        if server:
+            server.stop()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            print(f"✗ {len(regressions)} regression(s)")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,6 +15,148 @@ class Config:
     
     DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     
+    # Apply pending schema migrations on startup; when False the app only
+    # checks the schema version and `python manage.py migrate` must be run
+    DB_AUTO_MIGRATE = (os.environ.get('DB_AUTO_MIGRATE') or 'True').lower() == 'true'
+    
+    # Set by wsgi.py so importing app.py does not open database connections;
+    # each server worker then calls app.init_database() after it is forked
+    DB_DEFER_INIT = (os.environ.get('DB_DEFER_INIT') or 'False').lower() == 'true'
+    
+    # Connection pool (set DB_POOL_ENABLED=False to open one connection per call)
+    DB_POOL_ENABLED = (os.environ.get('DB_POOL_ENABLED') or 'True').lower() == 'true'
+    DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE') or 2)
+    DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE') or 10)
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT') or 5)
+    DB_POOL_MAX_USES = int(os.environ.get('DB_POOL_MAX_USES') or 5000)
+    DB_POOL_MAX_LIFETIME = float(os.environ.get('DB_POOL_MAX_LIFETIME') or 1800)
+    DB_POOL_HEALTH_CHECK_INTERVAL = float(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL') or 30)
+    # async_app.py keeps a second, psycopg2 pool per process for the log
+    # writer, imports and maintenance; scans and reads use the main pool
+    ASYNC_ADMIN_POOL_MAX_SIZE = int(os.environ.get('ASYNC_ADMIN_POOL_MAX_SIZE') or 2)
+    
+    # Employee directory cache, invalidated through LISTEN/NOTIFY
+    EMPLOYEE_CACHE_ENABLED = (os.environ.get('EMPLOYEE_CACHE_ENABLED') or 'True').lower() == 'true'
+    EMPLOYEE_CACHE_LISTEN = (os.environ.get('EMPLOYEE_CACHE_LISTEN') or 'True').lower() == 'true'
+    EMPLOYEE_CACHE_NEGATIVE_MAX_SIZE = int(os.environ.get('EMPLOYEE_CACHE_NEGATIVE_MAX_SIZE') or 10000)
+    
+    # Node-wide shared-memory "already scanned today" set
+    SCAN_BITMAP_ENABLED = (os.environ.get('SCAN_BITMAP_ENABLED') or 'True').lower() == 'true'
+    SCAN_BITMAP_PATH = os.environ.get('SCAN_BITMAP_PATH') or os.path.join(
+        '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+        f'aski_scanned_today_{DB_NAME}.bitmap'
+    )
+    SCAN_BITMAP_CAPACITY = int(os.environ.get('SCAN_BITMAP_CAPACITY') or 1048576)
+    
+    # POST /api/scan repeats of the same badge from the same device (or IP)
+    # within this many seconds get the first answer back without touching
+    # the database; the window runs from the first decision and repeats do
+    # not extend it (0 = off)
+    SCAN_DEBOUNCE_WINDOW = float(os.environ.get('SCAN_DEBOUNCE_WINDOW') or 2)
+    SCAN_DEBOUNCE_MAX_KEYS = int(os.environ.get('SCAN_DEBOUNCE_MAX_KEYS') or 10000)
+    
+    # Background batched writer for DENIED/ERROR scan_logs rows
+    LOG_WRITER_ENABLED = (os.environ.get('LOG_WRITER_ENABLED') or 'True').lower() == 'true'
+    LOG_WRITER_ASYNC_SUCCESS = (os.environ.get('LOG_WRITER_ASYNC_SUCCESS') or 'False').lower() == 'true'
+    LOG_WRITER_QUEUE_SIZE = int(os.environ.get('LOG_WRITER_QUEUE_SIZE') or 10000)
+    LOG_WRITER_BATCH_SIZE = int(os.environ.get('LOG_WRITER_BATCH_SIZE') or 500)
+    LOG_WRITER_FLUSH_INTERVAL = float(os.environ.get('LOG_WRITER_FLUSH_INTERVAL') or 0.5)
+    LOG_WRITER_ENQUEUE_TIMEOUT = float(os.environ.get('LOG_WRITER_ENQUEUE_TIMEOUT') or 0.05)
+    
+    # Monthly scan_logs partitions: how many future months to pre-create, how
+    # many past months to keep (0 = keep forever) and how often to check
+    SCAN_LOGS_PARTITIONS_AHEAD = int(os.environ.get('SCAN_LOGS_PARTITIONS_AHEAD') or 2)
+    SCAN_LOGS_RETENTION_MONTHS = int(os.environ.get('SCAN_LOGS_RETENTION_MONTHS') or 0)
+    SCAN_LOGS_MAINTENANCE_INTERVAL = float(os.environ.get('SCAN_LOGS_MAINTENANCE_INTERVAL') or 21600)
+    # Seconds ATTACH/DETACH PARTITION may wait for their locks before the
+    # month is deferred to the next run
+    SCAN_LOGS_MAINTENANCE_LOCK_TIMEOUT = float(os.environ.get('SCAN_LOGS_MAINTENANCE_LOCK_TIMEOUT') or 5)
+    
+    # How often (seconds) the employee_scan_summary materialized view behind
+    # GET /api/employees/summary is refreshed (0 = only on demand)
+    EMPLOYEE_SUMMARY_REFRESH_INTERVAL = float(os.environ.get('EMPLOYEE_SUMMARY_REFRESH_INTERVAL') or 300)
+    
+    # /api/scan/batch: most scans per request, how far ahead of the server
+    # clock a device timestamp may be, and how old (seconds) a replayed scan
+    # may be before it is rejected
+    SCAN_BATCH_MAX_SIZE = int(os.environ.get('SCAN_BATCH_MAX_SIZE') or 1000)
+    SCAN_BATCH_MAX_CLOCK_SKEW = float(os.environ.get('SCAN_BATCH_MAX_CLOCK_SKEW') or 300)
+    SCAN_BATCH_MAX_AGE = float(os.environ.get('SCAN_BATCH_MAX_AGE') or 259200)
+    
+    # Signed badge QR codes (badge_tokens.py). BADGE_SIGNING_KEYS is
+    # "kid:secret,kid:secret": the first key signs new badges, all of them
+    # verify. Plain employee IDs (badges printed before signing) are only
+    # accepted while BADGE_ACCEPT_LEGACY_IDS is on. POST /api/badges needs
+    # "Authorization: Bearer <BADGE_ISSUE_API_KEY>" and is off while that is empty
+    BADGE_SIGNING_KEYS = os.environ.get('BADGE_SIGNING_KEYS') or ''
+    BADGE_ACCEPT_LEGACY_IDS = (os.environ.get('BADGE_ACCEPT_LEGACY_IDS') or 'True').lower() == 'true'
+    BADGE_TOKEN_TTL_DAYS = float(os.environ.get('BADGE_TOKEN_TTL_DAYS') or 365)
+    BADGE_CLOCK_SKEW = float(os.environ.get('BADGE_CLOCK_SKEW') or 300)
+    BADGE_ISSUE_API_KEY = os.environ.get('BADGE_ISSUE_API_KEY') or ''
+    
+    # Let PostgreSQL encode the rows of GET /api/employees and offset-mode
+    # GET /api/logs with json_agg instead of building Python dicts (its
+    # timestamps drop trailing zeros from the fractional seconds)
+    JSON_AGG_ENABLED = (os.environ.get('JSON_AGG_ENABLED') or 'False').lower() == 'true'
+    
+    # GET /api/logs/stream (server-sent events fed by NOTIFY on scan_logs).
+    # Limits are per process: under gunicorn each open stream occupies a
+    # worker thread, so gunicorn.conf.py caps SCAN_STREAM_MAX_CLIENTS at
+    # GUNICORN_THREADS - 2 (async_app has no such constraint). A viewer
+    # more than SCAN_STREAM_CLIENT_BUFFER events behind is disconnected and
+    # resumes from the last SCAN_STREAM_HISTORY events when it reconnects.
+    SCAN_STREAM_ENABLED = (os.environ.get('SCAN_STREAM_ENABLED') or 'True').lower() == 'true'
+    SCAN_STREAM_MAX_CLIENTS = int(os.environ.get('SCAN_STREAM_MAX_CLIENTS') or 1)
+    SCAN_STREAM_CLIENT_BUFFER = int(os.environ.get('SCAN_STREAM_CLIENT_BUFFER') or 256)
+    SCAN_STREAM_HISTORY = int(os.environ.get('SCAN_STREAM_HISTORY') or 1000)
+    SCAN_STREAM_HEARTBEAT = float(os.environ.get('SCAN_STREAM_HEARTBEAT') or 15)
+    
+    # GET /api/employees and /api/statistics send an ETag and answer
+    # If-None-Match with 304; shared caches (nginx) may reuse a response
+    # for this many seconds (0 = always revalidate)
+    HTTP_CACHE_SHARED_MAX_AGE = int(os.environ.get('HTTP_CACHE_SHARED_MAX_AGE') or 2)
+    
+    # GET /api/health/ready (and /api/health) answer from a check each
+    # process runs every HEALTH_PROBE_INTERVAL seconds. The process reports
+    # not ready (503) after HEALTH_FAILURE_THRESHOLD failed checks in a row:
+    # database unreachable or slower than HEALTH_MAX_DB_LATENCY_MS, more than
+    # HEALTH_MAX_POOL_WAITING requests waiting for a connection (0 = ignore),
+    # scan log queue HEALTH_MAX_LOG_QUEUE_RATIO full, or a cold employee cache
+    HEALTH_PROBE_INTERVAL = float(os.environ.get('HEALTH_PROBE_INTERVAL') or 5)
+    HEALTH_FAILURE_THRESHOLD = int(os.environ.get('HEALTH_FAILURE_THRESHOLD') or 2)
+    HEALTH_MAX_DB_LATENCY_MS = float(os.environ.get('HEALTH_MAX_DB_LATENCY_MS') or 1000)
+    HEALTH_MAX_POOL_WAITING = int(os.environ.get('HEALTH_MAX_POOL_WAITING') or DB_POOL_MAX_SIZE)
+    HEALTH_MAX_LOG_QUEUE_RATIO = float(os.environ.get('HEALTH_MAX_LOG_QUEUE_RATIO') or 0.8)
+    
+    # Prometheus metrics at GET /metrics (needs prometheus_client). Under
+    # gunicorn workers share METRICS_MULTIPROC_DIR, which is emptied at start
+    METRICS_ENABLED = (os.environ.get('METRICS_ENABLED') or 'True').lower() == 'true'
+    METRICS_GAUGE_INTERVAL = float(os.environ.get('METRICS_GAUGE_INTERVAL') or 5)
+    METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR') or os.path.join(
+        tempfile.gettempdir(), f'aski_metrics_{DB_NAME}'
+    )
+    
+    # Database profiling (query_profiler.py): a Server-Timing header with
+    # per-query timings, a JSON log line for statements slower than
+    # PROFILING_SLOW_QUERY_MS (0 = off), and EXPLAIN (ANALYZE, BUFFERS) for
+    # this fraction of them. These are defaults; `python manage.py settings`
+    # changes them for all running processes without a restart.
+    PROFILING_SERVER_TIMING = (os.environ.get('PROFILING_SERVER_TIMING') or 'False').lower() == 'true'
+    PROFILING_SLOW_QUERY_MS = float(os.environ.get('PROFILING_SLOW_QUERY_MS') or 250)
+    PROFILING_EXPLAIN_SAMPLE_RATE = float(os.environ.get('PROFILING_EXPLAIN_SAMPLE_RATE') or 0)
+    
+    # gunicorn (gunicorn.conf.py). GUNICORN_WORKERS=0 sizes the worker count
+    # from the CPUs available to the process; every worker has its own
+    # pool, so workers x DB_POOL_MAX_SIZE must fit in max_connections
+    # (plus ASYNC_ADMIN_POOL_MAX_SIZE per process for async_app.py)
+    GUNICORN_WORKERS = int(os.environ.get('GUNICORN_WORKERS') or os.environ.get('WEB_CONCURRENCY') or 0)
+    GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS') or 4)
+    GUNICORN_TIMEOUT = int(os.environ.get('GUNICORN_TIMEOUT') or 30)
+    GUNICORN_GRACEFUL_TIMEOUT = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT') or 25)
+    GUNICORN_KEEPALIVE = int(os.environ.get('GUNICORN_KEEPALIVE') or 5)
+    GUNICORN_MAX_REQUESTS = int(os.environ.get('GUNICORN_MAX_REQUESTS') or 0)
+    GUNICORN_PRELOAD = (os.environ.get('GUNICORN_PRELOAD') or 'True').lower() == 'true'
+    
     CORS_ORIGINS = ["*"]
     
     LOG_LEVEL = "INFO"
@@ -1,16 +1,441 @@
+import atexit
+import base64
+import json
+import threading
 import psycopg2
+import psycopg2.extensions
 from psycopg2.extras import RealDictCursor
 from datetime import datetime
 import os
 import time
+from zoneinfo import ZoneInfo
 from config import Config
+from db_pool import ConnectionPool
+from employee_cache import EmployeeCache
+from employee_import import EmployeeCopySource
+from health_probe import ReadinessProbe
+from pg_listener import PgListener
+from scan_bitmap import ScannedTodayBitmap
+from scan_debounce import ScanDebouncer
+from scan_log_partitions import maintain_partitions
+from scan_log_writer import ScanLogWriter
+from scan_stream import SCAN_LOGS_CHANNEL, ScanEventBroker, parse_notification
+import metrics
+import queries
+import query_profiler
+from schema_migrations import MigrationError, migrate, pending_migrations
+
+EMPLOYEES_CHANNEL = 'employees_changed'
+
+
+class ProfilingCursor(RealDictCursor):
+    """
+    RealDictCursor that reports each statement's duration to
+    query_profiler, and for a sampled slow one captures its plan with
+    EXPLAIN (ANALYZE, BUFFERS) before the caller fetches the rows. The
+    statement runs a second time for that, inside a savepoint (or a
+    transaction, on autocommit connections) that is rolled back.
+    """
+    
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        except psycopg2.Error as e:
+            duration = time.perf_counter() - started
+            statement = self._statement_text(query)
+            if query_profiler.observe(statement, duration):
+                query_profiler.log_slow_query(statement, vars, duration, error=str(e).strip())
+            raise
+        
+        duration = time.perf_counter() - started
+        statement = self._statement_text(query)
+        if query_profiler.observe(statement, duration):
+            plan = None
+            if self.name is None and query_profiler.sample_explain(statement):
+                plan = self._explain(query, vars)
+            query_profiler.log_slow_query(statement, vars, duration, plan)
+        return result
+    
+    def _statement_text(self, query):
+        if isinstance(query, bytes):
+            return query.decode('utf-8', 'replace')
+        if isinstance(query, str):
+            return query
+        return query.as_string(self)
+    
+    def _explain(self, query, vars):
+        conn = self.connection
+        cursor = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+        begin, rollback = (
+            ('BEGIN', 'ROLLBACK') if conn.autocommit else
+            ('SAVEPOINT query_profiler_explain', 'ROLLBACK TO SAVEPOINT query_profiler_explain')
+        )
+        try:
+            cursor.execute(begin)
+            try:
+                cursor.execute('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + self._statement_text(query), vars)
+                return cursor.fetchone()[0]
+            finally:
+                cursor.execute(rollback)
+        except psycopg2.Error as e:
+            return {'error': str(e).strip()}
+        finally:
+            cursor.close()
+
+
+def encode_log_cursor(direction, scan_time, log_id):
+    """Opaque pagination token for a position in scan_logs."""
+    raw = json.dumps([direction, scan_time.isoformat(), log_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_log_cursor(token):
+    """Inverse of encode_log_cursor(); raises ValueError for bad tokens."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, scan_time, log_id = json.loads(raw)
+        if direction not in ('next', 'prev') or not isinstance(log_id, int):
+            raise ValueError
+        return direction, datetime.fromisoformat(scan_time), log_id
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError('invalid cursor')
+
+
+def build_log_page(rows, limit, direction, cursor):
+    """
+    Turn the limit + 1 rows fetched by queries.scan_logs_page_query() into
+    the page returned by get_scan_logs_page().
+    """
+    has_more = len(rows) > limit
+    logs = rows[:limit]
+    if direction == 'prev':
+        logs.reverse()
+    
+    next_cursor = prev_cursor = None
+    if logs:
+        first, last = logs[0], logs[-1]
+        if direction == 'prev' or has_more:
+            next_cursor = encode_log_cursor('next', last['scan_time'], last['id'])
+        if (direction == 'next' and cursor) or (direction == 'prev' and has_more):
+            prev_cursor = encode_log_cursor('prev', first['scan_time'], first['id'])
+    
+    return {
+        'logs': logs,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor
+    }
+
+def encode_employee_cursor(name, employee_id):
+    """Opaque pagination token for a position in the (name, employee_id) order."""
+    raw = json.dumps([name, employee_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_employee_cursor(token):
+    """Inverse of encode_employee_cursor(); raises ValueError for bad tokens."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        name, employee_id = json.loads(raw)
+        if not isinstance(name, str) or not isinstance(employee_id, str):
+            raise ValueError
+        return name, employee_id
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError('invalid cursor')
+
+
+def build_employee_page(rows, limit, fields):
+    """
+    Turn the limit + 1 rows fetched by queries.employee_search_query() into
+    the page returned by search_employees(), dropping the ordering columns
+    the caller did not ask for.
+    """
+    has_more = len(rows) > limit
+    employees = rows[:limit]
+    
+    next_cursor = None
+    if has_more:
+        last = employees[-1]
+        next_cursor = encode_employee_cursor(last['name'], last['employee_id'])
+    
+    return {
+        'employees': [{field: row[field] for field in fields} for row in employees],
+        'next_cursor': next_cursor
+    }
 
 class DatabaseManager:
     
-    def __init__(self, database_url=None):
+    def __init__(self, database_url=None, use_pool=None, runtime_services=True, auto_migrate=None,
+                 pool_min_size=None, pool_max_size=None):
+        """
+        runtime_services=False skips the employee cache, scan bitmap and
+        background log writer, for short-lived tools such as manage.py.
+        auto_migrate defaults to Config.DB_AUTO_MIGRATE, and the pool size
+        to DB_POOL_MIN_SIZE/DB_POOL_MAX_SIZE.
+        """
         self.database_url = database_url or Config.DATABASE_URL
+        self.auto_migrate = Config.DB_AUTO_MIGRATE if auto_migrate is None else auto_migrate
+        self.pool = None
+        self.employee_cache = None
+        self.listener = None
+        self.scanned_today = None
+        self.scan_debounce = None
+        self.log_writer = None
+        self.scan_stream = None
+        self.readiness = None
+        self.timezone = None
+        self._maintenance_stop = threading.Event()
         self.connect_with_retry()
+        
+        if Config.DB_POOL_ENABLED if use_pool is None else use_pool:
+            min_size = Config.DB_POOL_MIN_SIZE if pool_min_size is None else pool_min_size
+            max_size = Config.DB_POOL_MAX_SIZE if pool_max_size is None else pool_max_size
+            self.pool = ConnectionPool(
+                self.database_url,
+                min_size=min_size,
+                max_size=max_size,
+                timeout=Config.DB_POOL_TIMEOUT,
+                max_uses=Config.DB_POOL_MAX_USES,
+                max_lifetime=Config.DB_POOL_MAX_LIFETIME,
+                health_check_interval=Config.DB_POOL_HEALTH_CHECK_INTERVAL,
+                cursor_factory=ProfilingCursor
+            )
+            print(f"✓ Connection pool ready (min={min_size}, max={max_size})")
+        
         self.init_database()
+        self.timezone = self.load_timezone()
+        
+        if not runtime_services:
+            return
+        
+        self.init_system_settings()
+        
+        if Config.SCAN_STREAM_ENABLED:
+            self.init_scan_stream()
+        
+        if Config.EMPLOYEE_CACHE_ENABLED:
+            self.init_employee_cache(listen=Config.EMPLOYEE_CACHE_LISTEN)
+        
+        if self.listener:
+            self.listener.start()
+        
+        if Config.SCAN_BITMAP_ENABLED:
+            self.init_scan_bitmap()
+        
+        if Config.SCAN_DEBOUNCE_WINDOW > 0:
+            self.scan_debounce = ScanDebouncer(Config.SCAN_DEBOUNCE_WINDOW, Config.SCAN_DEBOUNCE_MAX_KEYS)
+        
+        if Config.LOG_WRITER_ENABLED:
+            self.log_writer = ScanLogWriter(
+                self.get_connection,
+                max_queue_size=Config.LOG_WRITER_QUEUE_SIZE,
+                batch_size=Config.LOG_WRITER_BATCH_SIZE,
+                flush_interval=Config.LOG_WRITER_FLUSH_INTERVAL,
+                enqueue_timeout=Config.LOG_WRITER_ENQUEUE_TIMEOUT
+            )
+            atexit.register(self.close)
+        
+        if Config.SCAN_LOGS_MAINTENANCE_INTERVAL > 0:
+            threading.Thread(
+                target=self._run_partition_maintenance,
+                name='scan-logs-partition-maintenance',
+                daemon=True
+            ).start()
+        
+        if Config.EMPLOYEE_SUMMARY_REFRESH_INTERVAL > 0:
+            threading.Thread(
+                target=self._run_summary_refresh,
+                name='employee-summary-refresh',
+                daemon=True
+            ).start()
+        
+        if metrics.enabled:
+            threading.Thread(
+                target=self._run_metrics_refresh,
+                name='metrics-gauges',
+                daemon=True
+            ).start()
+        
+        self.readiness = ReadinessProbe(
+            interval=Config.HEALTH_PROBE_INTERVAL,
+            failure_threshold=Config.HEALTH_FAILURE_THRESHOLD,
+            max_db_latency_ms=Config.HEALTH_MAX_DB_LATENCY_MS,
+            max_pool_waiting=Config.HEALTH_MAX_POOL_WAITING,
+            max_log_queue_ratio=Config.HEALTH_MAX_LOG_QUEUE_RATIO
+        )
+        threading.Thread(
+            target=self._run_readiness_checks,
+            name='readiness-check',
+            daemon=True
+        ).start()
+    
+    def init_employee_cache(self, listen=True):
+        self.employee_cache = EmployeeCache(
+            self._fetch_employee_by_id,
+            self._fetch_active_employees,
+            negative_max_size=Config.EMPLOYEE_CACHE_NEGATIVE_MAX_SIZE
+        )
+        
+        if listen:
+            # Start listening before warming so no change can slip in between
+            self._get_listener().subscribe(
+                EMPLOYEES_CHANNEL,
+                self.employee_cache.handle_notification,
+                self.employee_cache.resync
+            )
+            self.listener.start()
+            if not self.listener.ready.wait(10):
+                # Requested before warming: whenever LISTEN lands, changes
+                # since this snapshot are caught up
+                self.listener.request_resync(EMPLOYEES_CHANNEL)
+                print("⚠ Employee change listener not connected yet; cache will resync when it is")
+        
+        self.employee_cache.warm()
+        print(f"✓ Employee cache warmed ({self.employee_cache.stats()['size']} active employees)")
+    
+    def init_system_settings(self):
+        # Changes made with `manage.py settings` (or directly in the table)
+        # reach every process through the shared listener
+        self._get_listener().subscribe(
+            query_profiler.SETTINGS_CHANNEL,
+            self._handle_settings_notification,
+            self.load_system_settings
+        )
+        self.load_system_settings()
+    
+    def _handle_settings_notification(self, payload):
+        self.load_system_settings()
+    
+    def load_system_settings(self):
+        """Apply the system_settings rows on top of the config.py defaults."""
+        rows = self.get_system_settings()
+        query_profiler.settings.apply({row['setting_key']: row['setting_value'] for row in rows})
+    
+    def get_system_settings(self):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(queries.SELECT_SYSTEM_SETTINGS)
+            return cursor.fetchall()
+            
+        except psycopg2.Error as e:
+            print(f"Error getting system settings: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def set_system_setting(self, name, value):
+        """
+        Override a setting for every running process, or restore its
+        config.py default when `value` is None. Raises ValueError for an
+        unknown name or invalid value.
+        """
+        if value is None:
+            query_profiler.ProfilerSettings.check_name(name)
+        else:
+            query_profiler.ProfilerSettings.parse(name, value)
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            if value is None:
+                cursor.execute(queries.DELETE_SYSTEM_SETTING, (name,))
+            else:
+                cursor.execute(queries.UPSERT_SYSTEM_SETTING, (
+                    name, str(value), query_profiler.ProfilerSettings.DESCRIPTIONS[name]
+                ))
+            conn.commit()
+            
+        except psycopg2.Error as e:
+            conn.rollback()
+            print(f"Error saving system setting: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def _get_listener(self):
+        """The shared notification listener; channels are subscribed before it starts."""
+        if self.listener is None:
+            self.listener = PgListener(self.database_url)
+        return self.listener
+    
+    def init_scan_stream(self):
+        self.scan_stream = ScanEventBroker(
+            history_size=Config.SCAN_STREAM_HISTORY,
+            client_buffer=Config.SCAN_STREAM_CLIENT_BUFFER,
+            max_clients=Config.SCAN_STREAM_MAX_CLIENTS
+        )
+        self._get_listener().subscribe(
+            SCAN_LOGS_CHANNEL,
+            self._publish_scan_events,
+            self._resync_scan_stream
+        )
+    
+    def _publish_scan_events(self, payload):
+        self.scan_stream.publish(parse_notification(payload))
+    
+    def _resync_scan_stream(self):
+        # Inserts announced while the listener was down are read back so
+        # live viewers do not silently miss them
+        last_event_id = self.scan_stream.last_event_id
+        if last_event_id is not None:
+            self.scan_stream.publish(self.get_scan_events_after(last_event_id, Config.SCAN_STREAM_HISTORY))
+    
+    def get_scan_events_after(self, after_id, limit):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(*queries.scan_events_after_query(after_id, limit))
+            return cursor.fetchall()
+            
+        except psycopg2.Error as e:
+            print(f"Error getting scan events: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def get_scan_stream_stats(self):
+        if not self.scan_stream:
+            return {'enabled': False}
+        
+        stats = self.scan_stream.stats()
+        stats['enabled'] = True
+        stats['listening'] = self.listener.connected if self.listener else False
+        return stats
+    
+    def init_scan_bitmap(self):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(queries.SELECT_SCANNED_TODAY)
+            result = cursor.fetchone()
+        except psycopg2.Error as e:
+            print(f"Error warming scan bitmap: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+        
+        try:
+            self.scanned_today = ScannedTodayBitmap(
+                Config.SCAN_BITMAP_PATH,
+                capacity=Config.SCAN_BITMAP_CAPACITY,
+                timezone=result['timezone']
+            )
+        except (OSError, KeyError) as e:
+            print(f"⚠ Shared scan bitmap unavailable, using database only: {e}")
+            return
+        
+        self.scanned_today.add_many(result['ordinals'], day=result['today'].toordinal())
+        print(f"✓ Scan bitmap warmed ({len(result['ordinals'])} employees scanned today, "
+              f"database TimeZone {result['timezone']})")
     
     def connect_with_retry(self, max_retries=5, delay=2):
         """Try to connect to database with retry logic"""
@@ -34,164 +459,477 @@ class DatabaseManager:
                     raise
     
     def get_connection(self):
+        """
+        Return a connection for a single unit of work. In pooled mode the
+        connection is borrowed from the pool and close() gives it back.
+        """
+        started = time.perf_counter()
         try:
-            conn = psycopg2.connect(
-                self.database_url,
-                cursor_factory=RealDictCursor,
-                connect_timeout=10
+            if self.pool:
+                return self.pool.getconn()
+            
+            try:
+                return psycopg2.connect(
+                    self.database_url,
+                    cursor_factory=ProfilingCursor,
+                    connect_timeout=10
+                )
+            except psycopg2.Error as e:
+                print(f"Error connecting to database: {e}")
+                raise
+        finally:
+            query_profiler.record_connect(time.perf_counter() - started)
+    
+    def get_pool_stats(self):
+        if not self.pool:
+            return {'enabled': False}
+        
+        stats = self.pool.stats()
+        stats['enabled'] = True
+        return stats
+    
+    def get_cache_stats(self):
+        if not self.employee_cache:
+            return {'enabled': False}
+        
+        stats = self.employee_cache.stats()
+        stats['enabled'] = True
+        stats['listening'] = self.listener.connected if self.listener else False
+        return stats
+    
+    def get_log_writer_stats(self):
+        if not self.log_writer:
+            return {'enabled': False}
+        
+        stats = self.log_writer.stats()
+        stats['enabled'] = True
+        return stats
+    
+    def get_scan_bitmap_stats(self):
+        if not self.scanned_today:
+            return {'enabled': False}
+        
+        stats = self.scanned_today.stats()
+        stats['enabled'] = True
+        return stats
+    
+    def get_scan_debounce_stats(self):
+        if not self.scan_debounce:
+            return {'enabled': False}
+        
+        stats = self.scan_debounce.stats()
+        stats['enabled'] = True
+        return stats
+    
+    def get_service_stats(self):
+        return {
+            'pool': self.get_pool_stats(),
+            'employee_cache': self.get_cache_stats(),
+            'scan_bitmap': self.get_scan_bitmap_stats(),
+            'scan_debounce': self.get_scan_debounce_stats(),
+            'log_writer': self.get_log_writer_stats(),
+            'scan_stream': self.get_scan_stream_stats()
+        }
+    
+    def check_readiness(self):
+        """One run of the readiness check (see health_probe.py)."""
+        started = time.perf_counter()
+        version, error = None, None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            try:
+                cursor.execute('SELECT version() as version')
+                version = cursor.fetchone()['version']
+            finally:
+                cursor.close()
+                conn.close()
+        except Exception as e:
+            error = e
+        
+        self.readiness.update(time.perf_counter() - started, error, self.get_service_stats(), version)
+    
+    def _run_readiness_checks(self):
+        while True:
+            try:
+                self.check_readiness()
+            except Exception as e:
+                print(f"⚠ Readiness check failed: {e}")
+            if self._maintenance_stop.wait(Config.HEALTH_PROBE_INTERVAL):
+                return
+    
+    def get_readiness(self):
+        if not self.readiness:
+            return {'ready': False, 'reasons': ['readiness check disabled'], 'checked_at': None, 'checks': {}}
+        return self.readiness.result()
+    
+    def _invalidate_employee(self, employee_id):
+        if self.employee_cache:
+            self.employee_cache.invalidate(employee_id)
+    
+    def _invalidate_all_employees(self):
+        if self.employee_cache:
+            self.employee_cache.invalidate_all()
+    
+    def close(self):
+        if self.readiness:
+            self.readiness.mark_stopping()
+        self._maintenance_stop.set()
+        if self.log_writer:
+            self.log_writer.close()
+        if self.scanned_today:
+            self.scanned_today.close()
+        if self.listener:
+            self.listener.stop()
+        if self.pool:
+            self.pool.closeall()
+    
+    def maintain_scan_log_partitions(self, months_ahead=None, retention_months=None):
+        """
+        Create monthly scan_logs partitions up to `months_ahead` months from
+        now and drop partitions entirely older than `retention_months`
+        (0 keeps everything). Only one instance runs it at a time.
+        """
+        if months_ahead is None:
+            months_ahead = Config.SCAN_LOGS_PARTITIONS_AHEAD
+        if retention_months is None:
+            retention_months = Config.SCAN_LOGS_RETENTION_MONTHS
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            result = maintain_partitions(
+                cursor, months_ahead, retention_months,
+                lock_timeout=Config.SCAN_LOGS_MAINTENANCE_LOCK_TIMEOUT
             )
-            return conn
+            conn.commit()
+            
+            if result['created'] or result['dropped']:
+                print(f"✓ scan_logs partitions created: {result['created']}, dropped: {result['dropped']}")
+            if result['deferred']:
+                print(f"⚠ scan_logs partitions deferred (lock timeout), retried next run: {result['deferred']}")
+            return result
+            
         except psycopg2.Error as e:
-            print(f"Error connecting to database: {e}")
+            conn.rollback()
+            print(f"Error maintaining scan_logs partitions: {e}")
             raise
+        finally:
+            cursor.close()
+            conn.close()
     
-    def init_database(self):
+    def _run_partition_maintenance(self):
+        while not self._maintenance_stop.wait(Config.SCAN_LOGS_MAINTENANCE_INTERVAL):
+            try:
+                self.maintain_scan_log_partitions()
+            except psycopg2.Error:
+                pass
+    
+    def _run_metrics_refresh(self):
+        while not self._maintenance_stop.wait(Config.METRICS_GAUGE_INTERVAL):
+            try:
+                metrics.refresh_gauges(self.get_service_stats())
+            except Exception as e:
+                print(f"⚠ Metrics gauge refresh failed: {e}")
+    
+    def load_timezone(self):
+        """
+        The database session's TimeZone as a ZoneInfo. scan_time values are
+        wall-clock times in it and CURRENT_DATE is "today" in it, so device
+        timestamps are converted to it. None, meaning the app's local zone,
+        if Python does not know the zone.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS scan_logs (
-                    id SERIAL PRIMARY KEY,
-                    employee_id VARCHAR(50) NOT NULL,
-                    scan_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    status VARCHAR(20) NOT NULL CHECK(status IN ('SUCCESS', 'DENIED', 'ERROR')),
-                    ip_address INET,
-                    user_agent TEXT,
-                    additional_info TEXT
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS employees (
-                    id SERIAL PRIMARY KEY,
-                    employee_id VARCHAR(50) UNIQUE NOT NULL,
-                    name VARCHAR(255) NOT NULL,
-                    department VARCHAR(100),
-                    position VARCHAR(100),
-                    is_active BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            cursor.execute(queries.SELECT_TIMEZONE)
+            name = cursor.fetchone()['timezone']
+        finally:
+            cursor.close()
+            conn.close()
+        
+        try:
+            return ZoneInfo(name)
+        except (KeyError, ValueError):
+            print(f"⚠ Database TimeZone '{name}' unknown to Python; using the app's local time zone")
+            return None
+    
+    def init_database(self):
+        """
+        Bring the schema up to date through the versioned migrations in
+        migrations/ (or only verify it when auto_migrate is off) and make
+        sure the current scan_logs partitions exist. When the schema is
+        current this costs a couple of cheap queries and takes no DDL locks.
+        """
+        if self.auto_migrate:
+            applied = migrate(self.database_url)
+            if applied:
+                print(f"Applied {len(applied)} schema migration(s)")
+        else:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            try:
+                pending = pending_migrations(cursor)
+            finally:
+                cursor.close()
+                conn.close()
             
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS system_settings (
-                    id SERIAL PRIMARY KEY,
-                    setting_key VARCHAR(100) UNIQUE NOT NULL,
-                    setting_value TEXT NOT NULL,
-                    description TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            if pending:
+                versions = ', '.join(f'{m.version:04d}' for m in pending)
+                raise MigrationError(
+                    f"Database schema is missing migration(s) {versions}. "
+                    f"Run 'python manage.py migrate' first."
                 )
-            ''')
-            
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_scan_logs_employee_id ON scan_logs(employee_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_scan_logs_scan_time ON scan_logs(scan_time)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_employee_id ON employees(employee_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_is_active ON employees(is_active)')
-            
-            cursor.execute('''
-                CREATE OR REPLACE FUNCTION update_updated_at_column()
-                RETURNS TRIGGER AS $$
-                BEGIN
-                    NEW.updated_at = CURRENT_TIMESTAMP;
-                    RETURN NEW;
-                END;
-                $$ language 'plpgsql'
-            ''')
+        
+        self.maintain_scan_log_partitions()
+        print("Database initialized successfully")
+    
+    def log_scan_attempt(self, employee_id, status, ip_address=None, user_agent=None, additional_info=None, durable=None):
+        """
+        Write a scan_logs row. Unless `durable` is set, DENIED/ERROR rows go
+        through the background log writer and this returns immediately;
+        SUCCESS rows stay synchronous unless LOG_WRITER_ASYNC_SUCCESS is on.
+        """
+        if durable is None:
+            durable = status == 'SUCCESS' and not Config.LOG_WRITER_ASYNC_SUCCESS
+        
+        if self.log_writer and not durable:
+            if self.log_writer.submit(employee_id, status, ip_address, user_agent, additional_info):
+                return
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(queries.INSERT_SCAN_LOG, (employee_id, status, ip_address, user_agent, additional_info))
             
-            cursor.execute('''
-                DROP TRIGGER IF EXISTS update_employees_updated_at ON employees
-            ''')
+            conn.commit()
+        except psycopg2.Error as e:
+            conn.rollback()
+            print(f"Error logging scan attempt: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def process_scan(self, employee_id, ip_address=None, user_agent=None, device_id=None):
+        """
+        Decide a gate scan, answering from in-process state when possible:
+        rapid repeats from the same device (`device_id`, else the IP) get
+        the previous answer from the debouncer without a log row, unknown
+        IDs come from the employee cache's negative entries and repeat
+        scans from the shared scanned-today bitmap. Everything else goes
+        through record_scan(), whose result is fed back into the bitmap.
+        
+        Returns the same shape as record_scan().
+        """
+        source = device_id or ip_address
+        if self.scan_debounce:
+            scan = self.scan_debounce.get(employee_id, source)
+            if scan is not None:
+                metrics.scan_debounced()
+                return scan
+        
+        scan = self._decide_scan(employee_id, ip_address, user_agent)
+        
+        if self.scan_debounce:
+            return self.scan_debounce.remember(employee_id, source, scan)
+        return scan
+    
+    def _decide_scan(self, employee_id, ip_address, user_agent):
+        if self.employee_cache:
+            employee = self.employee_cache.get(employee_id)
             
-            cursor.execute('''
-                CREATE TRIGGER update_employees_updated_at
-                    BEFORE UPDATE ON employees
-                    FOR EACH ROW
-                    EXECUTE FUNCTION update_updated_at_column()
-            ''')
+            if employee is None:
+                self.log_scan_attempt(employee_id, 'DENIED', ip_address, user_agent, 'Employee not found')
+                return {'outcome': 'NOT_FOUND'}
             
-            cursor.execute('SELECT COUNT(*) as count FROM employees')
-            result = cursor.fetchone()
-            count = result['count'] if result else 0
-            
-            if count == 0:
-                sample_employees = [
-                    ('EMP001', 'John Doe', 'IT', 'Software Developer'),
-                    ('EMP002', 'Jane Smith', 'HR', 'HR Manager'),
-                    ('EMP003', 'Bob Johnson', 'Finance', 'Accountant'),
-                    ('EMP004', 'Alice Brown', 'IT', 'System Administrator'),
-                    ('EMP005', 'Charlie Wilson', 'Marketing', 'Marketing Specialist')
-                ]
-                
-                cursor.executemany('''
-                    INSERT INTO employees (employee_id, name, department, position)
-                    VALUES (%s, %s, %s, %s)
-                ''', sample_employees)
-                
-                print("Sample employees data inserted")
+            if self.scanned_today and self.scanned_today.contains(employee['id']):
+                self.log_scan_attempt(employee_id, 'DENIED', ip_address, user_agent, 'Already scanned today')
+                return {
+                    'outcome': 'ALREADY_SCANNED',
+                    'ordinal': employee['id'],
+                    'name': employee['name'],
+                    'department': employee['department'],
+                    'position': employee['position']
+                }
+        
+        scan = self.record_scan(employee_id, ip_address, user_agent)
+        scan_date = scan.pop('scan_date')
+        
+        if self.scanned_today and scan['outcome'] != 'NOT_FOUND':
+            self.scanned_today.add(scan['ordinal'], scan_date.toordinal())
+        
+        return scan
+    
+    def record_scan(self, employee_id, ip_address=None, user_agent=None):
+        """
+        Resolve a gate scan in a single statement: look up the active
+        employee, claim today's attendance row and write the scan log.
+        
+        Returns a dict with 'outcome' (ALLOWED, ALREADY_SCANNED or NOT_FOUND),
+        the employee fields, and the id/scan_time of the written log row.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(queries.RECORD_SCAN, {
+                'employee_id': employee_id,
+                'ip_address': ip_address,
+                'user_agent': user_agent
+            })
             
+            result = dict(cursor.fetchone())
             conn.commit()
-            print("Database initialized successfully")
+            
+            return result
             
         except psycopg2.Error as e:
             conn.rollback()
-            print(f"Error initializing database: {e}")
+            print(f"Error recording scan: {e}")
             raise
         finally:
             cursor.close()
             conn.close()
     
-    def log_scan_attempt(self, employee_id, status, ip_address=None, user_agent=None, additional_info=None):
+    def record_scan_batch(self, scans, ip_address=None, user_agent=None):
+        """
+        Resolve many scans replayed by an offline device in one statement.
+        `scans` is a list of (employee_id, scan_time, device_id) in the order
+        the device recorded them; scan_time is the device's local timestamp
+        and decides which day the once-per-day rule applies to.
+        
+        Within the batch the earliest scan of an employee on a given day is
+        the one that can be ALLOWED (ties broken by position in the batch),
+        and only if daily_attendance has no row for that day yet. Returns one
+        dict per scan, in input order, shaped like record_scan() minus the
+        log id.
+        """
+        if not scans:
+            return []
+        
+        employee_ids, scan_times, device_ids = (list(column) for column in zip(*scans))
+        
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                INSERT INTO scan_logs (employee_id, status, ip_address, user_agent, additional_info)
-                VALUES (%s, %s, %s, %s, %s)
-            ''', (employee_id, status, ip_address, user_agent, additional_info))
+            cursor.execute(queries.RECORD_SCAN_BATCH, {
+                'employee_ids': employee_ids,
+                'scan_times': scan_times,
+                'device_ids': device_ids,
+                'ip_address': ip_address,
+                'user_agent': user_agent
+            })
             
+            results = [dict(row) for row in cursor.fetchall()]
             conn.commit()
+            
         except psycopg2.Error as e:
             conn.rollback()
-            print(f"Error logging scan attempt: {e}")
+            print(f"Error recording scan batch: {e}")
             raise
         finally:
             cursor.close()
             conn.close()
+        
+        today = results[0]['today'] if results else None
+        scanned_today = [
+            result['ordinal'] for result in results
+            if result['outcome'] != 'NOT_FOUND' and result['scan_date'] == today
+        ]
+        for result in results:
+            del result['scan_date'], result['today']
+        
+        if self.scanned_today and scanned_today:
+            self.scanned_today.add_many(scanned_today, day=today.toordinal())
+        
+        return results
     
     def get_scan_logs(self, limit=50, offset=0, employee_id=None, status=None):
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            query = '''
-                SELECT sl.*, e.name as employee_name, e.department 
-                FROM scan_logs sl
-                LEFT JOIN employees e ON sl.employee_id = e.employee_id
-                WHERE 1=1
-            '''
-            params = []
+            cursor.execute(*queries.scan_logs_query(limit, offset, employee_id, status))
+            return cursor.fetchall()
             
-            if employee_id:
-                query += ' AND sl.employee_id = %s'
-                params.append(employee_id)
-            
-            if status:
-                query += ' AND sl.status = %s'
-                params.append(status)
+        except psycopg2.Error as e:
+            print(f"Error getting scan logs: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def get_scan_logs_json(self, limit=50, offset=0, employee_id=None, status=None):
+        """get_scan_logs() encoded by PostgreSQL: (JSON array text, row count)."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(*queries.json_agg_query(*queries.scan_logs_query(limit, offset, employee_id, status)))
+            result = cursor.fetchone()
+            return result['rows'], result['count']
             
-            query += ' ORDER BY sl.scan_time DESC LIMIT %s OFFSET %s'
-            params.extend([limit, offset])
+        except psycopg2.Error as e:
+            print(f"Error getting scan logs: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def get_scan_logs_page(self, limit=50, cursor=None, employee_id=None, status=None):
+        """
+        Keyset-paginated scan logs, newest first, ordered by (scan_time, id).
+        
+        `cursor` is a token from a previous page's next_cursor/prev_cursor;
+        the same filters must be passed again. Returns a dict with 'logs',
+        'next_cursor' and 'prev_cursor' (None when there is no such page).
+        """
+        direction, after_time, after_id = decode_log_cursor(cursor) if cursor else ('next', None, None)
+        
+        conn = self.get_connection()
+        db_cursor = conn.cursor()
+        
+        try:
+            db_cursor.execute(*queries.scan_logs_page_query(
+                limit, direction, after_time, after_id, employee_id, status
+            ))
+            return build_log_page([dict(row) for row in db_cursor.fetchall()], limit, direction, cursor)
             
-            cursor.execute(query, params)
-            logs = [dict(row) for row in cursor.fetchall()]
+        except psycopg2.Error as e:
+            print(f"Error getting scan logs page: {e}")
+            raise
+        finally:
+            db_cursor.close()
+            conn.close()
+    
+    def iter_scan_logs(self, start_time=None, end_time=None, employee_id=None, status=None, chunk_size=5000):
+        """
+        Stream scan logs oldest first in lists of up to `chunk_size` rows
+        through a server-side cursor, so memory use does not grow with the
+        size of the result. start_time is inclusive, end_time exclusive.
+        
+        The connection is held until the generator is exhausted or closed.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor(name='scan_logs_export', cursor_factory=ProfilingCursor)
+        cursor.itersize = chunk_size
+        
+        try:
+            cursor.execute(*queries.scan_logs_export_query(start_time, end_time, employee_id, status))
             
-            return logs
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
             
         except psycopg2.Error as e:
-            print(f"Error getting scan logs: {e}")
+            print(f"Error exporting scan logs: {e}")
             raise
         finally:
             cursor.close()
@@ -202,11 +940,9 @@ class DatabaseManager:
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                INSERT INTO employees (employee_id, name, department, position)
-                VALUES (%s, %s, %s, %s)
-            ''', (employee_id, name, department, position))
+            cursor.execute(queries.INSERT_EMPLOYEE, (employee_id, name, department, position))
             conn.commit()
+            self._invalidate_employee(employee_id)
             return True
         except psycopg2.IntegrityError:
             conn.rollback()
@@ -219,30 +955,170 @@ class DatabaseManager:
             cursor.close()
             conn.close()
     
-    def check_scan_today(self, employee_id):
+    def import_employees(self, rows, mode='upsert'):
         """
-        Check if employee has already scanned today with SUCCESS status
-        Returns True if already scanned today, False otherwise
+        Load many employees in one transaction. `rows` yields
+        (row_number, dict) pairs (see employee_import.read_csv/read_json).
+        Valid rows are COPYed into a temporary staging table and merged
+        into employees with set-based statements; mode='insert' rejects IDs
+        that already exist instead of updating them. Per-row triggers are
+        told not to notify, so other instances get a single '*' NOTIFY for
+        the whole batch.
         """
+        if mode not in ('upsert', 'insert'):
+            raise ValueError("mode must be 'upsert' or 'insert'")
+        
         conn = self.get_connection()
         cursor = conn.cursor()
+        source = EmployeeCopySource(rows)
         
         try:
             cursor.execute('''
-                SELECT COUNT(*) as count
-                FROM scan_logs
-                WHERE employee_id = %s
-                AND status = 'SUCCESS'
-                AND DATE(scan_time) = CURRENT_DATE
-            ''', (employee_id,))
+                CREATE TEMP TABLE employee_import (
+                    line INTEGER NOT NULL,
+                    employee_id VARCHAR(50) NOT NULL,
+                    name VARCHAR(255) NOT NULL,
+                    department VARCHAR(100),
+                    position VARCHAR(100),
+                    is_active BOOLEAN
+                ) ON COMMIT DROP
+            ''')
             
-            result = cursor.fetchone()
-            count = result['count'] if result else 0
+            cursor.copy_expert('''
+                COPY employee_import (line, employee_id, name, department, position, is_active)
+                FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (department, position))
+            ''', source)
+            rejects = list(source.rejects)
+            existing = []
+            
+            cursor.execute("SET LOCAL app.suppress_employee_notify = 'on'")
+            
+            if mode == 'insert':
+                cursor.execute('''
+                    WITH inserted AS (
+                        INSERT INTO employees (employee_id, name, department, position, is_active)
+                        SELECT employee_id, name, department, position, COALESCE(is_active, TRUE)
+                        FROM employee_import
+                        ORDER BY line
+                        ON CONFLICT (employee_id) DO NOTHING
+                        RETURNING employee_id
+                    )
+                    SELECT s.line, s.employee_id
+                    FROM employee_import s
+                    WHERE NOT EXISTS (SELECT 1 FROM inserted i WHERE i.employee_id = s.employee_id)
+                ''')
+                existing = cursor.fetchall()
+                rejects.extend({
+                    'row': row['line'],
+                    'employee_id': row['employee_id'],
+                    'reason': 'employee_id already exists'
+                } for row in existing)
+                inserted, updated = source.accepted - len(existing), 0
+            else:
+                cursor.execute('''
+                    WITH updated AS (
+                        UPDATE employees e
+                        SET name = s.name,
+                            department = s.department,
+                            position = s.position,
+                            is_active = COALESCE(s.is_active, e.is_active)
+                        FROM employee_import s
+                        WHERE e.employee_id = s.employee_id
+                        AND (e.name, e.department, e.position, e.is_active)
+                            IS DISTINCT FROM (s.name, s.department, s.position, COALESCE(s.is_active, e.is_active))
+                        RETURNING e.employee_id
+                    ),
+                    inserted AS (
+                        INSERT INTO employees (employee_id, name, department, position, is_active)
+                        SELECT s.employee_id, s.name, s.department, s.position, COALESCE(s.is_active, TRUE)
+                        FROM employee_import s
+                        WHERE NOT EXISTS (SELECT 1 FROM employees e WHERE e.employee_id = s.employee_id)
+                        ORDER BY s.line
+                        ON CONFLICT (employee_id) DO NOTHING
+                        RETURNING employee_id
+                    )
+                    SELECT (SELECT COUNT(*) FROM inserted) as inserted,
+                           (SELECT COUNT(*) FROM updated) as updated
+                ''')
+                result = cursor.fetchone()
+                inserted, updated = result['inserted'], result['updated']
+            
+            if inserted or updated:
+                cursor.execute('SELECT pg_notify(%s, %s)', (EMPLOYEES_CHANNEL, '*'))
+            conn.commit()
+            if inserted or updated:
+                self._invalidate_all_employees()
+            
+            rejects.sort(key=lambda reject: reject['row'])
+            return {
+                'received': source.accepted + len(source.rejects),
+                'inserted': inserted,
+                'updated': updated,
+                'unchanged': source.accepted - inserted - updated - len(existing),
+                'rejected': len(rejects),
+                'rejects': rejects
+            }
+            
+        except psycopg2.Error as e:
+            conn.rollback()
+            if source.error is not None:
+                raise ValueError(f'invalid input: {source.error}') from e
+            print(f"Error importing employees: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def set_employees_status(self, employee_ids, is_active):
+        """
+        Activate or deactivate many employees in one statement. Returns the
+        IDs that changed, were already in that state, or do not exist.
+        """
+        employee_ids = list(dict.fromkeys(e.strip().upper() for e in employee_ids if e and e.strip()))
+        if not employee_ids:
+            return {'updated': [], 'unchanged': [], 'not_found': []}
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("SET LOCAL app.suppress_employee_notify = 'on'")
+            cursor.execute('''
+                WITH target AS (
+                    SELECT employee_id FROM unnest(%(ids)s::varchar[]) AS t(employee_id)
+                ),
+                updated AS (
+                    UPDATE employees e
+                    SET is_active = %(is_active)s
+                    FROM target t
+                    WHERE e.employee_id = t.employee_id
+                    AND e.is_active IS DISTINCT FROM %(is_active)s
+                    RETURNING e.employee_id
+                )
+                SELECT t.employee_id,
+                       EXISTS (SELECT 1 FROM updated u WHERE u.employee_id = t.employee_id) as changed,
+                       EXISTS (SELECT 1 FROM employees e WHERE e.employee_id = t.employee_id) as found
+                FROM target t
+            ''', {'ids': employee_ids, 'is_active': is_active})
+            rows = cursor.fetchall()
             
-            return count > 0
+            result = {
+                'updated': [r['employee_id'] for r in rows if r['changed']],
+                'unchanged': [r['employee_id'] for r in rows if r['found'] and not r['changed']],
+                'not_found': [r['employee_id'] for r in rows if not r['found']]
+            }
+            
+            if result['updated']:
+                cursor.execute('SELECT pg_notify(%s, %s)', (EMPLOYEES_CHANNEL, '*'))
+            conn.commit()
+            if result['updated']:
+                self._invalidate_all_employees()
+            
+            return result
             
         except psycopg2.Error as e:
-            print(f"Error checking today's scan: {e}")
+            conn.rollback()
+            print(f"Error updating employees status: {e}")
             raise
         finally:
             cursor.close()
@@ -253,15 +1129,50 @@ class DatabaseManager:
         cursor = conn.cursor()
         
         try:
-            query = 'SELECT * FROM employees'
-            if active_only:
-                query += ' WHERE is_active = TRUE'
-            query += ' ORDER BY name'
+            cursor.execute(*queries.employees_query(active_only))
+            return cursor.fetchall()
             
-            cursor.execute(query)
-            employees = [dict(row) for row in cursor.fetchall()]
+        except psycopg2.Error as e:
+            print(f"Error getting employees: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def search_employees(self, limit=50, cursor=None, q=None, match='prefix', department=None,
+                         position=None, is_active=True, fields=queries.EMPLOYEE_FIELDS):
+        """
+        Keyset-paginated employee search ordered by (name, employee_id); see
+        queries.employee_search_query() for the filters. `cursor` is a
+        previous page's next_cursor, passed with the same filters. Returns a
+        dict with 'employees' (only `fields`) and 'next_cursor'.
+        """
+        after_name, after_id = decode_employee_cursor(cursor) if cursor else (None, None)
+        
+        conn = self.get_connection()
+        db_cursor = conn.cursor()
+        
+        try:
+            db_cursor.execute(*queries.employee_search_query(
+                limit, after_name, after_id, q, match, department, position, is_active, fields
+            ))
+            return build_employee_page(db_cursor.fetchall(), limit, fields)
             
-            return employees
+        except psycopg2.Error as e:
+            print(f"Error searching employees: {e}")
+            raise
+        finally:
+            db_cursor.close()
+            conn.close()
+    
+    def get_active_employees_by_ids(self, employee_ids):
+        """employee_id and name of those of `employee_ids` that are active, for badge issuance."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(queries.SELECT_ACTIVE_EMPLOYEES_BY_IDS, (list(employee_ids),))
+            return cursor.fetchall()
             
         except psycopg2.Error as e:
             print(f"Error getting employees: {e}")
@@ -270,19 +1181,50 @@ class DatabaseManager:
             cursor.close()
             conn.close()
     
+    def get_employees_json(self, active_only=True):
+        """get_employees() encoded by PostgreSQL: (JSON array text, row count)."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(*queries.json_agg_query(*queries.employees_query(active_only)))
+            result = cursor.fetchone()
+            return result['rows'], result['count']
+            
+        except psycopg2.Error as e:
+            print(f"Error getting employees: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def get_employees_version(self, active_only=True):
+        """Change marker for get_employees(active_only), used as its ETag."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(*queries.employees_version_query(active_only))
+            result = cursor.fetchone()
+            return (result['count'], result['last_updated'], result['updated_sum'])
+            
+        except psycopg2.Error as e:
+            print(f"Error getting employees version: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
     def update_employee_status(self, employee_id, is_active):
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                UPDATE employees 
-                SET is_active = %s
-                WHERE employee_id = %s
-            ''', (is_active, employee_id))
+            cursor.execute(queries.UPDATE_EMPLOYEE_STATUS, (is_active, employee_id))
             
             affected_rows = cursor.rowcount
             conn.commit()
+            self._invalidate_employee(employee_id)
             
             return affected_rows > 0
             
@@ -295,14 +1237,16 @@ class DatabaseManager:
             conn.close()
     
     def get_employee_by_id(self, employee_id):
+        if self.employee_cache:
+            return self.employee_cache.get(employee_id)
+        return self._fetch_employee_by_id(employee_id)
+    
+    def _fetch_employee_by_id(self, employee_id):
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                SELECT * FROM employees 
-                WHERE employee_id = %s AND is_active = TRUE
-            ''', (employee_id,))
+            cursor.execute(queries.SELECT_ACTIVE_EMPLOYEE, (employee_id,))
             
             employee = cursor.fetchone()
             return dict(employee) if employee else None
@@ -314,6 +1258,21 @@ class DatabaseManager:
             cursor.close()
             conn.close()
     
+    def _fetch_active_employees(self):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(queries.SELECT_ACTIVE_EMPLOYEES)
+            return [dict(row) for row in cursor.fetchall()]
+            
+        except psycopg2.Error as e:
+            print(f"Error loading active employees: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
     def update_employee_info(self, employee_id, name=None, department=None, position=None):
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -347,6 +1306,7 @@ class DatabaseManager:
             cursor.execute(query, params)
             affected_rows = cursor.rowcount
             conn.commit()
+            self._invalidate_employee(employee_id)
             
             return affected_rows > 0
             
@@ -358,31 +1318,73 @@ class DatabaseManager:
             cursor.close()
             conn.close()
     
-    def get_scan_statistics(self, start_date=None, end_date=None):
+    def _rebuild_scan_statistics(self, cursor, start_date=None, end_date=None):
+        # Block concurrent inserts so the trigger cannot double count rows
+        # that the recount below also sees.
+        cursor.execute('LOCK TABLE scan_logs IN SHARE MODE')
+        
+        conditions = ''
+        params = []
+        
+        if start_date:
+            conditions += ' AND bucket_start >= %s::date'
+            params.append(start_date)
+        
+        if end_date:
+            conditions += " AND bucket_start < %s::date + INTERVAL '1 day'"
+            params.append(end_date)
+        
+        cursor.execute('DELETE FROM scan_stats_rollup WHERE 1=1' + conditions, params)
+        deleted = cursor.rowcount
+        
+        cursor.execute('''
+            INSERT INTO scan_stats_rollup (granularity, bucket_start, status, department, scan_count)
+            SELECT g.granularity, date_trunc(g.granularity, sl.scan_time) as bucket_start, sl.status,
+                   COALESCE(e.department, ''), COUNT(*)
+            FROM scan_logs sl
+            LEFT JOIN employees e ON e.employee_id = sl.employee_id
+            CROSS JOIN (VALUES ('hour'), ('day')) AS g(granularity)
+            WHERE 1=1
+        ''' + conditions.replace('bucket_start', 'sl.scan_time') + '''
+            GROUP BY 1, 2, 3, 4
+        ''', params)
+        
+        return {'buckets_deleted': deleted, 'buckets_written': cursor.rowcount}
+    
+    def rebuild_scan_statistics(self, start_date=None, end_date=None):
+        """
+        Recompute scan_stats_rollup from scan_logs for whole days between
+        start_date and end_date (inclusive; both optional). Inserts into
+        scan_logs wait until the rebuild commits.
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            query = '''
-                SELECT 
-                    status,
-                    COUNT(*) as count,
-                    DATE(scan_time) as scan_date
-                FROM scan_logs 
-                WHERE 1=1
-            '''
-            params = []
-            
-            if start_date:
-                query += ' AND scan_time >= %s'
-                params.append(start_date)
-            
-            if end_date:
-                query += ' AND scan_time <= %s'
-                params.append(end_date)
-            
-            query += ' GROUP BY status, DATE(scan_time) ORDER BY scan_date DESC'
+            result = self._rebuild_scan_statistics(cursor, start_date, end_date)
+            conn.commit()
+            return result
             
+        except psycopg2.Error as e:
+            conn.rollback()
+            print(f"Error rebuilding scan statistics: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def get_scan_statistics(self, start_date=None, end_date=None, granularity='day',
+                            department=None, by_department=False):
+        """
+        Scan counts per status and day (or hour) read from scan_stats_rollup,
+        so the cost depends on the number of buckets, not of scan_logs rows.
+        """
+        query, params = queries.scan_statistics_query(start_date, end_date, granularity, department, by_department)
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
             cursor.execute(query, params)
             stats = [dict(row) for row in cursor.fetchall()]
             
@@ -395,41 +1397,142 @@ class DatabaseManager:
             cursor.close()
             conn.close()
     
-    def get_employee_scan_summary(self, employee_id=None, days=30):
+    def get_scan_statistics_version(self, start_date=None, end_date=None, granularity='day',
+                                    department=None, by_department=False):
+        """
+        Change marker for get_scan_statistics() with the same arguments, used
+        as its ETag (by_department only regroups the same rollup rows).
+        """
+        query, params = queries.scan_statistics_version_query(start_date, end_date, granularity, department)
+        
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            query = '''
-                SELECT 
-                    e.employee_id,
-                    e.name,
-                    e.department,
-                    COUNT(sl.id) as total_scans,
-                    COUNT(CASE WHEN sl.status = 'SUCCESS' THEN 1 END) as successful_scans,
-                    COUNT(CASE WHEN sl.status = 'DENIED' THEN 1 END) as denied_scans,
-                    MAX(sl.scan_time) as last_scan
-                FROM employees e
-                LEFT JOIN scan_logs sl ON e.employee_id = sl.employee_id 
-                    AND sl.scan_time >= CURRENT_DATE - INTERVAL '%s days'
-                WHERE e.is_active = TRUE
-            '''
-            params = [days]
-            
-            if employee_id:
-                query += ' AND e.employee_id = %s'
-                params.append(employee_id)
-            
-            query += ' GROUP BY e.employee_id, e.name, e.department ORDER BY total_scans DESC'
+            cursor.execute(query, params)
+            result = cursor.fetchone()
+            return f"{result['scans']}-{result['buckets']}-{result['digest']}"
             
+        except psycopg2.Error as e:
+            print(f"Error getting scan statistics version: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def get_employee_scan_summary(self, department=None, employee_id=None, sort='total_scans',
+                                  descending=True, limit=50, offset=0):
+        """
+        One page of per-employee totals for the last 30 days, read from the
+        employee_scan_summary materialized view (see
+        refresh_employee_summary()). Returns the rows and the number of
+        employees matching the filters.
+        """
+        query, params = queries.employee_summary_query(department, employee_id, sort, descending, limit, offset)
+        count_query, count_params = queries.employee_summary_count_query(department, employee_id)
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
             cursor.execute(query, params)
-            summary = [dict(row) for row in cursor.fetchall()]
+            rows = [dict(row) for row in cursor.fetchall()]
             
-            return summary
+            cursor.execute(count_query, count_params)
+            return rows, cursor.fetchone()['total']
             
         except psycopg2.Error as e:
             print(f"Error getting employee scan summary: {e}")
             raise
         finally:
             cursor.close()
-            conn.close()
\ No newline at end of file
+            conn.close()
+    
+    def get_employee_summary_info(self):
+        """When employee_scan_summary was last refreshed and the first day it covers."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(queries.SELECT_EMPLOYEE_SUMMARY_INFO)
+            return dict(cursor.fetchone())
+            
+        except psycopg2.Error as e:
+            print(f"Error getting employee summary info: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def refresh_employee_summary(self, max_age=None):
+        """
+        REFRESH MATERIALIZED VIEW CONCURRENTLY employee_scan_summary; readers
+        keep seeing the previous contents until it commits. Skipped when
+        another session is already refreshing or, given `max_age` seconds,
+        when the view is younger than that (so several workers sharing a
+        schedule refresh it once).
+        """
+        result = {'refreshed': False, 'skipped': None, 'duration_ms': None, 'refreshed_at': None}
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("SELECT pg_try_advisory_xact_lock(hashtext('employee_scan_summary_refresh')) as locked")
+            if not cursor.fetchone()['locked']:
+                result['skipped'] = 'already refreshing'
+                conn.rollback()
+                return result
+            
+            if max_age:
+                cursor.execute(queries.SELECT_EMPLOYEE_SUMMARY_INFO)
+                info = cursor.fetchone()
+                if info['age_seconds'] is not None and info['age_seconds'] < max_age:
+                    result['skipped'] = 'recently refreshed'
+                    result['refreshed_at'] = info['refreshed_at']
+                    conn.rollback()
+                    return result
+            
+            started = time.perf_counter()
+            cursor.execute(queries.REFRESH_EMPLOYEE_SUMMARY)
+            cursor.execute(queries.MARK_EMPLOYEE_SUMMARY_REFRESHED)
+            result['refreshed_at'] = cursor.fetchone()['refreshed_at']
+            conn.commit()
+            
+            result['refreshed'] = True
+            result['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            return result
+            
+        except psycopg2.Error as e:
+            conn.rollback()
+            print(f"Error refreshing employee scan summary: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def _run_summary_refresh(self):
+        interval = Config.EMPLOYEE_SUMMARY_REFRESH_INTERVAL
+        while not self._maintenance_stop.wait(interval):
+            try:
+                self.refresh_employee_summary(max_age=interval / 2)
+            except psycopg2.Error:
+                pass
+
+
+# Methods reported in qr_db_call_duration_seconds / qr_db_call_errors_total,
+# and whose names label their queries in Server-Timing and the slow-query log
+TIMED_METHODS = (
+    'check_readiness', 'maintain_scan_log_partitions', 'log_scan_attempt',
+    'process_scan', 'record_scan', 'record_scan_batch', 'get_scan_logs',
+    'get_scan_logs_json', 'get_scan_logs_page', 'get_scan_events_after',
+    'add_employee', 'import_employees', 'set_employees_status',
+    'get_employees', 'search_employees', 'get_active_employees_by_ids', 'get_employees_json',
+    'get_employees_version', 'update_employee_status', 'get_employee_by_id',
+    'update_employee_info', 'rebuild_scan_statistics', 'get_scan_statistics',
+    'get_scan_statistics_version', 'get_employee_scan_summary',
+    'get_employee_summary_info', 'refresh_employee_summary',
+)
+
+metrics.instrument(DatabaseManager, TIMED_METHODS)
+query_profiler.instrument(DatabaseManager, TIMED_METHODS)
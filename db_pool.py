@@ -0,0 +1,318 @@
+import os
+import threading
+import time
+from collections import deque
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection could be checked out within the timeout"""
+
+
+class _PoolEntry:
+    __slots__ = ('conn', 'pid', 'created_at', 'last_used', 'uses')
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.pid = os.getpid()
+        self.created_at = now
+        self.last_used = now
+        self.uses = 0
+
+
+class PooledConnection:
+    """
+    Thin proxy around a psycopg2 connection borrowed from a ConnectionPool.
+    Calling close() hands the connection back to the pool instead of
+    closing the socket, so code written for plain connections works as-is.
+    """
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+
+    def __getattr__(self, name):
+        entry = self.__dict__.get('_entry')
+        if entry is None:
+            raise psycopg2.InterfaceError('connection already returned to pool')
+        return getattr(entry.conn, name)
+
+    def __enter__(self):
+        return self._entry.conn.__enter__()
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return self._entry.conn.__exit__(exc_type, exc_value, tb)
+
+    @property
+    def raw_connection(self):
+        return self._entry.conn
+
+    def close(self):
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool.putconn(entry)
+
+
+class ConnectionPool:
+    """
+    Thread-safe PostgreSQL connection pool.
+
+    - keeps at least `min_size` and at most `max_size` connections open
+    - blocks up to `timeout` seconds when every connection is checked out
+    - runs `SELECT 1` on borrow when a connection sat idle longer than
+      `health_check_interval` seconds (0 checks on every borrow)
+    - recycles connections after `max_uses` checkouts or `max_lifetime`
+      seconds (0 disables either limit)
+
+    Whenever fewer than `min_size` connections are open (after recycling,
+    a broken connection or a fork, where the child starts empty), the
+    thread returning a connection opens replacements before it goes on.
+    """
+
+    def __init__(self, dsn, min_size=2, max_size=10, timeout=5.0, max_uses=0,
+                 max_lifetime=0, health_check_interval=30.0, connect_timeout=10,
+                 cursor_factory=RealDictCursor):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError('invalid pool size: min=%s max=%s' % (min_size, max_size))
+
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_uses = max_uses
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.connect_timeout = connect_timeout
+        self.cursor_factory = cursor_factory
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = deque()
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._pid = os.getpid()
+        self._inherited = []
+
+        self._stats = {
+            'connections_created': 0,
+            'connections_closed': 0,
+            'checkouts': 0,
+            'checkout_timeouts': 0,
+            'checkout_wait_seconds': 0.0,
+            'health_check_failures': 0,
+            'recycled_max_uses': 0,
+            'recycled_max_lifetime': 0,
+            'discarded_broken': 0,
+        }
+
+        for _ in range(min_size):
+            entry = self._connect()
+            with self._cond:
+                self._size += 1
+                self._idle.append(entry)
+
+    def _connect(self):
+        conn = psycopg2.connect(
+            self.dsn,
+            cursor_factory=self.cursor_factory,
+            connect_timeout=self.connect_timeout
+        )
+        with self._cond:
+            self._stats['connections_created'] += 1
+        return _PoolEntry(conn)
+
+    def _close_entry(self, entry):
+        try:
+            entry.conn.close()
+        except psycopg2.Error:
+            pass
+        with self._cond:
+            self._stats['connections_closed'] += 1
+
+    def _expired(self, entry, now):
+        if self.max_uses and entry.uses >= self.max_uses:
+            return 'recycled_max_uses'
+        if self.max_lifetime and now - entry.created_at >= self.max_lifetime:
+            return 'recycled_max_lifetime'
+        return None
+
+    def _check_fork(self):
+        # Connections opened by the parent process must never be used (or
+        # closed, which would terminate the parent's session) from a child.
+        if self._pid != os.getpid():
+            with self._cond:
+                self._inherited.extend(self._idle)
+                self._idle.clear()
+                self._size = 0
+                self._waiting = 0
+                self._pid = os.getpid()
+
+    def _healthy(self, entry, now):
+        conn = entry.conn
+        if conn.closed:
+            return False
+        if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if now - entry.last_used < self.health_check_interval:
+            return True
+        try:
+            # A plain cursor: the check is not one of the app's queries
+            cursor = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            cursor.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        self._check_fork()
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        while True:
+            entry = None
+            with self._cond:
+                if self._closed:
+                    raise PoolError('connection pool is closed')
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['checkout_timeouts'] += 1
+                        raise PoolTimeoutError(
+                            'no database connection available after %.1fs (max_size=%s)'
+                            % (self.timeout, self.max_size)
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                if self._idle:
+                    # LIFO keeps the hottest connections busy and lets the
+                    # surplus age out through max_lifetime.
+                    entry = self._idle.pop()
+                else:
+                    self._size += 1
+
+            if entry is None:
+                try:
+                    entry = self._connect()
+                except psycopg2.Error:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            else:
+                now = time.monotonic()
+                reason = self._expired(entry, now)
+                if reason or not self._healthy(entry, now):
+                    with self._cond:
+                        self._stats[reason or 'health_check_failures'] += 1
+                        self._size -= 1
+                        self._cond.notify()
+                    self._close_entry(entry)
+                    continue
+
+            with self._cond:
+                self._stats['checkouts'] += 1
+                self._stats['checkout_wait_seconds'] += time.monotonic() - started
+            return PooledConnection(self, entry)
+
+    def putconn(self, entry):
+        self._check_fork()
+        if entry.pid != self._pid:
+            # Borrowed before a fork: it belongs to the parent's session
+            return
+
+        conn = entry.conn
+        entry.uses += 1
+        entry.last_used = time.monotonic()
+
+        reason = None
+        if conn.closed:
+            reason = 'discarded_broken'
+        else:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                reason = 'discarded_broken'
+        if reason is None:
+            reason = self._expired(entry, entry.last_used)
+
+        with self._cond:
+            if reason or self._closed:
+                if reason:
+                    self._stats[reason] += 1
+                self._size -= 1
+            else:
+                self._idle.append(entry)
+            self._cond.notify()
+
+        if reason or self._closed:
+            self._close_entry(entry)
+        self._refill()
+
+    def _refill(self):
+        """Open connections until `min_size` are open again."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+
+            try:
+                entry = self._connect()
+            except psycopg2.Error:
+                # The next checkout or return tries again
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                return
+
+            with self._cond:
+                closed = self._closed
+                if closed:
+                    self._size -= 1
+                else:
+                    self._idle.append(entry)
+                    self._cond.notify()
+            if closed:
+                self._close_entry(entry)
+                return
+
+    def closeall(self):
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_entry(entry)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            in_use = self._size - len(self._idle)
+            stats.update({
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': in_use,
+                'waiting': self._waiting,
+                'closed': self._closed,
+            })
+        checkouts = stats['checkouts']
+        stats['avg_checkout_wait_ms'] = round(
+            stats.pop('checkout_wait_seconds') * 1000 / checkouts, 3
+        ) if checkouts else 0.0
+        return stats
@@ -10,7 +10,10 @@ until PGPASSWORD=$DB_PASSWORD psql -h "$DB_HOST" -U "$DB_USER" -d "$DB_NAME" -c
 done
 
 echo "✓ PostgreSQL is ready!"
-echo "🏃 Starting Flask application..."
+echo "🗄️  Applying database migrations..."
+python manage.py migrate || exit 1
 
-# Start the Flask application
-python app.py
+echo "🏃 Starting Flask application (gunicorn)..."
+
+# exec so gunicorn receives SIGTERM from `docker stop` and drains workers
+exec gunicorn -c gunicorn.conf.py
@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class EmployeeCache:
+    """
+    In-process cache of active employees keyed by employee_id.
+
+    Unknown or inactive IDs are remembered in a bounded negative cache so
+    repeated junk badge IDs are answered without a query. Entries are only
+    dropped by explicit invalidation (local writes or NOTIFY from other
+    instances), never by age.
+    """
+
+    def __init__(self, load_one, load_all, negative_max_size=10000):
+        self._load_one = load_one
+        self._load_all = load_all
+        self.negative_max_size = negative_max_size
+
+        self._lock = threading.Lock()
+        self._employees = {}
+        self._negative = OrderedDict()
+        # Bumped on every invalidation so a lookup that raced with one does
+        # not store a row it read before the change.
+        self._generation = 0
+        self._warmed_at = None
+
+        self._stats = {
+            'hits': 0,
+            'negative_hits': 0,
+            'misses': 0,
+            'invalidations': 0,
+            'full_invalidations': 0,
+            'warms': 0,
+        }
+
+    def get(self, employee_id):
+        found, employee, generation = self.lookup(employee_id)
+        if found:
+            return employee
+
+        employee = self._load_one(employee_id)
+        self.fill(employee_id, employee, generation)
+        return dict(employee) if employee else None
+
+    def lookup(self, employee_id):
+        """
+        Cache-only lookup returning (found, employee, generation). On a miss
+        the caller loads the row itself and hands it to fill() together with
+        the generation, which is how the asyncio manager uses the cache
+        without the blocking loaders.
+        """
+        with self._lock:
+            employee = self._employees.get(employee_id)
+            if employee is not None:
+                self._stats['hits'] += 1
+                return True, dict(employee), self._generation
+            if employee_id in self._negative:
+                self._negative.move_to_end(employee_id)
+                self._stats['negative_hits'] += 1
+                return True, None, self._generation
+            self._stats['misses'] += 1
+            return False, None, self._generation
+
+    def fill(self, employee_id, employee, generation):
+        with self._lock:
+            if generation == self._generation:
+                self._store(employee_id, employee)
+
+    def _store(self, employee_id, employee):
+        if employee:
+            self._employees[employee_id] = dict(employee)
+            self._negative.pop(employee_id, None)
+        else:
+            self._negative[employee_id] = True
+            self._negative.move_to_end(employee_id)
+            while len(self._negative) > self.negative_max_size:
+                self._negative.popitem(last=False)
+
+    def warm(self):
+        generation = self.generation
+        return self.replace_all(self._load_all(), generation)
+
+    @property
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def replace_all(self, employees, generation):
+        """Install a full snapshot loaded while `generation` was current."""
+        with self._lock:
+            if generation != self._generation:
+                # Something changed mid-load; keep what we have and let
+                # lookups fill in lazily rather than store a stale snapshot.
+                return False
+            self._employees = {e['employee_id']: dict(e) for e in employees}
+            self._negative.clear()
+            self._warmed_at = time.time()
+            self._stats['warms'] += 1
+        return True
+
+    def invalidate(self, employee_id):
+        with self._lock:
+            self._generation += 1
+            self._employees.pop(employee_id, None)
+            self._negative.pop(employee_id, None)
+            self._stats['invalidations'] += 1
+
+    def invalidate_all(self):
+        with self._lock:
+            self._generation += 1
+            self._employees.clear()
+            self._negative.clear()
+            self._warmed_at = None
+            self._stats['full_invalidations'] += 1
+
+    def handle_notification(self, payload):
+        if payload and payload != '*':
+            self.invalidate(payload)
+        else:
+            self.invalidate_all()
+            self.warm()
+
+    def resync(self):
+        self.invalidate_all()
+        self.warm()
+
+    @property
+    def is_warm(self):
+        return self._warmed_at is not None
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'size': len(self._employees),
+                'negative_size': len(self._negative),
+                'negative_max_size': self.negative_max_size,
+                'warmed_at': self._warmed_at,
+            })
+        lookups = stats['hits'] + stats['negative_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['hits'] + stats['negative_hits']) / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,146 @@
+"""
+Parsing and validation for bulk employee imports.
+
+Rows arrive as CSV (header row with employee_id,name,department,position
+and optionally is_active) or as a list of JSON objects with the same keys.
+Valid rows are fed to COPY through EmployeeCopySource without building
+the whole payload in memory; invalid rows are collected as rejects with
+their position in the input so the caller can report them.
+"""
+import csv
+import io
+import re
+
+EMPLOYEE_ID_PATTERN = re.compile(r'^[A-Z0-9][A-Z0-9_.-]*$')
+
+FIELDS = ('employee_id', 'name', 'department', 'position', 'is_active')
+
+_MAX_LENGTHS = {'employee_id': 50, 'name': 255, 'department': 100, 'position': 100}
+_TRUE = {'true', 't', '1', 'yes', 'y'}
+_FALSE = {'false', 'f', '0', 'no', 'n'}
+
+
+def _parse_bool(value):
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text == '':
+        return None
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f'is_active must be true or false, got {value!r}')
+
+
+def normalize_employee(row):
+    """
+    Clean up one input row the same way POST /api/employees does and return
+    a tuple in FIELDS order. Raises ValueError describing the first problem.
+    """
+    if not isinstance(row, dict):
+        raise ValueError('row must be an object')
+
+    employee_id = str(row.get('employee_id') or '').strip().upper()
+    name = str(row.get('name') or '').strip()
+    department = str(row.get('department') or '').strip()
+    position = str(row.get('position') or '').strip()
+
+    if not employee_id:
+        raise ValueError('employee_id is required')
+    if not EMPLOYEE_ID_PATTERN.match(employee_id):
+        raise ValueError(f'invalid employee_id {employee_id!r}')
+    if not name:
+        raise ValueError('name is required')
+
+    values = {'employee_id': employee_id, 'name': name, 'department': department, 'position': position}
+    for field, max_length in _MAX_LENGTHS.items():
+        if len(values[field]) > max_length:
+            raise ValueError(f'{field} longer than {max_length} characters')
+
+    return employee_id, name, department, position, _parse_bool(row.get('is_active'))
+
+
+def read_csv(stream):
+    """
+    Return an iterator of (line_number, dict) over a binary or text CSV
+    stream. The header is checked up front so a bad file fails before COPY.
+    """
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(stream)
+    fieldnames = [f.strip().lower() for f in reader.fieldnames or []]
+    if 'employee_id' not in fieldnames or 'name' not in fieldnames:
+        raise ValueError('CSV header must include employee_id and name columns')
+    reader.fieldnames = fieldnames
+    return ((reader.line_num, row) for row in reader)
+
+
+def read_json(rows):
+    """Return an iterator of (row_number, dict) over a decoded JSON array."""
+    if not isinstance(rows, list):
+        raise ValueError('JSON body must be an array of employees')
+    return enumerate(rows, start=1)
+
+
+class EmployeeCopySource(io.RawIOBase):
+    """
+    Read-only file object for cursor.copy_expert(). Validates rows lazily
+    as COPY pulls data, writing accepted rows as CSV and appending problems
+    to `rejects`. Later occurrences of an employee_id already seen in the
+    same batch are rejected as duplicates.
+    """
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = b''
+        self._seen = set()
+        self.accepted = 0
+        self.rejects = []
+        # Set when reading the input fails mid-COPY (e.g. malformed CSV);
+        # psycopg2 reports that as a generic COPY error.
+        self.error = None
+
+    def readable(self):
+        return True
+
+    def _next_chunk(self, target=65536):
+        out = io.StringIO()
+        writer = csv.writer(out)
+        for row_number, row in self._rows:
+            try:
+                values = normalize_employee(row)
+            except ValueError as e:
+                self.rejects.append({
+                    'row': row_number,
+                    'employee_id': row.get('employee_id') if isinstance(row, dict) else None,
+                    'reason': str(e),
+                })
+                continue
+
+            if values[0] in self._seen:
+                self.rejects.append({
+                    'row': row_number,
+                    'employee_id': values[0],
+                    'reason': 'duplicate employee_id in this batch',
+                })
+                continue
+
+            self._seen.add(values[0])
+            self.accepted += 1
+            writer.writerow((row_number,) + values[:4] + ('' if values[4] is None else values[4],))
+            if out.tell() >= target:
+                break
+        return out.getvalue().encode('utf-8')
+
+    def readinto(self, buffer):
+        if not self._buffer:
+            try:
+                self._buffer = self._next_chunk()
+            except (ValueError, csv.Error) as e:
+                self.error = e
+                raise
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
@@ -0,0 +1,112 @@
+"""
+gunicorn settings for the production image (see docker-start.sh):
+
+    gunicorn -c gunicorn.conf.py
+
+Threaded workers, sized from the CPUs available to the container unless
+GUNICORN_WORKERS / WEB_CONCURRENCY is set. Every worker owns a connection
+pool of up to DB_POOL_MAX_SIZE connections, so threads beyond that only
+queue for a connection.
+
+With GUNICORN_PRELOAD the app is imported once in the master and workers
+are forked from it; database resources are still opened per worker after
+the fork (wsgi.init_worker). Prometheus metrics from all workers are
+aggregated through PROMETHEUS_MULTIPROC_DIR. On SIGTERM gunicorn stops accepting
+connections, lets in-flight requests finish for up to
+GUNICORN_GRACEFUL_TIMEOUT seconds, and each worker then flushes its scan
+log writer and closes its pool (wsgi.shutdown_worker).
+"""
+import os
+import shutil
+
+from config import Config
+
+
+def _cpu_count():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+wsgi_app = 'wsgi:application'
+
+# Workers write metrics to files here so GET /metrics can sum them. It has
+# to exist before prometheus_client is imported, which with preload_app
+# happens before any server hook runs. Counters restart with the server, so
+# leftovers from the last run are removed (once: this file is re-read on HUP).
+if Config.METRICS_ENABLED:
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = Config.METRICS_MULTIPROC_DIR
+        shutil.rmtree(Config.METRICS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 5000)}"
+
+worker_class = 'gthread'
+workers = Config.GUNICORN_WORKERS or _cpu_count()
+threads = Config.GUNICORN_THREADS
+
+# Every open /api/logs/stream holds a worker thread until the viewer
+# leaves. Keep two threads per worker for scans and health checks: streams
+# are capped at GUNICORN_THREADS - 2, or turned off when that leaves none
+# (SCAN_STREAM_MAX_CLIENTS=0 would otherwise mean no limit).
+_stream_clients = Config.SCAN_STREAM_MAX_CLIENTS
+_stream_disabled = False
+if Config.SCAN_STREAM_ENABLED and not 0 < _stream_clients <= threads - 2:
+    if threads > 2:
+        Config.SCAN_STREAM_MAX_CLIENTS = threads - 2
+    else:
+        Config.SCAN_STREAM_ENABLED = False
+        _stream_disabled = True
+
+timeout = Config.GUNICORN_TIMEOUT
+graceful_timeout = Config.GUNICORN_GRACEFUL_TIMEOUT
+keepalive = Config.GUNICORN_KEEPALIVE
+
+# Recycle workers after this many requests (0 = never); jitter keeps them
+# from restarting together
+max_requests = Config.GUNICORN_MAX_REQUESTS
+max_requests_jitter = max_requests // 10
+
+preload_app = Config.GUNICORN_PRELOAD
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL') or 'info'
+
+
+def when_ready(server):
+    server.log.info(
+        'Serving with %s workers x %s threads (DB pool max %s per worker)',
+        workers, threads, Config.DB_POOL_MAX_SIZE
+    )
+    if threads > Config.DB_POOL_MAX_SIZE:
+        server.log.warning(
+            'GUNICORN_THREADS (%s) exceeds DB_POOL_MAX_SIZE (%s); extra threads wait for a connection',
+            threads, Config.DB_POOL_MAX_SIZE
+        )
+    if _stream_disabled:
+        server.log.warning(
+            'Live log stream disabled: GUNICORN_THREADS (%s) leaves no thread for it', threads
+        )
+    elif Config.SCAN_STREAM_ENABLED and Config.SCAN_STREAM_MAX_CLIENTS != _stream_clients:
+        server.log.warning(
+            'SCAN_STREAM_MAX_CLIENTS lowered from %s to %s so streams cannot take every one of the %s worker threads',
+            _stream_clients, Config.SCAN_STREAM_MAX_CLIENTS, threads
+        )
+
+
+def child_exit(server, worker):
+    import metrics
+    metrics.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    import wsgi
+    wsgi.init_worker()
+
+
+def worker_exit(server, worker):
+    import wsgi
+    wsgi.shutdown_worker()
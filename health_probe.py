@@ -0,0 +1,120 @@
+import threading
+import time
+from datetime import datetime
+
+
+class ReadinessProbe:
+    """
+    Latest readiness verdict for one app process.
+
+    The database manager runs a cheap query through its pool every
+    `interval` seconds and passes the outcome, together with its
+    get_service_stats(), to update(); GET /api/health/ready only reads the
+    cached verdict, so probing costs no database work.
+
+    The process is not ready while the database is unreachable or slower
+    than `max_db_latency_ms`, more than `max_pool_waiting` requests wait for
+    a pooled connection, the scan log writer's queue is `max_log_queue_ratio`
+    full (or its thread died), or the employee cache is cold. A failing
+    check must be seen on `failure_threshold` consecutive runs before the
+    verdict flips to not ready, and one clean run flips it back. A verdict
+    older than three intervals counts as not ready: the check itself is
+    stuck.
+    """
+
+    def __init__(self, interval=5.0, failure_threshold=2, max_db_latency_ms=1000,
+                 max_pool_waiting=10, max_log_queue_ratio=0.8):
+        self.interval = interval
+        self.failure_threshold = failure_threshold
+        self.max_db_latency_ms = max_db_latency_ms
+        self.max_pool_waiting = max_pool_waiting
+        self.max_log_queue_ratio = max_log_queue_ratio
+
+        self._lock = threading.Lock()
+        self._ready = False
+        self._reasons = ['starting']
+        self._checks = {}
+        self._checked_at = None
+        self._checked_monotonic = None
+        self._failures = 0
+        self._stopping = False
+
+    def update(self, latency, error, services, database_version=None):
+        """
+        Record one run of the check: `latency` in seconds of the probe query,
+        `error` if it failed, `services` from get_service_stats().
+        """
+        checks = {}
+        reasons = []
+
+        latency_ms = round(latency * 1000, 2)
+        if error is not None:
+            checks['database'] = {'status': 'error', 'error': str(error).strip(), 'latency_ms': latency_ms}
+            reasons.append(f'database check failed ({type(error).__name__})')
+        else:
+            checks['database'] = {'status': 'connected', 'version': database_version, 'latency_ms': latency_ms}
+            if latency_ms > self.max_db_latency_ms:
+                reasons.append(f'database slow ({latency_ms} ms)')
+
+        pool = services.get('pool') or {}
+        if pool.get('enabled'):
+            # db_pool.ConnectionPool and psycopg_pool name these differently
+            waiting = pool.get('waiting', pool.get('requests_waiting', 0))
+            checks['pool'] = {'waiting': waiting, 'max_waiting': self.max_pool_waiting}
+            if self.max_pool_waiting and waiting > self.max_pool_waiting:
+                reasons.append(f'{waiting} requests waiting for a database connection')
+
+        log_writer = services.get('log_writer') or {}
+        if log_writer.get('enabled'):
+            ratio = log_writer['queue_depth'] / log_writer['max_queue_size'] if log_writer['max_queue_size'] else 0
+            checks['log_writer'] = {
+                'queue_depth': log_writer['queue_depth'],
+                'max_queue_size': log_writer['max_queue_size'],
+                'running': log_writer['running'],
+            }
+            if not log_writer['running']:
+                reasons.append('scan log writer stopped')
+            elif ratio >= self.max_log_queue_ratio:
+                reasons.append(f"scan log queue {ratio:.0%} full")
+
+        employee_cache = services.get('employee_cache') or {}
+        if employee_cache.get('enabled'):
+            warm = employee_cache['warmed_at'] is not None
+            checks['employee_cache'] = {'warm': warm, 'size': employee_cache['size']}
+            if not warm:
+                reasons.append('employee cache cold')
+
+        with self._lock:
+            self._failures = self._failures + 1 if reasons else 0
+            if not reasons:
+                self._ready = True
+            elif self._failures >= self.failure_threshold:
+                self._ready = False
+            self._reasons = reasons
+            self._checks = checks
+            self._checked_at = datetime.now()
+            self._checked_monotonic = time.monotonic()
+
+    def mark_stopping(self):
+        """Report not ready from now on, so traffic drains away during shutdown."""
+        with self._lock:
+            self._stopping = True
+
+    def result(self):
+        with self._lock:
+            ready = self._ready
+            reasons = list(self._reasons)
+            if self._stopping:
+                ready = False
+                reasons.insert(0, 'shutting down')
+            elif (self._checked_monotonic is not None and
+                  time.monotonic() - self._checked_monotonic > 3 * self.interval):
+                ready = False
+                reasons.insert(0, 'readiness check is not running')
+
+            return {
+                'ready': ready,
+                'reasons': reasons,
+                'checked_at': self._checked_at.isoformat() if self._checked_at else None,
+                'checks': dict(self._checks),
+            }
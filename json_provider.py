@@ -0,0 +1,123 @@
+"""
+JSON encoding for API responses, shared by the Flask and Quart apps.
+
+Rows come straight from the database drivers, so besides plain JSON types
+the encoder handles datetime/date/time (ISO 8601, the same text
+.isoformat() gives), Decimal and UUID (as strings) and ipaddress values
+(as strings, for drivers that return inet columns as objects). orjson is
+used when installed and does the datetime work natively in C; otherwise
+the stdlib json module is used with the same rules. Encoding time is
+reported to query_profiler as the request's "serialize" timing.
+
+FastJSONProviderMixin goes in front of a framework's DefaultJSONProvider:
+
+    class JSONProvider(FastJSONProviderMixin, DefaultJSONProvider):
+        pass
+
+    app.json_provider_class = JSONProvider
+"""
+import ipaddress
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from time import perf_counter
+
+import query_profiler
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_IP_TYPES = (
+    ipaddress.IPv4Address, ipaddress.IPv6Address,
+    ipaddress.IPv4Interface, ipaddress.IPv6Interface,
+    ipaddress.IPv4Network, ipaddress.IPv6Network,
+)
+
+
+def json_default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID) + _IP_TYPES):
+        return str(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(value, sort_keys=False, indent=False):
+    """Serialize `value` to a str using the rules above."""
+    started = perf_counter()
+    try:
+        return _dumps(value, sort_keys, indent)
+    finally:
+        query_profiler.record_serialize(perf_counter() - started)
+
+
+def _dumps(value, sort_keys, indent):
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(value, default=json_default, option=option).decode('utf-8')
+
+    return json.dumps(
+        value,
+        default=json_default,
+        ensure_ascii=False,
+        sort_keys=sort_keys,
+        indent=2 if indent else None,
+        separators=None if indent else (',', ':')
+    )
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def splice_json(payload, field, encoded):
+    """
+    Serialize the dict `payload` with `field` set to `encoded`, a value
+    that is already JSON text (e.g. built by PostgreSQL's json_agg), without
+    decoding and re-encoding it.
+    """
+    head = dumps({key: value for key, value in payload.items() if key != field})
+    separator = ',' if head != '{}' else ''
+    return f'{head[:-1]}{separator}"{field}":{encoded}}}'
+
+
+class FastJSONProviderMixin:
+    """
+    Overrides dumps/loads/response of Flask's or Quart's DefaultJSONProvider
+    (both share that interface). Keys keep the order the response builders
+    put them in instead of being sorted; compact follows the framework's
+    rule. Calls with extra json.dumps keyword arguments go to the stdlib
+    implementation.
+    """
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            kwargs.setdefault('default', json_default)
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        return self._app.response_class(
+            f'{dumps(obj, sort_keys=self.sort_keys, indent=indent)}\n', mimetype=self.mimetype
+        )
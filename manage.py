@@ -0,0 +1,229 @@
+"""
+Maintenance commands for the QR scanner backend.
+
+    python manage.py migrate [--target VERSION] [--status]
+    python manage.py rebuild-stats [--start-date YYYY-MM-DD] [--end-date YYYY-MM-DD]
+    python manage.py partitions [--months-ahead N] [--retention-months N]
+    python manage.py refresh-summary
+    python manage.py import-employees FILE [--mode upsert|insert]
+    python manage.py employee-status activate|deactivate [EMPLOYEE_ID ...] [--file FILE]
+    python manage.py settings [NAME [VALUE | --reset]]
+    python manage.py issue-badges [EMPLOYEE_ID ...] [--file FILE] [--all] [--ttl-days N] [--output FILE]
+    python manage.py badge-key [--key-id ID]
+"""
+import argparse
+import csv
+import json
+import sys
+
+import badge_tokens
+from api_common import issue_badges as sign_badges
+from config import Config
+from database import DatabaseManager
+from employee_import import read_csv, read_json
+from query_profiler import ProfilerSettings
+from schema_migrations import migrate, migration_status
+
+
+def run_migrations(db_manager, args):
+    if args.status:
+        for migration in migration_status(Config.DATABASE_URL):
+            state = 'applied' if migration['applied'] else 'pending'
+            if migration['modified']:
+                state += ' (file changed since it was applied)'
+            print(f"{migration['version']:04d}_{migration['name']}: {state}")
+        return
+    
+    applied = migrate(Config.DATABASE_URL, target=args.target)
+    if applied:
+        print(f"✓ Applied {len(applied)} migration(s)")
+    else:
+        print("✓ Database schema is up to date")
+
+
+def rebuild_stats(db_manager, args):
+    result = db_manager.rebuild_scan_statistics(args.start_date, args.end_date)
+    print(f"✓ Scan statistics rebuilt: {result['buckets_deleted']} buckets removed, "
+          f"{result['buckets_written']} buckets written")
+
+
+def partitions(db_manager, args):
+    result = db_manager.maintain_scan_log_partitions(args.months_ahead, args.retention_months)
+    if result['skipped']:
+        print("⚠ Partition maintenance is already running elsewhere, skipped")
+        return
+    print(f"✓ scan_logs partitions created: {result['created'] or 'none'}, "
+          f"dropped: {result['dropped'] or 'none'}")
+    if result['deferred']:
+        print(f"⚠ Deferred after lock timeout, run again later: {', '.join(result['deferred'])}")
+
+
+def refresh_summary(db_manager, args):
+    result = db_manager.refresh_employee_summary()
+    if not result['refreshed']:
+        print(f"⚠ Employee scan summary not refreshed: {result['skipped']}")
+        return
+    print(f"✓ Employee scan summary refreshed in {result['duration_ms']} ms")
+
+
+def import_employees(db_manager, args):
+    if args.file.lower().endswith('.json'):
+        with open(args.file, encoding='utf-8') as f:
+            result = db_manager.import_employees(read_json(json.load(f)), args.mode)
+    else:
+        with open(args.file, 'rb') as f:
+            result = db_manager.import_employees(read_csv(f), args.mode)
+    
+    for reject in result['rejects']:
+        print(f"  row {reject['row']} ({reject['employee_id']}): {reject['reason']}")
+    print(f"✓ Imported {result['received']} rows: {result['inserted']} inserted, "
+          f"{result['updated']} updated, {result['unchanged']} unchanged, {result['rejected']} rejected")
+
+
+def employee_status(db_manager, args):
+    employee_ids = list(args.employee_ids)
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            employee_ids.extend(line.strip() for line in f)
+    
+    result = db_manager.set_employees_status(employee_ids, args.action == 'activate')
+    for employee_id in result['not_found']:
+        print(f"  {employee_id}: not found")
+    print(f"✓ {len(result['updated'])} employee(s) {args.action}d, "
+          f"{len(result['unchanged'])} unchanged, {len(result['not_found'])} not found")
+
+
+def system_settings(db_manager, args):
+    if args.name:
+        if args.reset:
+            db_manager.set_system_setting(args.name, None)
+            print(f"✓ {args.name} reset to its default")
+        elif args.value is not None:
+            try:
+                db_manager.set_system_setting(args.name, args.value)
+            except ValueError as e:
+                sys.exit(f"✗ {e}")
+            print(f"✓ {args.name} set to {args.value}")
+    
+    overrides = {row['setting_key']: row for row in db_manager.get_system_settings()}
+    for name, default in ProfilerSettings.defaults().items():
+        if args.name and name != args.name:
+            continue
+        if name in overrides:
+            row = overrides[name]
+            print(f"{name} = {row['setting_value']} (set {row['updated_at']:%Y-%m-%d %H:%M:%S}, default {default})")
+        else:
+            print(f"{name} = {default} (default)")
+
+
+def issue_badges(db_manager, args):
+    if args.all:
+        employees = db_manager.get_employees(active_only=True)
+    else:
+        employee_ids = list(args.employee_ids)
+        if args.file:
+            with open(args.file, encoding='utf-8') as f:
+                employee_ids.extend(line.strip() for line in f)
+        employee_ids = list(dict.fromkeys(e.strip().upper() for e in employee_ids if e.strip()))
+        if not employee_ids:
+            sys.exit("✗ Give employee IDs, --file or --all")
+        employees = db_manager.get_active_employees_by_ids(employee_ids)
+        found = {employee['employee_id'] for employee in employees}
+        for employee_id in employee_ids:
+            if employee_id not in found:
+                print(f"  {employee_id}: not found or inactive", file=sys.stderr)
+    
+    try:
+        badges, rejected = sign_badges(employees, args.ttl_days)
+    except ValueError as e:
+        sys.exit(f"✗ {e}")
+    for reject in rejected:
+        print(f"  {reject['employee_id']}: {reject['error']}", file=sys.stderr)
+    
+    output = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        writer = csv.writer(output)
+        writer.writerow(('employee_id', 'name', 'token', 'expires_at'))
+        for badge in badges:
+            writer.writerow((badge['employee_id'], badge['name'], badge['token'], badge['expires_at'].isoformat()))
+    finally:
+        if args.output:
+            output.close()
+    
+    print(f"✓ {len(badges)} badge(s) signed with key '{badge_tokens.signer.active_key_id}'", file=sys.stderr)
+
+
+def badge_key(db_manager, args):
+    print(badge_tokens.new_key(args.key_id))
+    print("  Put it first in BADGE_SIGNING_KEYS; keep the old keys after it until every badge is reissued",
+          file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='QR Scanner Backend maintenance commands')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    migrate_parser = subparsers.add_parser('migrate', help='Apply pending schema migrations')
+    migrate_parser.add_argument('--target', type=int, help='Stop after this migration version')
+    migrate_parser.add_argument('--status', action='store_true', help='List migrations and whether they are applied')
+    migrate_parser.set_defaults(handler=run_migrations, needs_db=False)
+    
+    stats_parser = subparsers.add_parser('rebuild-stats', help='Rebuild the scan statistics rollup from scan_logs')
+    stats_parser.add_argument('--start-date', help='First day to rebuild (inclusive)')
+    stats_parser.add_argument('--end-date', help='Last day to rebuild (inclusive)')
+    stats_parser.set_defaults(handler=rebuild_stats)
+    
+    partitions_parser = subparsers.add_parser('partitions', help='Create upcoming scan_logs partitions and apply retention')
+    partitions_parser.add_argument('--months-ahead', type=int, help='Future months to pre-create')
+    partitions_parser.add_argument('--retention-months', type=int, help='Past months to keep (0 keeps everything)')
+    partitions_parser.set_defaults(handler=partitions)
+    
+    summary_parser = subparsers.add_parser('refresh-summary', help='Refresh the employee scan summary behind /api/employees/summary')
+    summary_parser.set_defaults(handler=refresh_summary)
+    
+    import_parser = subparsers.add_parser('import-employees', help='Bulk insert or update employees from CSV or JSON')
+    import_parser.add_argument('file', help='CSV with an employee_id,name,... header, or a .json array')
+    import_parser.add_argument('--mode', choices=('upsert', 'insert'), default='upsert',
+                               help='insert rejects IDs that already exist instead of updating them')
+    import_parser.set_defaults(handler=import_employees)
+    
+    status_parser = subparsers.add_parser('employee-status', help='Activate or deactivate many employees at once')
+    status_parser.add_argument('action', choices=('activate', 'deactivate'))
+    status_parser.add_argument('employee_ids', nargs='*', help='Employee IDs')
+    status_parser.add_argument('--file', help='File with one employee ID per line')
+    status_parser.set_defaults(handler=employee_status)
+    
+    settings_parser = subparsers.add_parser('settings', help='Show or change settings of the running app processes')
+    settings_parser.add_argument('name', nargs='?', choices=tuple(ProfilerSettings.PARSERS), help='Setting to show or change')
+    settings_parser.add_argument('value', nargs='?', help='New value, applied by every process within seconds')
+    settings_parser.add_argument('--reset', action='store_true', help='Go back to the value from the environment/config.py')
+    settings_parser.set_defaults(handler=system_settings)
+    
+    badges_parser = subparsers.add_parser('issue-badges', help='Print signed QR badge tokens as CSV')
+    badges_parser.add_argument('employee_ids', nargs='*', help='Employee IDs')
+    badges_parser.add_argument('--file', help='File with one employee ID per line')
+    badges_parser.add_argument('--all', action='store_true', help='Every active employee')
+    badges_parser.add_argument('--ttl-days', type=float, help='Validity in days (default BADGE_TOKEN_TTL_DAYS)')
+    badges_parser.add_argument('--output', help='Write the CSV here instead of stdout')
+    badges_parser.set_defaults(handler=issue_badges)
+    
+    key_parser = subparsers.add_parser('badge-key', help='Generate a new BADGE_SIGNING_KEYS entry for key rotation')
+    key_parser.add_argument('--key-id', help="Key id (default: today's date)")
+    key_parser.set_defaults(handler=badge_key, needs_db=False)
+    
+    args = parser.parse_args(argv)
+    
+    if not getattr(args, 'needs_db', True):
+        args.handler(None, args)
+        return 0
+    
+    db_manager = DatabaseManager(use_pool=False, runtime_services=False)
+    try:
+        args.handler(db_manager, args)
+    finally:
+        db_manager.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Prometheus instrumentation shared by app.py and async_app.py.
+
+Request counts and latency per route (and per scan outcome for
+POST /api/scan), latency and errors per DatabaseManager method, and
+gauges for the connection pool, log writer queue and live streams, and a
+count of debounced repeat scans.
+
+Under gunicorn every worker records into PROMETHEUS_MULTIPROC_DIR (set up
+by gunicorn.conf.py) and GET /metrics on any worker aggregates all of
+them. Without that variable the default in-process registry is used.
+prometheus_client is optional: without it `enabled` is False and every
+function here is a no-op.
+"""
+import asyncio
+import functools
+import os
+import time
+
+from config import Config
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+enabled = prometheus_client is not None and Config.METRICS_ENABLED
+
+CONTENT_TYPE = prometheus_client.CONTENT_TYPE_LATEST if prometheus_client else 'text/plain'
+
+SCAN_ROUTE = '/api/scan'
+
+# Response status of POST /api/scan -> outcome label
+_SCAN_OUTCOMES = {200: 'ALLOWED', 403: 'DENIED', 400: 'INVALID'}
+
+# Scans are single-digit milliseconds when healthy; the upper buckets
+# cover exports, imports and pool waits
+_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+if enabled:
+    HTTP_REQUESTS = prometheus_client.Counter(
+        'qr_http_requests_total', 'HTTP requests by route, method, status and scan outcome',
+        ['route', 'method', 'status', 'outcome']
+    )
+    HTTP_LATENCY = prometheus_client.Histogram(
+        'qr_http_request_duration_seconds', 'Time to produce the response (streams: until the first byte)',
+        ['route', 'method', 'outcome'], buckets=_LATENCY_BUCKETS
+    )
+    HTTP_IN_PROGRESS = prometheus_client.Gauge(
+        'qr_http_requests_in_progress', 'Requests being handled', multiprocess_mode='livesum'
+    )
+    DB_LATENCY = prometheus_client.Histogram(
+        'qr_db_call_duration_seconds', 'DatabaseManager method latency', ['method'], buckets=_LATENCY_BUCKETS
+    )
+    DB_ERRORS = prometheus_client.Counter(
+        'qr_db_call_errors_total', 'DatabaseManager calls that raised', ['method', 'error']
+    )
+    POOL_CONNECTIONS = prometheus_client.Gauge(
+        'qr_db_pool_connections', 'Pooled connections by state', ['state'], multiprocess_mode='livesum'
+    )
+    POOL_WAITING = prometheus_client.Gauge(
+        'qr_db_pool_waiting', 'Requests waiting for a pooled connection', multiprocess_mode='livesum'
+    )
+    LOG_WRITER_QUEUE = prometheus_client.Gauge(
+        'qr_log_writer_queue_depth', 'Scan log rows waiting for the batched writer', multiprocess_mode='livesum'
+    )
+    SCANS_DEBOUNCED = prometheus_client.Counter(
+        'qr_scans_debounced_total', 'Repeat scans answered by the debouncer without touching the database'
+    )
+    STREAM_CLIENTS = prometheus_client.Gauge(
+        'qr_scan_stream_clients', 'Open /api/logs/stream connections', multiprocess_mode='livesum'
+    )
+
+
+def request_started():
+    if not enabled:
+        return None
+    HTTP_IN_PROGRESS.inc()
+    return time.perf_counter()
+
+
+def request_finished(started, route, method, status):
+    if started is None:
+        return
+    HTTP_IN_PROGRESS.dec()
+    outcome = ''
+    if route == SCAN_ROUTE and method == 'POST':
+        outcome = _SCAN_OUTCOMES.get(status, 'ERROR')
+    HTTP_LATENCY.labels(route, method, outcome).observe(time.perf_counter() - started)
+    HTTP_REQUESTS.labels(route, method, str(status), outcome).inc()
+
+
+def scan_debounced():
+    if enabled:
+        SCANS_DEBOUNCED.inc()
+
+
+def _timed(name, func):
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                DB_ERRORS.labels(name, type(e).__name__).inc()
+                raise
+            finally:
+                DB_LATENCY.labels(name).observe(time.perf_counter() - started)
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                DB_ERRORS.labels(name, type(e).__name__).inc()
+                raise
+            finally:
+                DB_LATENCY.labels(name).observe(time.perf_counter() - started)
+    return wrapper
+
+
+def instrument(cls, method_names):
+    """Wrap the named methods of a database manager class with latency/error metrics."""
+    if not enabled:
+        return cls
+    for name in method_names:
+        func = getattr(cls, name, None)
+        if func is not None:
+            setattr(cls, name, _timed(name, func))
+    return cls
+
+
+def refresh_gauges(services):
+    """Set the gauges from a manager's get_service_stats()."""
+    if not enabled:
+        return
+    pool = services.get('pool') or {}
+    if pool.get('enabled'):
+        # db_pool.ConnectionPool and psycopg_pool name these differently
+        idle = pool.get('idle', pool.get('pool_available', 0))
+        size = pool.get('size', pool.get('pool_size', 0))
+        POOL_CONNECTIONS.labels('idle').set(idle)
+        POOL_CONNECTIONS.labels('in_use').set(size - idle)
+        POOL_WAITING.set(pool.get('waiting', pool.get('requests_waiting', 0)))
+    log_writer = services.get('log_writer') or {}
+    if log_writer.get('enabled'):
+        LOG_WRITER_QUEUE.set(log_writer['queue_depth'])
+    scan_stream = services.get('scan_stream') or {}
+    if scan_stream.get('enabled'):
+        STREAM_CLIENTS.set(scan_stream['clients'])
+
+
+def render():
+    """Exposition text for GET /metrics, aggregated across workers when multiprocess."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry)
+
+
+def mark_process_dead(pid):
+    """gunicorn child_exit hook: drop a dead worker's live gauges."""
+    if enabled and 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid)
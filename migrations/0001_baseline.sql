@@ -0,0 +1,51 @@
+-- Baseline schema: employees and system settings as originally created by
+-- DatabaseManager.init_database(). Written to be a no-op on databases that
+-- were initialised before versioned migrations existed.
+
+CREATE TABLE IF NOT EXISTS employees (
+    id SERIAL PRIMARY KEY,
+    employee_id VARCHAR(50) UNIQUE NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    department VARCHAR(100),
+    position VARCHAR(100),
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS system_settings (
+    id SERIAL PRIMARY KEY,
+    setting_key VARCHAR(100) UNIQUE NOT NULL,
+    setting_value TEXT NOT NULL,
+    description TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_employees_employee_id ON employees(employee_id);
+CREATE INDEX IF NOT EXISTS idx_employees_is_active ON employees(is_active);
+
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_employees_updated_at ON employees;
+
+CREATE TRIGGER update_employees_updated_at
+    BEFORE UPDATE ON employees
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Sample employees for a brand-new database
+INSERT INTO employees (employee_id, name, department, position)
+SELECT * FROM (VALUES
+    ('EMP001', 'John Doe', 'IT', 'Software Developer'),
+    ('EMP002', 'Jane Smith', 'HR', 'HR Manager'),
+    ('EMP003', 'Bob Johnson', 'Finance', 'Accountant'),
+    ('EMP004', 'Alice Brown', 'IT', 'System Administrator'),
+    ('EMP005', 'Charlie Wilson', 'Marketing', 'Marketing Specialist')
+) AS sample(employee_id, name, department, position)
+WHERE NOT EXISTS (SELECT 1 FROM employees);
@@ -0,0 +1,9 @@
+"""
+Create scan_logs as a monthly range-partitioned table, converting an
+existing unpartitioned scan_logs (rows, id sequence) in place.
+"""
+from scan_log_partitions import create_partitioned_scan_logs
+
+
+def upgrade(cursor):
+    create_partitioned_scan_logs(cursor)
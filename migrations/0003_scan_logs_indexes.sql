@@ -0,0 +1,8 @@
+-- (scan_time, id) composites serve keyset pagination of /api/logs with and
+-- without filters; they supersede the single-column employee_id and
+-- scan_time indexes.
+CREATE INDEX IF NOT EXISTS idx_scan_logs_scan_time_id ON scan_logs(scan_time, id);
+CREATE INDEX IF NOT EXISTS idx_scan_logs_employee_time_id ON scan_logs(employee_id, scan_time, id);
+CREATE INDEX IF NOT EXISTS idx_scan_logs_status_time_id ON scan_logs(status, scan_time, id);
+DROP INDEX IF EXISTS idx_scan_logs_employee_id;
+DROP INDEX IF EXISTS idx_scan_logs_scan_time;
@@ -0,0 +1,16 @@
+-- One row per employee per day that was granted access; the primary key is
+-- what makes concurrent scans of the same badge race-free.
+CREATE TABLE IF NOT EXISTS daily_attendance (
+    employee_id VARCHAR(50) NOT NULL,
+    scan_date DATE NOT NULL,
+    first_scan_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (employee_id, scan_date)
+);
+
+INSERT INTO daily_attendance (employee_id, scan_date, first_scan_time)
+SELECT employee_id, CURRENT_DATE, MIN(scan_time)
+FROM scan_logs
+WHERE status = 'SUCCESS'
+AND scan_time >= CURRENT_DATE
+GROUP BY employee_id
+ON CONFLICT (employee_id, scan_date) DO NOTHING;
@@ -0,0 +1,22 @@
+-- Tell every app instance which employee row changed so their in-process
+-- caches can drop exactly that entry.
+CREATE OR REPLACE FUNCTION notify_employee_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM pg_notify('employees_changed', OLD.employee_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND
+       (TG_OP = 'INSERT' OR NEW.employee_id IS DISTINCT FROM OLD.employee_id) THEN
+        PERFORM pg_notify('employees_changed', NEW.employee_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS notify_employees_changed ON employees;
+
+CREATE TRIGGER notify_employees_changed
+    AFTER INSERT OR UPDATE OR DELETE ON employees
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_employee_change();
@@ -0,0 +1,51 @@
+-- Per-status scan counts in hourly and daily buckets, kept up to date by a
+-- statement-level trigger on scan_logs so /api/statistics never has to
+-- aggregate the raw log.
+CREATE TABLE IF NOT EXISTS scan_stats_rollup (
+    granularity VARCHAR(10) NOT NULL CHECK(granularity IN ('hour', 'day')),
+    bucket_start TIMESTAMP NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    department VARCHAR(100) NOT NULL DEFAULT '',
+    scan_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (granularity, bucket_start, status, department)
+);
+
+CREATE OR REPLACE FUNCTION rollup_scan_stats()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO scan_stats_rollup (granularity, bucket_start, status, department, scan_count)
+    SELECT g.granularity, date_trunc(g.granularity, n.scan_time), n.status,
+           COALESCE(e.department, ''), COUNT(*)
+    FROM new_rows n
+    LEFT JOIN employees e ON e.employee_id = n.employee_id
+    CROSS JOIN (VALUES ('hour'), ('day')) AS g(granularity)
+    GROUP BY 1, 2, 3, 4
+    -- Fixed order keeps row locks consistent between concurrent batches
+    ORDER BY 1, 2, 3, 4
+    ON CONFLICT (granularity, bucket_start, status, department)
+    DO UPDATE SET scan_count = scan_stats_rollup.scan_count + EXCLUDED.scan_count;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS rollup_scan_logs_stats ON scan_logs;
+
+CREATE TRIGGER rollup_scan_logs_stats
+    AFTER INSERT ON scan_logs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION rollup_scan_stats();
+
+-- Backfill from existing history; inserts wait until this commits so
+-- nothing is counted twice.
+LOCK TABLE scan_logs IN SHARE MODE;
+
+DELETE FROM scan_stats_rollup;
+
+INSERT INTO scan_stats_rollup (granularity, bucket_start, status, department, scan_count)
+SELECT g.granularity, date_trunc(g.granularity, sl.scan_time), sl.status,
+       COALESCE(e.department, ''), COUNT(*)
+FROM scan_logs sl
+LEFT JOIN employees e ON e.employee_id = sl.employee_id
+CROSS JOIN (VALUES ('hour'), ('day')) AS g(granularity)
+GROUP BY 1, 2, 3, 4;
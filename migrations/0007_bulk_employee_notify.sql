@@ -0,0 +1,18 @@
+-- Bulk imports set app.suppress_employee_notify for their transaction and
+-- send a single '*' notification instead of one per row.
+CREATE OR REPLACE FUNCTION notify_employee_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF current_setting('app.suppress_employee_notify', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM pg_notify('employees_changed', OLD.employee_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND
+       (TG_OP = 'INSERT' OR NEW.employee_id IS DISTINCT FROM OLD.employee_id) THEN
+        PERFORM pg_notify('employees_changed', NEW.employee_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
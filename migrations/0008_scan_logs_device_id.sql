@@ -0,0 +1,3 @@
+-- Gate device that recorded the scan, reported by offline devices when
+-- they replay queued scans through /api/scan/batch.
+ALTER TABLE scan_logs ADD COLUMN IF NOT EXISTS device_id VARCHAR(100);
@@ -0,0 +1,50 @@
+-- Announce new scan_logs rows for the live stream (GET /api/logs/stream).
+-- One notification carries a JSON array of rows, packed up to ~7000 bytes
+-- to stay under the 8000-byte payload limit, so a batch insert sends a
+-- handful of notifications rather than one per row. Only the columns the
+-- stream shows are included, and additional_info is cut to 200 characters.
+CREATE OR REPLACE FUNCTION notify_scan_logs_inserted()
+RETURNS TRIGGER AS $$
+DECLARE
+    item TEXT;
+    batch TEXT := '';
+BEGIN
+    FOR item IN
+        SELECT json_build_object(
+            'id', n.id,
+            'employee_id', n.employee_id,
+            'employee_name', e.name,
+            'department', e.department,
+            'status', n.status,
+            'scan_time', n.scan_time,
+            'additional_info', left(n.additional_info, 200),
+            'device_id', n.device_id
+        )::text
+        FROM new_rows n
+        LEFT JOIN employees e ON e.employee_id = n.employee_id
+        ORDER BY n.id
+    LOOP
+        -- Column limits keep a single row far below this; never fail the insert
+        CONTINUE WHEN octet_length(item) > 7000;
+
+        IF batch <> '' AND octet_length(batch) + octet_length(item) > 7000 THEN
+            PERFORM pg_notify('scan_logs_inserted', '[' || batch || ']');
+            batch := '';
+        END IF;
+        batch := CASE WHEN batch = '' THEN item ELSE batch || ',' || item END;
+    END LOOP;
+
+    IF batch <> '' THEN
+        PERFORM pg_notify('scan_logs_inserted', '[' || batch || ']');
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS notify_scan_logs_inserted ON scan_logs;
+
+CREATE TRIGGER notify_scan_logs_inserted
+    AFTER INSERT ON scan_logs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_scan_logs_inserted();
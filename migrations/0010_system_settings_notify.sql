@@ -0,0 +1,25 @@
+-- system_settings holds settings an operator can change while the app is
+-- running (see query_profiler.py and `python manage.py settings`). A row
+-- overrides the default from config.py; deleting it restores the default.
+-- Every app process re-reads the table when told it changed.
+CREATE OR REPLACE FUNCTION notify_system_settings_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('system_settings_changed', '');
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_system_settings_updated_at ON system_settings;
+
+CREATE TRIGGER update_system_settings_updated_at
+    BEFORE UPDATE ON system_settings
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS notify_system_settings_changed ON system_settings;
+
+CREATE TRIGGER notify_system_settings_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON system_settings
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION notify_system_settings_changed();
@@ -0,0 +1,46 @@
+-- Per-employee attendance totals over the last 30 days for
+-- GET /api/employees/summary. Aggregating scan_logs per request scanned a
+-- month of partitions for every call; the view is refreshed CONCURRENTLY
+-- (readers are never blocked) on a schedule or through
+-- POST /api/employees/summary/refresh. The unique index is what allows
+-- a concurrent refresh.
+CREATE MATERIALIZED VIEW IF NOT EXISTS employee_scan_summary AS
+SELECT
+    e.employee_id,
+    e.name,
+    e.department,
+    e.position,
+    COALESCE(s.total_scans, 0) as total_scans,
+    COALESCE(s.successful_scans, 0) as successful_scans,
+    COALESCE(s.denied_scans, 0) as denied_scans,
+    COALESCE(a.days_present, 0) as days_present,
+    a.last_present,
+    s.last_scan,
+    CURRENT_DATE - 30 as period_start,
+    now() as refreshed_at
+FROM employees e
+LEFT JOIN (
+    SELECT
+        employee_id,
+        COUNT(*) as total_scans,
+        COUNT(*) FILTER (WHERE status = 'SUCCESS') as successful_scans,
+        COUNT(*) FILTER (WHERE status = 'DENIED') as denied_scans,
+        MAX(scan_time) as last_scan
+    FROM scan_logs
+    WHERE scan_time >= CURRENT_DATE - 30
+    GROUP BY employee_id
+) s ON s.employee_id = e.employee_id
+LEFT JOIN (
+    SELECT
+        employee_id,
+        COUNT(*) as days_present,
+        MAX(scan_date) as last_present
+    FROM daily_attendance
+    WHERE scan_date >= CURRENT_DATE - 30
+    GROUP BY employee_id
+) a ON a.employee_id = e.employee_id
+WHERE e.is_active = TRUE
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_employee_scan_summary_employee_id ON employee_scan_summary(employee_id);
+CREATE INDEX IF NOT EXISTS idx_employee_scan_summary_department ON employee_scan_summary(department, employee_id);
@@ -0,0 +1,28 @@
+-- Indexes behind the search mode of GET /api/employees (see
+-- queries.employee_search_query()):
+--   (name, employee_id)              keyset order of every page
+--   (department, name, employee_id)  department filter in page order
+--   employee_id / lower(name) with pattern ops for q=... prefix matches
+--   trigram GIN on employee_id / name for match=substring
+CREATE INDEX IF NOT EXISTS idx_employees_name_employee_id ON employees(name, employee_id);
+CREATE INDEX IF NOT EXISTS idx_employees_department_name ON employees(department, name, employee_id);
+CREATE INDEX IF NOT EXISTS idx_employees_employee_id_pattern ON employees(employee_id varchar_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_employees_lower_name_pattern ON employees(lower(name) text_pattern_ops);
+
+-- pg_trgm ships with PostgreSQL's contrib package, which not every server
+-- has installed; without it substring search still works, by scanning
+-- employees. Re-running `manage.py migrate` does not retry, so create the
+-- two indexes by hand after installing the extension.
+DO $$
+BEGIN
+    BEGIN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    EXCEPTION WHEN OTHERS THEN
+        RAISE NOTICE 'pg_trgm unavailable (%), employee substring search will not be indexed', SQLERRM;
+    END;
+
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+        EXECUTE 'CREATE INDEX IF NOT EXISTS idx_employees_employee_id_trgm ON employees USING gin (employee_id gin_trgm_ops)';
+        EXECUTE 'CREATE INDEX IF NOT EXISTS idx_employees_name_trgm ON employees USING gin (name gin_trgm_ops)';
+    END IF;
+END $$;
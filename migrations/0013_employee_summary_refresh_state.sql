@@ -0,0 +1,56 @@
+-- Refresh metadata for employee_scan_summary moves out of the view.
+-- 0011 stored now() and CURRENT_DATE - 30 in every row, so each
+-- REFRESH ... CONCURRENTLY saw every row as changed and rewrote the whole
+-- view and its indexes, and reading the ETag meant MAX(refreshed_at) over
+-- the view. DatabaseManager.refresh_employee_summary() updates the single
+-- row below in the same transaction as the refresh.
+DROP MATERIALIZED VIEW IF EXISTS employee_scan_summary;
+
+CREATE MATERIALIZED VIEW employee_scan_summary AS
+SELECT
+    e.employee_id,
+    e.name,
+    e.department,
+    e.position,
+    COALESCE(s.total_scans, 0) as total_scans,
+    COALESCE(s.successful_scans, 0) as successful_scans,
+    COALESCE(s.denied_scans, 0) as denied_scans,
+    COALESCE(a.days_present, 0) as days_present,
+    a.last_present,
+    s.last_scan
+FROM employees e
+LEFT JOIN (
+    SELECT
+        employee_id,
+        COUNT(*) as total_scans,
+        COUNT(*) FILTER (WHERE status = 'SUCCESS') as successful_scans,
+        COUNT(*) FILTER (WHERE status = 'DENIED') as denied_scans,
+        MAX(scan_time) as last_scan
+    FROM scan_logs
+    WHERE scan_time >= CURRENT_DATE - 30
+    GROUP BY employee_id
+) s ON s.employee_id = e.employee_id
+LEFT JOIN (
+    SELECT
+        employee_id,
+        COUNT(*) as days_present,
+        MAX(scan_date) as last_present
+    FROM daily_attendance
+    WHERE scan_date >= CURRENT_DATE - 30
+    GROUP BY employee_id
+) a ON a.employee_id = e.employee_id
+WHERE e.is_active = TRUE
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_employee_scan_summary_employee_id ON employee_scan_summary(employee_id);
+CREATE INDEX IF NOT EXISTS idx_employee_scan_summary_department ON employee_scan_summary(department, employee_id);
+
+CREATE TABLE IF NOT EXISTS employee_scan_summary_refresh (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    refreshed_at TIMESTAMPTZ NOT NULL,
+    period_start DATE NOT NULL
+);
+
+INSERT INTO employee_scan_summary_refresh (refreshed_at, period_start)
+VALUES (now(), CURRENT_DATE - 30)
+ON CONFLICT (id) DO UPDATE SET refreshed_at = EXCLUDED.refreshed_at, period_start = EXCLUDED.period_start;
@@ -0,0 +1,117 @@
+import select
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2 import sql
+
+
+class PgListener:
+    """
+    Background thread that LISTENs on PostgreSQL notification channels over
+    a dedicated connection and dispatches payloads to subscribed callbacks.
+
+    Notifications sent while the listener is disconnected are lost, so each
+    subscriber may pass an `on_reconnect` callback to resynchronise its
+    state after the connection is re-established. The first connect only
+    runs it for channels passed to request_resync(): a subscriber that
+    loaded its state before LISTEN was in place (e.g. because connecting
+    timed out) must catch up on what changed in between.
+    """
+
+    def __init__(self, database_url, poll_timeout=5.0, reconnect_delay=2.0):
+        self.database_url = database_url
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self.ready = threading.Event()
+        self._subscriptions = {}
+        self._resync_requested = set()
+        self._resync_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, channel, on_notify, on_reconnect=None):
+        if self._thread is not None:
+            raise RuntimeError('subscribe() must be called before start()')
+        self._subscriptions.setdefault(channel, []).append((on_notify, on_reconnect))
+
+    def request_resync(self, channel):
+        """Run `channel`'s on_reconnect on the next connect, even the first."""
+        with self._resync_lock:
+            self._resync_requested.add(channel)
+
+    @property
+    def connected(self):
+        return self.ready.is_set()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='pg-listener', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout if timeout is not None else self.poll_timeout + 1)
+            self._thread = None
+
+    def _dispatch(self, notify):
+        for on_notify, _ in self._subscriptions.get(notify.channel, []):
+            try:
+                on_notify(notify.payload)
+            except Exception as e:
+                print(f"⚠ Notification handler for '{notify.channel}' failed: {e}")
+
+    def _resync(self, channels=None):
+        for channel, handlers in self._subscriptions.items():
+            if channels is not None and channel not in channels:
+                continue
+            for _, on_reconnect in handlers:
+                if on_reconnect is None:
+                    continue
+                try:
+                    on_reconnect()
+                except Exception as e:
+                    print(f"⚠ Resync handler for '{channel}' failed: {e}")
+
+    def _run(self):
+        first_connect = True
+
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.database_url, connect_timeout=10)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cursor = conn.cursor()
+                for channel in self._subscriptions:
+                    cursor.execute(sql.SQL('LISTEN {}').format(sql.Identifier(channel)))
+                cursor.close()
+
+                with self._resync_lock:
+                    requested = self._resync_requested
+                    self._resync_requested = set()
+                if not first_connect:
+                    self._resync()
+                elif requested:
+                    self._resync(requested)
+                first_connect = False
+                self.ready.set()
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0))
+
+            except (psycopg2.Error, OSError) as e:
+                print(f"⚠ Notification listener disconnected: {e}")
+                self.ready.clear()
+                self._stop.wait(self.reconnect_delay)
+            finally:
+                self.ready.clear()
+                if conn is not None and not conn.closed:
+                    conn.close()
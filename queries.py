@@ -0,0 +1,517 @@
+"""
+SQL shared by DatabaseManager (psycopg2) and AsyncDatabaseManager
+(psycopg 3). Both drivers use the same %s / %(name)s placeholders, so the
+statements and the query builders below are used verbatim by each side.
+Builders return (query, params).
+"""
+
+SELECT_ACTIVE_EMPLOYEE = '''
+    SELECT * FROM employees
+    WHERE employee_id = %s AND is_active = TRUE
+'''
+
+SELECT_ACTIVE_EMPLOYEES = 'SELECT * FROM employees WHERE is_active = TRUE'
+
+SELECT_ACTIVE_EMPLOYEES_BY_IDS = '''
+    SELECT employee_id, name FROM employees
+    WHERE employee_id = ANY(%s::varchar[]) AND is_active = TRUE
+    ORDER BY employee_id
+'''
+
+INSERT_EMPLOYEE = '''
+    INSERT INTO employees (employee_id, name, department, position)
+    VALUES (%s, %s, %s, %s)
+'''
+
+UPDATE_EMPLOYEE_STATUS = '''
+    UPDATE employees
+    SET is_active = %s
+    WHERE employee_id = %s
+'''
+
+SELECT_SCANNED_TODAY = '''
+    SELECT
+        CURRENT_DATE as today,
+        current_setting('TimeZone') as timezone,
+        COALESCE(array_agg(DISTINCT e.id), '{}') as ordinals
+    FROM scan_logs sl
+    JOIN employees e ON e.employee_id = sl.employee_id
+    WHERE sl.status = 'SUCCESS'
+    AND sl.scan_time >= CURRENT_DATE
+'''
+
+# scan_time holds wall-clock time in this zone and CURRENT_DATE is "today"
+# in it; see DatabaseManager.load_timezone()
+SELECT_TIMEZONE = "SELECT current_setting('TimeZone') as timezone"
+
+SELECT_SYSTEM_SETTINGS = '''
+    SELECT setting_key, setting_value, description, updated_at
+    FROM system_settings
+    ORDER BY setting_key
+'''
+
+UPSERT_SYSTEM_SETTING = '''
+    INSERT INTO system_settings (setting_key, setting_value, description)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (setting_key) DO UPDATE
+    SET setting_value = EXCLUDED.setting_value
+'''
+
+DELETE_SYSTEM_SETTING = 'DELETE FROM system_settings WHERE setting_key = %s'
+
+INSERT_SCAN_LOG = '''
+    INSERT INTO scan_logs (employee_id, status, ip_address, user_agent, additional_info)
+    VALUES (%s, %s, %s, %s, %s)
+'''
+
+# Look up the active employee, claim today's attendance row and write the
+# scan log in one statement.
+RECORD_SCAN = '''
+    WITH employee AS (
+        SELECT id, employee_id, name, department, position
+        FROM employees
+        WHERE employee_id = %(employee_id)s AND is_active = TRUE
+    ),
+    attendance AS (
+        INSERT INTO daily_attendance (employee_id, scan_date)
+        SELECT employee_id, CURRENT_DATE FROM employee
+        ON CONFLICT (employee_id, scan_date) DO NOTHING
+        RETURNING employee_id
+    ),
+    decision AS (
+        SELECT CASE
+            WHEN NOT EXISTS (SELECT 1 FROM employee) THEN 'NOT_FOUND'
+            WHEN EXISTS (SELECT 1 FROM attendance) THEN 'ALLOWED'
+            ELSE 'ALREADY_SCANNED'
+        END AS outcome
+    ),
+    logged AS (
+        INSERT INTO scan_logs (employee_id, status, ip_address, user_agent, additional_info)
+        SELECT
+            %(employee_id)s,
+            CASE outcome WHEN 'ALLOWED' THEN 'SUCCESS' ELSE 'DENIED' END,
+            %(ip_address)s::inet,
+            %(user_agent)s,
+            CASE outcome
+                WHEN 'ALLOWED' THEN 'Access granted'
+                WHEN 'NOT_FOUND' THEN 'Employee not found'
+                ELSE 'Already scanned today'
+            END
+        FROM decision
+        RETURNING id, scan_time
+    )
+    SELECT
+        d.outcome,
+        e.id as ordinal,
+        e.name,
+        e.department,
+        e.position,
+        l.id as log_id,
+        l.scan_time,
+        CURRENT_DATE as scan_date
+    FROM decision d
+    CROSS JOIN logged l
+    LEFT JOIN employee e ON TRUE
+'''
+
+# The set-based counterpart of RECORD_SCAN for scans replayed by offline
+# devices; see DatabaseManager.record_scan_batch().
+RECORD_SCAN_BATCH = '''
+    WITH input AS (
+        SELECT *
+        FROM unnest(%(employee_ids)s::varchar[], %(scan_times)s::timestamp[], %(device_ids)s::varchar[])
+            WITH ORDINALITY AS t(employee_id, scan_time, device_id, seq)
+    ),
+    resolved AS (
+        SELECT
+            i.*,
+            i.scan_time::date as scan_date,
+            e.id as ordinal,
+            e.name,
+            e.department,
+            e.position as employee_position,
+            row_number() OVER (
+                PARTITION BY i.employee_id, i.scan_time::date
+                ORDER BY i.scan_time, i.seq
+            ) as day_rank
+        FROM input i
+        LEFT JOIN employees e ON e.employee_id = i.employee_id AND e.is_active = TRUE
+    ),
+    attendance AS (
+        INSERT INTO daily_attendance (employee_id, scan_date, first_scan_time)
+        SELECT employee_id, scan_date, scan_time
+        FROM resolved
+        WHERE ordinal IS NOT NULL AND day_rank = 1
+        ORDER BY employee_id, scan_date
+        ON CONFLICT (employee_id, scan_date) DO NOTHING
+        RETURNING employee_id, scan_date
+    ),
+    decision AS (
+        SELECT r.*, CASE
+            WHEN r.ordinal IS NULL THEN 'NOT_FOUND'
+            WHEN r.day_rank = 1 AND EXISTS (
+                SELECT 1 FROM attendance a
+                WHERE a.employee_id = r.employee_id AND a.scan_date = r.scan_date
+            ) THEN 'ALLOWED'
+            ELSE 'ALREADY_SCANNED'
+        END AS outcome
+        FROM resolved r
+    ),
+    logged AS (
+        INSERT INTO scan_logs (employee_id, status, ip_address, user_agent, additional_info, scan_time, device_id)
+        SELECT
+            employee_id,
+            CASE outcome WHEN 'ALLOWED' THEN 'SUCCESS' ELSE 'DENIED' END,
+            %(ip_address)s::inet,
+            %(user_agent)s,
+            CASE outcome
+                WHEN 'ALLOWED' THEN 'Access granted'
+                WHEN 'NOT_FOUND' THEN 'Employee not found'
+                ELSE 'Already scanned today'
+            END,
+            scan_time,
+            device_id
+        FROM decision
+        ORDER BY seq
+    )
+    SELECT
+        outcome,
+        ordinal,
+        name,
+        department,
+        employee_position as position,
+        scan_time,
+        scan_date,
+        CURRENT_DATE as today
+    FROM decision
+    ORDER BY seq
+'''
+
+_SCAN_LOGS_SELECT = '''
+    SELECT sl.*, e.name as employee_name, e.department
+    FROM scan_logs sl
+    LEFT JOIN employees e ON sl.employee_id = e.employee_id
+    WHERE 1=1
+'''
+
+
+def _scan_log_filters(query, params, employee_id=None, status=None):
+    if employee_id:
+        query += ' AND sl.employee_id = %s'
+        params.append(employee_id)
+
+    if status:
+        query += ' AND sl.status = %s'
+        params.append(status)
+
+    return query
+
+
+def scan_logs_query(limit=50, offset=0, employee_id=None, status=None):
+    params = []
+    query = _scan_log_filters(_SCAN_LOGS_SELECT, params, employee_id, status)
+    query += ' ORDER BY sl.scan_time DESC LIMIT %s OFFSET %s'
+    params.extend([limit, offset])
+    return query, params
+
+
+def scan_logs_page_query(limit, direction='next', after_time=None, after_id=None,
+                         employee_id=None, status=None):
+    """Keyset page; fetches limit + 1 rows so the caller can tell if more exist."""
+    params = []
+    query = _scan_log_filters(_SCAN_LOGS_SELECT, params, employee_id, status)
+
+    if direction == 'next':
+        if after_id is not None:
+            query += ' AND (sl.scan_time, sl.id) < (%s, %s)'
+            params.extend([after_time, after_id])
+        query += ' ORDER BY sl.scan_time DESC, sl.id DESC LIMIT %s'
+    else:
+        query += ' AND (sl.scan_time, sl.id) > (%s, %s)'
+        params.extend([after_time, after_id])
+        query += ' ORDER BY sl.scan_time ASC, sl.id ASC LIMIT %s'
+
+    params.append(limit + 1)
+    return query, params
+
+
+def scan_logs_export_query(start_time=None, end_time=None, employee_id=None, status=None):
+    query = '''
+        SELECT
+            sl.id,
+            sl.employee_id,
+            e.name as employee_name,
+            e.department,
+            sl.scan_time,
+            sl.status,
+            sl.ip_address,
+            sl.user_agent,
+            sl.additional_info,
+            sl.device_id
+        FROM scan_logs sl
+        LEFT JOIN employees e ON sl.employee_id = e.employee_id
+        WHERE 1=1
+    '''
+    params = []
+
+    if start_time:
+        query += ' AND sl.scan_time >= %s'
+        params.append(start_time)
+
+    if end_time:
+        query += ' AND sl.scan_time < %s'
+        params.append(end_time)
+
+    query = _scan_log_filters(query, params, employee_id, status)
+    query += ' ORDER BY sl.scan_time, sl.id'
+    return query, params
+
+
+def employees_query(active_only=True):
+    query = 'SELECT * FROM employees'
+    if active_only:
+        query += ' WHERE is_active = TRUE'
+    query += ' ORDER BY name'
+    return query, []
+
+
+EMPLOYEE_FIELDS = (
+    'id', 'employee_id', 'name', 'department', 'position', 'is_active', 'created_at', 'updated_at',
+)
+
+
+def _like_escape(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def employee_search_query(limit, after_name=None, after_id=None, q=None, match='prefix',
+                          department=None, position=None, is_active=True, fields=EMPLOYEE_FIELDS):
+    """
+    Keyset page of employees ordered by (name, employee_id), selecting only
+    `fields` plus the two ordering columns. `q` matches the start of
+    employee_id or of the name (case-insensitive), or anywhere in either
+    with match='substring'; `is_active` None means any. Fetches limit + 1
+    rows so the caller can tell if more exist. See migrations/0012 for the
+    indexes each branch uses.
+    """
+    columns = list(dict.fromkeys([*fields, 'name', 'employee_id']))
+    query = f'SELECT {", ".join(columns)} FROM employees WHERE 1=1'
+    params = []
+
+    if is_active is not None:
+        query += ' AND is_active = %s'
+        params.append(is_active)
+
+    if department:
+        query += ' AND department = %s'
+        params.append(department)
+
+    if position:
+        query += ' AND position = %s'
+        params.append(position)
+
+    if q:
+        if match == 'substring':
+            pattern = f'%{_like_escape(q)}%'
+            query += ' AND (employee_id ILIKE %s OR name ILIKE %s)'
+            params.extend([pattern, pattern])
+        else:
+            query += ' AND (employee_id LIKE %s OR lower(name) LIKE %s)'
+            params.extend([_like_escape(q.upper()) + '%', _like_escape(q.lower()) + '%'])
+
+    if after_id is not None:
+        query += ' AND (name, employee_id) > (%s, %s)'
+        params.extend([after_name, after_id])
+
+    query += ' ORDER BY name, employee_id LIMIT %s'
+    params.append(limit + 1)
+    return query, params
+
+
+def employees_version_query(active_only=True):
+    """
+    Cheap change marker for employees_query(): the row count, the newest
+    updated_at and the sum of all updated_at values. The sum also moves when
+    a long transaction (e.g. a bulk import) commits rows stamped earlier
+    than the current newest updated_at.
+    """
+    query = '''
+        SELECT
+            COUNT(*) as count,
+            MAX(updated_at) as last_updated,
+            SUM(EXTRACT(EPOCH FROM updated_at)) as updated_sum
+        FROM employees
+    '''
+    if active_only:
+        query += ' WHERE is_active = TRUE'
+    return query, []
+
+
+# GET /api/employees/summary reads the employee_scan_summary materialized
+# view (migrations/0011, reshaped in 0013); these are the columns it can be
+# sorted by.
+EMPLOYEE_SUMMARY_SORTS = (
+    'employee_id', 'name', 'department', 'total_scans', 'successful_scans',
+    'denied_scans', 'days_present', 'last_present', 'last_scan',
+)
+
+
+def _employee_summary_filters(department=None, employee_id=None):
+    query = ' WHERE 1=1'
+    params = []
+
+    if department:
+        query += ' AND department = %s'
+        params.append(department)
+
+    if employee_id:
+        query += ' AND employee_id = %s'
+        params.append(employee_id)
+
+    return query, params
+
+
+def employee_summary_query(department=None, employee_id=None, sort='total_scans',
+                           descending=True, limit=50, offset=0):
+    if sort not in EMPLOYEE_SUMMARY_SORTS:
+        raise ValueError(f'cannot sort by {sort!r}')
+
+    where, params = _employee_summary_filters(department, employee_id)
+    direction = 'DESC' if descending else 'ASC'
+    # employee_id breaks ties so pages never overlap
+    query = f'''
+        SELECT employee_id, name, department, position, total_scans, successful_scans,
+               denied_scans, days_present, last_present, last_scan
+        FROM employee_scan_summary
+        {where}
+        ORDER BY {sort} {direction} NULLS LAST, employee_id {direction}
+        LIMIT %s OFFSET %s
+    '''
+    params.extend([limit, offset])
+    return query, params
+
+
+def employee_summary_count_query(department=None, employee_id=None):
+    where, params = _employee_summary_filters(department, employee_id)
+    return 'SELECT COUNT(*) as total FROM employee_scan_summary' + where, params
+
+
+SELECT_EMPLOYEE_SUMMARY_INFO = '''
+    SELECT
+        refreshed_at,
+        period_start,
+        EXTRACT(EPOCH FROM now() - refreshed_at)::float as age_seconds
+    FROM employee_scan_summary_refresh
+'''
+
+REFRESH_EMPLOYEE_SUMMARY = 'REFRESH MATERIALIZED VIEW CONCURRENTLY employee_scan_summary'
+
+# Kept out of the view so a refresh only rewrites rows whose totals changed
+MARK_EMPLOYEE_SUMMARY_REFRESHED = '''
+    UPDATE employee_scan_summary_refresh
+    SET refreshed_at = now(), period_start = CURRENT_DATE - 30
+    RETURNING refreshed_at
+'''
+
+
+def scan_events_after_query(after_id, limit):
+    """
+    scan_logs rows newer than `after_id`, shaped like the live stream's
+    events (migrations/0009), for viewers resuming past the broker history.
+    """
+    return '''
+        SELECT
+            sl.id,
+            sl.employee_id,
+            e.name as employee_name,
+            e.department,
+            sl.status,
+            sl.scan_time,
+            left(sl.additional_info, 200) as additional_info,
+            sl.device_id
+        FROM scan_logs sl
+        LEFT JOIN employees e ON sl.employee_id = e.employee_id
+        WHERE sl.id > %s
+        ORDER BY sl.id
+        LIMIT %s
+    ''', [after_id, limit]
+
+
+def json_agg_query(query, params):
+    """
+    Wrap a row query so PostgreSQL returns its rows as one JSON array (as
+    text, so the driver does not decode it) plus the row count.
+    """
+    return f'''
+        SELECT COALESCE(json_agg(r), '[]')::text as rows, COUNT(*) as count
+        FROM ({query}) r
+    ''', params
+
+
+def _scan_statistics_filters(start_date=None, end_date=None, granularity='day', department=None):
+    if granularity not in ('day', 'hour'):
+        raise ValueError('granularity must be day or hour')
+
+    query = ' WHERE granularity = %s'
+    params = [granularity]
+
+    if start_date:
+        query += ' AND bucket_start >= %s'
+        params.append(start_date)
+
+    if end_date:
+        query += ' AND bucket_start <= %s'
+        params.append(end_date)
+
+    if department is not None:
+        query += ' AND department = %s'
+        params.append(department)
+
+    return query, params
+
+
+def scan_statistics_query(start_date=None, end_date=None, granularity='day',
+                          department=None, by_department=False):
+    where, params = _scan_statistics_filters(start_date, end_date, granularity, department)
+
+    bucket_column = 'scan_date' if granularity == 'day' else 'scan_hour'
+    bucket_expr = 'bucket_start::date' if granularity == 'day' else 'bucket_start'
+
+    group_columns = f'status, {bucket_expr}'
+    if by_department:
+        group_columns += ', department'
+
+    query = f'''
+        SELECT
+            status,
+            SUM(scan_count)::bigint as count,
+            {bucket_expr} as {bucket_column}
+            {', department' if by_department else ''}
+        FROM scan_stats_rollup
+        {where}
+        GROUP BY {group_columns} ORDER BY {bucket_column} DESC
+    '''
+    return query, params
+
+
+def scan_statistics_version_query(start_date=None, end_date=None, granularity='day', department=None):
+    """
+    Change marker for the rollup rows behind one scan_statistics_query():
+    the trigger only ever adds to scan_count, so the total grows with every
+    committed scan in range. Unlike MAX(scan_logs.id), which misses a lower
+    id committing after a higher one, it only counts what is visible. A
+    rebuild can move counts between buckets and keep the total, so `digest`
+    also sums a hash of every bucket's key and count (order-independent, no
+    sort needed).
+    """
+    where, params = _scan_statistics_filters(start_date, end_date, granularity, department)
+    return f'''
+        SELECT
+            COALESCE(SUM(scan_count), 0)::bigint as scans,
+            COUNT(*) as buckets,
+            COALESCE(SUM(hashtextextended(
+                concat_ws('|', bucket_start, status, department, scan_count), 0
+            )::numeric), 0) as digest
+        FROM scan_stats_rollup
+        {where}
+    ''', params
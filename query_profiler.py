@@ -0,0 +1,283 @@
+"""
+Per-request database profiling shared by app.py and async_app.py.
+
+The database managers' cursors report every statement here with its
+duration, and the managers report pool checkouts ("connect"); the JSON
+encoder reports serialization. While a request is being handled these
+are collected into its RequestProfile, which becomes the Server-Timing
+response header:
+
+    Server-Timing: connect;dur=0.08, get_employee_by_id;desc="SELECT employees";dur=0.52,
+                   record_scan;desc="WITH scan_logs";dur=2.41, serialize;dur=0.05, db;dur=3.01, total;dur=3.9
+
+Each query is named after the DatabaseManager method that ran it (see
+instrument()). Independently of any request, a statement slower than
+slow_query_ms is printed as one JSON line, and a sample of those
+(explain_sample_rate) also gets its EXPLAIN (ANALYZE, BUFFERS) plan,
+captured by the cursor inside a transaction that is rolled back.
+
+The three settings default to the PROFILING_* values in config.py and can
+be changed while the app runs through the system_settings table
+(`python manage.py settings`), which every process follows via NOTIFY.
+"""
+import asyncio
+import contextvars
+import functools
+import json
+import random
+import re
+import time
+from datetime import datetime
+
+from config import Config
+
+SETTINGS_CHANNEL = 'system_settings_changed'
+
+# Statements that EXPLAIN accepts
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'VALUES')
+
+# Queries listed individually in Server-Timing; the rest are summed into db-other
+MAX_TIMING_ENTRIES = 20
+
+_STATEMENT_LOG_LENGTH = 2000
+
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+([A-Za-z_][\w.]*)', re.IGNORECASE)
+
+
+def _parse_bool(value):
+    value = str(value).strip().lower()
+    if value in ('true', 'on', '1', 'yes'):
+        return True
+    if value in ('false', 'off', '0', 'no'):
+        return False
+    raise ValueError(f"expected on/off, got '{value}'")
+
+
+def _parse_ms(value):
+    value = float(value)
+    if value < 0:
+        raise ValueError('must be 0 (off) or a positive number of milliseconds')
+    return value
+
+
+def _parse_rate(value):
+    value = float(value)
+    if not 0 <= value <= 1:
+        raise ValueError('must be between 0 and 1')
+    return value
+
+
+class ProfilerSettings:
+    """The runtime-adjustable settings; names are system_settings keys."""
+
+    PARSERS = {
+        'server_timing': _parse_bool,
+        'slow_query_ms': _parse_ms,
+        'explain_sample_rate': _parse_rate,
+    }
+
+    DESCRIPTIONS = {
+        'server_timing': 'Send a Server-Timing header with per-query timings (on/off)',
+        'slow_query_ms': 'Log statements slower than this many milliseconds (0 = off)',
+        'explain_sample_rate': 'Fraction of slow statements logged with EXPLAIN (ANALYZE, BUFFERS)',
+    }
+
+    def __init__(self):
+        self.apply({})
+
+    @classmethod
+    def defaults(cls):
+        return {
+            'server_timing': Config.PROFILING_SERVER_TIMING,
+            'slow_query_ms': Config.PROFILING_SLOW_QUERY_MS,
+            'explain_sample_rate': Config.PROFILING_EXPLAIN_SAMPLE_RATE,
+        }
+
+    @classmethod
+    def check_name(cls, name):
+        if name not in cls.PARSERS:
+            raise ValueError(f"unknown setting '{name}' (expected one of: {', '.join(cls.PARSERS)})")
+
+    @classmethod
+    def parse(cls, name, value):
+        """Validate one setting; raises ValueError for unknown names and bad values."""
+        cls.check_name(name)
+        try:
+            return cls.PARSERS[name](value)
+        except ValueError as e:
+            raise ValueError(f"{name}: {e}") from None
+
+    def apply(self, overrides):
+        """
+        Replace the current values with the Config defaults updated by
+        `overrides` ({key: text} rows from system_settings). Rows for other
+        settings are skipped; invalid values are reported and ignored.
+        """
+        values = self.defaults()
+        for name, value in overrides.items():
+            if name not in self.PARSERS:
+                continue
+            try:
+                values[name] = self.parse(name, value)
+            except ValueError as e:
+                print(f"⚠ Ignoring runtime setting: {e}")
+
+        self.server_timing = values['server_timing']
+        self.slow_query_ms = values['slow_query_ms']
+        self.explain_sample_rate = values['explain_sample_rate']
+
+    def as_dict(self):
+        return {
+            'server_timing': self.server_timing,
+            'slow_query_ms': self.slow_query_ms,
+            'explain_sample_rate': self.explain_sample_rate,
+        }
+
+
+settings = ProfilerSettings()
+
+_profile = contextvars.ContextVar('query_profile', default=None)
+_method = contextvars.ContextVar('query_profile_method', default=None)
+
+
+class RequestProfile:
+    __slots__ = ('route', 'started', 'connect', 'serialize', 'queries')
+
+    def __init__(self, route=None):
+        self.route = route
+        self.started = time.perf_counter()
+        self.connect = 0.0
+        self.serialize = 0.0
+        self.queries = []
+
+    def server_timing(self):
+        """The Server-Timing header value; durations in milliseconds."""
+        entries = []
+        if self.connect:
+            entries.append(f'connect;dur={self.connect * 1000:.2f}')
+
+        names = {}
+        other = 0.0
+        for i, (method, statement, duration) in enumerate(self.queries):
+            if i >= MAX_TIMING_ENTRIES:
+                other += duration
+                continue
+            name = method or 'query'
+            names[name] = names.get(name, 0) + 1
+            if names[name] > 1:
+                name = f'{name}.{names[name]}'
+            entries.append(f'{name};desc="{describe(statement)}";dur={duration * 1000:.2f}')
+        if other:
+            entries.append(f'db-other;dur={other * 1000:.2f}')
+
+        if self.serialize:
+            entries.append(f'serialize;dur={self.serialize * 1000:.2f}')
+
+        db = self.connect + sum(duration for _, _, duration in self.queries)
+        entries.append(f'db;dur={db * 1000:.2f}')
+        entries.append(f'total;dur={(time.perf_counter() - self.started) * 1000:.2f}')
+        return ', '.join(entries)
+
+
+def start_request(route=None):
+    _profile.set(RequestProfile(route))
+
+
+def finish_request():
+    """End the current request's profile; returns its Server-Timing value or None."""
+    profile = _profile.get()
+    _profile.set(None)
+    if profile is None or not settings.server_timing:
+        return None
+    return profile.server_timing()
+
+
+def record_connect(duration):
+    profile = _profile.get()
+    if profile is not None:
+        profile.connect += duration
+
+
+def record_serialize(duration):
+    profile = _profile.get()
+    if profile is not None:
+        profile.serialize += duration
+
+
+def observe(statement, duration):
+    """
+    Called by the cursors after every statement. Returns True when it was
+    slow, in which case the cursor calls log_slow_query() (after
+    capturing a plan if sample_explain() says so).
+    """
+    profile = _profile.get()
+    if profile is not None:
+        profile.queries.append((_method.get(), statement, duration))
+    return bool(settings.slow_query_ms) and duration * 1000 >= settings.slow_query_ms
+
+
+def sample_explain(statement):
+    rate = settings.explain_sample_rate
+    if not rate or random.random() >= rate:
+        return False
+    words = statement.split(None, 1)
+    return bool(words) and words[0].upper() in EXPLAINABLE
+
+
+def log_slow_query(statement, params, duration, plan=None, error=None):
+    profile = _profile.get()
+    entry = {
+        'event': 'slow_query',
+        'time': datetime.now().isoformat(),
+        'duration_ms': round(duration * 1000, 2),
+        'threshold_ms': settings.slow_query_ms,
+        'method': _method.get(),
+        'route': profile.route if profile else None,
+        'statement': ' '.join(statement.split())[:_STATEMENT_LOG_LENGTH],
+        'params': params,
+    }
+    if len(json.dumps(params, default=str)) > _STATEMENT_LOG_LENGTH:
+        entry['params'] = '(too long to log)'
+    if error:
+        entry['error'] = error
+    if plan is not None:
+        entry['plan'] = plan
+    print(json.dumps(entry, default=str), flush=True)
+
+
+def describe(statement):
+    """Short label for a statement: its first keyword and first table."""
+    words = statement.lstrip().split(None, 1)
+    if not words:
+        return ''
+    table = _TABLE.search(statement)
+    return f'{words[0].upper()} {table.group(1)}' if table else words[0].upper()
+
+
+def _named(name, func):
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            token = _method.set(name)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _method.reset(token)
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _method.set(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _method.reset(token)
+    return wrapper
+
+
+def instrument(cls, method_names):
+    """Label the statements run by the named methods of a database manager class."""
+    for name in method_names:
+        func = getattr(cls, name, None)
+        if func is not None:
+            setattr(cls, name, _named(name, func))
+    return cls
@@ -0,0 +1,155 @@
+import fcntl
+import mmap
+import os
+import struct
+import threading
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+_MAGIC = b'SCBM'
+# magic (4 bytes), padding (4 bytes), day as date.toordinal() (8 bytes)
+_HEADER = struct.Struct('<4s4xq')
+
+
+class ScannedTodayBitmap:
+    """
+    Node-wide "already scanned today" set shared by every worker process.
+
+    One bit per employee ordinal (employees.id) lives in a memory-mapped
+    file, normally under /dev/shm. The header records the day the bits
+    belong to; once the day changes the set reads as empty until the first
+    writer of the new day clears it.
+
+    "Today" is CURRENT_DATE as the database sees it: `timezone` is the
+    database session's TimeZone setting, since the app container and the
+    database server need not share a clock zone. Writers pass the day the
+    database returned with the attendance (add_many(day=...)), and bits for
+    any other day are dropped.
+
+    A set bit is only ever written after the database confirmed today's
+    attendance, so it can be trusted. A clear bit means "unknown" and the
+    caller must fall back to the database.
+    """
+
+    def __init__(self, path, capacity=1 << 20, timezone=None):
+        if capacity <= 0 or capacity % 8:
+            raise ValueError('capacity must be a positive multiple of 8')
+
+        self.path = path
+        self.capacity = capacity
+        # Raises ZoneInfoNotFoundError (a KeyError) for a zone Python does not know
+        self.timezone = ZoneInfo(timezone) if timezone else None
+        self._size = _HEADER.size + capacity // 8
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'adds': 0, 'rollovers': 0}
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(self._fd).st_size < self._size:
+                    os.ftruncate(self._fd, self._size)
+                self._map = mmap.mmap(self._fd, self._size)
+                magic, _ = _HEADER.unpack_from(self._map, 0)
+                if magic != _MAGIC:
+                    self._map[:] = bytes(self._size)
+                    _HEADER.pack_into(self._map, 0, _MAGIC, 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def _today(self):
+        return datetime.now(self.timezone).date().toordinal()
+
+    def _day(self):
+        return _HEADER.unpack_from(self._map, 0)[1]
+
+    def _exclusive(self):
+        return _FileLock(self._lock, self._fd)
+
+    def _rollover_locked(self, today):
+        # Invalidate the header first so a concurrent reader never pairs the
+        # new day with bits left over from the previous one.
+        _HEADER.pack_into(self._map, 0, _MAGIC, 0)
+        self._map[_HEADER.size:] = bytes(self._size - _HEADER.size)
+        _HEADER.pack_into(self._map, 0, _MAGIC, today)
+        self._stats['rollovers'] += 1
+
+    def contains(self, ordinal):
+        if ordinal is None or not 0 <= ordinal < self.capacity or self._day() != self._today():
+            self._stats['misses'] += 1
+            return False
+
+        byte = self._map[_HEADER.size + (ordinal >> 3)]
+        if byte & (1 << (ordinal & 7)):
+            self._stats['hits'] += 1
+            return True
+        self._stats['misses'] += 1
+        return False
+
+    def add(self, ordinal, day):
+        self.add_many([ordinal], day)
+
+    def add_many(self, ordinals, day):
+        """
+        Mark `ordinals` as scanned on `day` (a date ordinal), the
+        CURRENT_DATE the database recorded the attendance under. Ignored
+        unless that is still today here, so the set never answers for a day
+        the database has not confirmed.
+        """
+        today = self._today()
+        if day != today:
+            return
+
+        with self._exclusive():
+            if self._day() != today:
+                self._rollover_locked(today)
+            for ordinal in ordinals:
+                if ordinal is None or not 0 <= ordinal < self.capacity:
+                    continue
+                offset = _HEADER.size + (ordinal >> 3)
+                self._map[offset] |= 1 << (ordinal & 7)
+                self._stats['adds'] += 1
+
+    def clear(self):
+        with self._exclusive():
+            self._rollover_locked(self._today())
+
+    def close(self):
+        if self._map.closed:
+            return
+        self._map.close()
+        os.close(self._fd)
+
+    def stats(self):
+        day = self._day()
+        current = day == self._today()
+        population = int.from_bytes(self._map[_HEADER.size:], 'little').bit_count() if current else 0
+        stats = dict(self._stats)
+        stats.update({
+            'path': self.path,
+            'capacity': self.capacity,
+            'day': date.fromordinal(day).isoformat() if day else None,
+            'timezone': str(self.timezone) if self.timezone else None,
+            'current': current,
+            'population': population,
+        })
+        return stats
+
+
+class _FileLock:
+    """Excludes other threads (threading lock) and other processes (flock)."""
+
+    def __init__(self, lock, fd):
+        self._lock = lock
+        self._fd = fd
+
+    def __enter__(self):
+        self._lock.acquire()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def __exit__(self, exc_type, exc_value, tb):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
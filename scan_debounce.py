@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ScanDebouncer:
+    """
+    Remembers the decision for each (employee_id, source) pair for `window`
+    seconds, so a gate camera firing the same badge several times while it
+    is held up gets the first answer back instead of another database
+    round trip and another "Already scanned today" scan_logs row.
+
+    `source` is the device ID the scanner sends, or its IP address. The
+    window is fixed from the first decision and repeats do not extend it: a
+    badge held in front of the camera must not keep re-opening the gate for
+    whoever follows. After the window the next fire is decided (and logged)
+    again, normally as ALREADY_SCANNED. Repeats are only counted. At most
+    `max_size` pairs are kept, oldest dropped first.
+
+    The state is per process; under gunicorn a repeat that lands on another
+    worker is decided normally.
+    """
+
+    def __init__(self, window=2.0, max_size=10000):
+        self.window = window
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+        self._stats = {
+            'suppressed': 0,
+            'misses': 0,
+            'evictions': 0,
+        }
+
+    def get(self, employee_id, source):
+        """The remembered scan for a repeat within the window, or None."""
+        key = (employee_id, source)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                self._stats['misses'] += 1
+                return None
+            self._stats['suppressed'] += 1
+            return entry[1]
+
+    def remember(self, employee_id, source, scan):
+        """
+        Store a freshly decided scan and return the one to answer with. When
+        two fires raced past get(), the first decision stored wins, so both
+        get the same answer.
+        """
+        key = (employee_id, source)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+            self._entries[key] = (now + self.window, scan)
+            self._entries.move_to_end(key)
+            self._prune(now)
+            return scan
+
+    def _prune(self, now):
+        # Insertion order is expiry order, since every entry lives `window`
+        while self._entries:
+            key, (expires, _) = next(iter(self._entries.items()))
+            if expires > now and len(self._entries) <= self.max_size:
+                break
+            del self._entries[key]
+            if expires > now:
+                self._stats['evictions'] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'window': self.window,
+            })
+        return stats
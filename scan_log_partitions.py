@@ -0,0 +1,212 @@
+"""
+Monthly range partitioning of scan_logs on scan_time.
+
+Partitions are named scan_logs_pYYYYMM and cover one calendar month;
+scan_logs_default catches anything outside them.
+"""
+import re
+from datetime import date, datetime
+
+from psycopg2 import errors, sql
+
+PARTITION_PATTERN = re.compile(r'^scan_logs_p(\d{4})(\d{2})$')
+
+
+def add_months(month_start, months):
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month_start):
+    return f'scan_logs_p{month_start:%Y%m}'
+
+
+def create_partitioned_scan_logs(cursor):
+    """
+    Create scan_logs as a partitioned table, converting an existing
+    unpartitioned scan_logs in place. Does nothing if it already is one.
+    """
+    cursor.execute('''
+        SELECT relkind FROM pg_class
+        WHERE oid = to_regclass('scan_logs')
+    ''')
+    existing = cursor.fetchone()
+
+    if existing and existing['relkind'] == 'p':
+        return
+
+    cursor.execute('CREATE SEQUENCE IF NOT EXISTS scan_logs_id_seq')
+
+    if existing:
+        # Legacy heap: keep its id sequence, move it aside and copy the
+        # rows into the partitioned table below.
+        cursor.execute('ALTER SEQUENCE scan_logs_id_seq OWNED BY NONE')
+        cursor.execute('ALTER TABLE scan_logs RENAME TO scan_logs_legacy')
+        cursor.execute('ALTER TABLE scan_logs_legacy RENAME CONSTRAINT scan_logs_pkey TO scan_logs_legacy_pkey')
+
+    cursor.execute('''
+        CREATE TABLE scan_logs (
+            id INTEGER NOT NULL DEFAULT nextval('scan_logs_id_seq'),
+            employee_id VARCHAR(50) NOT NULL,
+            scan_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            status VARCHAR(20) NOT NULL CHECK(status IN ('SUCCESS', 'DENIED', 'ERROR')),
+            ip_address INET,
+            user_agent TEXT,
+            additional_info TEXT,
+            PRIMARY KEY (id, scan_time)
+        ) PARTITION BY RANGE (scan_time)
+    ''')
+    cursor.execute('ALTER SEQUENCE scan_logs_id_seq OWNED BY scan_logs.id')
+
+    # Catches rows outside every monthly partition (e.g. if maintenance
+    # fell behind); they are moved out when their partition is created.
+    cursor.execute('CREATE TABLE scan_logs_default PARTITION OF scan_logs DEFAULT')
+
+    if not existing:
+        return
+
+    cursor.execute('''
+        SELECT date_trunc('month', MIN(scan_time))::date as first_month,
+               date_trunc('month', MAX(scan_time))::date as last_month
+        FROM scan_logs_legacy
+    ''')
+    bounds = cursor.fetchone()
+
+    if bounds['first_month']:
+        month = bounds['first_month']
+        while month <= bounds['last_month']:
+            create_partition(cursor, month)
+            month = add_months(month, 1)
+
+    # Rows without a scan_time land in the default partition
+    cursor.execute('''
+        INSERT INTO scan_logs (id, employee_id, scan_time, status, ip_address, user_agent, additional_info)
+        SELECT id, employee_id, COALESCE(scan_time, 'epoch'::timestamp), status, ip_address, user_agent, additional_info
+        FROM scan_logs_legacy
+    ''')
+    print(f"Migrated {cursor.rowcount} scan_logs rows into the partitioned table")
+
+    cursor.execute('DROP TABLE scan_logs_legacy')
+
+
+def create_partition(cursor, month_start):
+    """Create and attach the partition for one month; False if it exists."""
+    name = partition_name(month_start)
+
+    cursor.execute('SELECT to_regclass(%s) IS NOT NULL as exists', (name,))
+    if cursor.fetchone()['exists']:
+        return False
+
+    lower = datetime(month_start.year, month_start.month, 1)
+    upper_month = add_months(month_start, 1)
+    upper = datetime(upper_month.year, upper_month.month, 1)
+    table = sql.Identifier(name)
+    bounds = sql.Identifier(f'{name}_bounds')
+
+    # Build the partition standalone and ATTACH it: that takes only a
+    # SHARE UPDATE EXCLUSIVE lock on scan_logs, but ACCESS EXCLUSIVE on
+    # scan_logs_default. Waiting for that lock (behind a long export, say)
+    # queues every query touching the default partition, hence the
+    # lock_timeout maintain_partitions() sets.
+    cursor.execute(sql.SQL(
+        'CREATE TABLE {} (LIKE scan_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    ).format(table))
+    cursor.execute(sql.SQL(
+        'ALTER TABLE {} ADD CONSTRAINT {} CHECK (scan_time >= %s AND scan_time < %s)'
+    ).format(table, bounds), (lower, upper))
+    # Take ATTACH's lock before moving rows out: a row for this month
+    # inserted into the default partition in between would otherwise make
+    # ATTACH fail its check of the default partition.
+    cursor.execute('LOCK TABLE scan_logs_default IN ACCESS EXCLUSIVE MODE')
+    cursor.execute(sql.SQL('''
+        WITH moved AS (
+            DELETE FROM scan_logs_default
+            WHERE scan_time >= %s AND scan_time < %s
+            RETURNING *
+        )
+        INSERT INTO {} SELECT * FROM moved
+    ''').format(table), (lower, upper))
+    cursor.execute(sql.SQL(
+        'ALTER TABLE scan_logs ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)'
+    ).format(table), (lower, upper))
+    cursor.execute(sql.SQL('ALTER TABLE {} DROP CONSTRAINT {}').format(table, bounds))
+    return True
+
+
+def maintain_partitions(cursor, months_ahead, retention_months, today=None, lock_timeout=5):
+    """
+    Ensure partitions exist from the current month (the database's
+    CURRENT_DATE unless `today` is given) to `months_ahead` months out and
+    detach/drop those entirely older than `retention_months`
+    (0 keeps everything). Skips if another session is already doing it.
+
+    ATTACH and DETACH wait at most `lock_timeout` seconds for their locks,
+    since a queued ACCESS EXCLUSIVE request blocks the scans behind it. The
+    first timeout defers that month and every remaining one (listed in
+    'deferred') to the next run, so scans stall for one timeout at most.
+    """
+    result = {'created': [], 'dropped': [], 'deferred': [], 'skipped': False}
+
+    cursor.execute("SELECT pg_try_advisory_xact_lock(hashtext('scan_logs_partition_maintenance')) as locked")
+    if not cursor.fetchone()['locked']:
+        result['skipped'] = True
+        return result
+
+    cursor.execute("SELECT set_config('lock_timeout', %s, true)", (f'{int(lock_timeout * 1000)}ms',))
+
+    if today is None:
+        cursor.execute('SELECT CURRENT_DATE as today')
+        today = cursor.fetchone()['today']
+    current_month = today.replace(day=1)
+
+    for offset in range(months_ahead + 1):
+        month = add_months(current_month, offset)
+        name = partition_name(month)
+        created = _step(cursor, result, name, lambda: create_partition(cursor, month))
+        if created:
+            result['created'].append(name)
+
+    if retention_months:
+        cutoff = add_months(current_month, -retention_months)
+
+        cursor.execute('''
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'scan_logs'::regclass
+            ORDER BY c.relname
+        ''')
+
+        for row in cursor.fetchall():
+            match = PARTITION_PATTERN.match(row['relname'])
+            if not match or date(int(match.group(1)), int(match.group(2)), 1) >= cutoff:
+                continue
+
+            if _step(cursor, result, row['relname'], lambda: _drop_partition(cursor, row['relname'])):
+                result['dropped'].append(row['relname'])
+
+    return result
+
+
+def _drop_partition(cursor, name):
+    table = sql.Identifier(name)
+    cursor.execute(sql.SQL('ALTER TABLE scan_logs DETACH PARTITION {}').format(table))
+    cursor.execute(sql.SQL('DROP TABLE {}').format(table))
+    return True
+
+
+def _step(cursor, result, name, action):
+    """Run one partition change in a savepoint; on lock timeout undo it and defer."""
+    if result['deferred']:
+        result['deferred'].append(name)
+        return False
+
+    cursor.execute('SAVEPOINT partition_step')
+    try:
+        done = action()
+    except errors.LockNotAvailable:
+        cursor.execute('ROLLBACK TO SAVEPOINT partition_step')
+        result['deferred'].append(name)
+        return False
+    cursor.execute('RELEASE SAVEPOINT partition_step')
+    return done
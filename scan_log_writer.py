@@ -0,0 +1,175 @@
+import queue
+import threading
+import time
+from datetime import datetime
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+_STOP = object()
+
+
+class ScanLogWriter:
+    """
+    Background writer that batches scan_logs inserts.
+
+    Rows are queued with the time they were submitted and written by one
+    thread as multi-row INSERTs, either when `batch_size` rows are waiting
+    or `flush_interval` seconds after the first row of a batch arrived.
+    The queue is bounded: submit() waits up to `enqueue_timeout` seconds
+    for space and returns False when the queue stays full, so the caller
+    can write the row synchronously instead of losing it.
+    """
+
+    def __init__(self, get_connection, max_queue_size=10000, batch_size=500,
+                 flush_interval=0.5, enqueue_timeout=0.05, max_retries=3):
+        self._get_connection = get_connection
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'dropped': 0,
+            'flush_errors': 0,
+            'queue_full': 0,
+            'enqueue_wait_seconds': 0.0,
+            'queue_high_water': 0,
+            'last_batch_size': 0,
+            'last_flush_ms': 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name='scan-log-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, employee_id, status, ip_address=None, user_agent=None,
+               additional_info=None, scan_time=None):
+        row = (employee_id, status, ip_address, user_agent, additional_info,
+               scan_time or datetime.now())
+        started = time.monotonic()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            try:
+                self._queue.put(row, timeout=self.enqueue_timeout)
+            except queue.Full:
+                with self._stats_lock:
+                    self._stats['queue_full'] += 1
+                    self._stats['enqueue_wait_seconds'] += time.monotonic() - started
+                return False
+            with self._stats_lock:
+                self._stats['enqueue_wait_seconds'] += time.monotonic() - started
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats['enqueued'] += 1
+            if depth > self._stats['queue_high_water']:
+                self._stats['queue_high_water'] = depth
+        return True
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self._queue.get()
+            if item is _STOP:
+                stopping = True
+            else:
+                batch.append(item)
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+            if stopping:
+                # Drain whatever is still queued before exiting
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        batch.append(item)
+
+            for start in range(0, len(batch), self.batch_size):
+                self._flush(batch[start:start + self.batch_size])
+
+    def _flush(self, batch):
+        if not batch:
+            return
+
+        for attempt in range(self.max_retries):
+            started = time.monotonic()
+            conn = None
+            try:
+                conn = self._get_connection()
+                cursor = conn.cursor()
+                try:
+                    execute_values(cursor, '''
+                        INSERT INTO scan_logs (employee_id, status, ip_address, user_agent, additional_info, scan_time)
+                        VALUES %s
+                    ''', batch, template='(%s, %s, %s::inet, %s, %s, %s)', page_size=len(batch))
+                    conn.commit()
+                finally:
+                    cursor.close()
+
+                with self._stats_lock:
+                    self._stats['written'] += len(batch)
+                    self._stats['batches'] += 1
+                    self._stats['last_batch_size'] = len(batch)
+                    self._stats['last_flush_ms'] = round((time.monotonic() - started) * 1000, 3)
+                return
+
+            except psycopg2.Error as e:
+                if conn is not None:
+                    try:
+                        conn.rollback()
+                    except psycopg2.Error:
+                        pass
+                with self._stats_lock:
+                    self._stats['flush_errors'] += 1
+                print(f"Error writing scan log batch (attempt {attempt + 1}): {e}")
+                time.sleep(min(2 ** attempt * 0.1, 2))
+            finally:
+                if conn is not None:
+                    conn.close()
+
+        with self._stats_lock:
+            self._stats['dropped'] += len(batch)
+        print(f"✗ Dropped {len(batch)} scan log rows after {self.max_retries} failed attempts")
+
+    def close(self, timeout=10):
+        """Flush everything queued so far and stop the writer thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        batches = stats['batches']
+        stats.update({
+            'queue_depth': self._queue.qsize(),
+            'max_queue_size': self.max_queue_size,
+            'batch_size': self.batch_size,
+            'flush_interval': self.flush_interval,
+            'avg_batch_size': round(stats['written'] / batches, 2) if batches else 0.0,
+            'enqueue_wait_seconds': round(stats['enqueue_wait_seconds'], 6),
+            'running': self._thread.is_alive(),
+        })
+        return stats
@@ -0,0 +1,175 @@
+import json
+import threading
+from collections import deque
+from datetime import datetime
+
+SCAN_LOGS_CHANNEL = 'scan_logs_inserted'
+
+
+def parse_notification(payload):
+    """
+    Decode a scan_logs_inserted payload (a JSON array of rows, see
+    migrations/0009) into events shaped like GET /api/logs rows.
+    """
+    events = json.loads(payload)
+    for event in events:
+        if event.get('scan_time'):
+            event['scan_time'] = datetime.fromisoformat(event['scan_time'])
+    return events
+
+
+class Subscription:
+    """
+    One live viewer. Events are buffered until the viewer takes them; a
+    viewer more than `max_buffer` events behind is closed instead of
+    buffering without bound, and is expected to reconnect with
+    Last-Event-ID.
+
+    `wakeup` is called (from any thread) when events arrive; the default
+    wakes get(). Async callers pass their own and use drain().
+    """
+
+    def __init__(self, statuses=None, department=None, employee_id=None, max_buffer=256, wakeup=None):
+        self.statuses = statuses
+        self.department = department
+        self.employee_id = employee_id
+        self.max_buffer = max_buffer
+        self.closed = False
+        self._events = deque()
+        self._skip_ids = set()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._wakeup = wakeup or self._ready.set
+
+    def matches(self, event):
+        if self.statuses and event.get('status') not in self.statuses:
+            return False
+        if self.department is not None and event.get('department') != self.department:
+            return False
+        if self.employee_id and event.get('employee_id') != self.employee_id:
+            return False
+        return True
+
+    def skip(self, event_ids):
+        """Drop these ids if they arrive live; they were already sent from a backfill."""
+        with self._lock:
+            self._skip_ids.update(event_ids)
+
+    def push(self, event):
+        with self._lock:
+            if self.closed:
+                return
+            if event['id'] in self._skip_ids:
+                self._skip_ids.discard(event['id'])
+                return
+            if len(self._events) >= self.max_buffer:
+                self.closed = True
+                self._events.clear()
+            else:
+                self._events.append(event)
+        self._wakeup()
+
+    def drain(self):
+        with self._lock:
+            self._ready.clear()
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def get(self, timeout=None):
+        """Wait up to `timeout` seconds for events; [] on timeout or close."""
+        if not self._events and not self.closed:
+            self._ready.wait(timeout)
+        return self.drain()
+
+
+class ScanEventBroker:
+    """
+    Fans scan_logs insert events out to the live viewers of this process
+    (GET /api/logs/stream), so one notification from PostgreSQL serves
+    every connected screen instead of each polling /api/logs.
+
+    The last `history_size` events are kept for viewers resuming with
+    Last-Event-ID. Events arrive in commit order, which is not always id
+    order, so a resume replays what followed that id in the history
+    rather than everything with a larger id.
+    """
+
+    def __init__(self, history_size=1000, client_buffer=256, max_clients=0):
+        self.client_buffer = client_buffer
+        self.max_clients = max_clients
+        self._history = deque(maxlen=history_size)
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            'events': 0,
+            'subscriptions': 0,
+            'rejected': 0,
+            'overflows': 0,
+        }
+
+    @property
+    def last_event_id(self):
+        with self._lock:
+            return self._history[-1]['id'] if self._history else None
+
+    def publish(self, events):
+        with self._lock:
+            self._history.extend(events)
+            self._stats['events'] += len(events)
+            subscriptions = list(self._subscriptions)
+
+        for subscription in subscriptions:
+            was_closed = subscription.closed
+            for event in events:
+                if subscription.matches(event):
+                    subscription.push(event)
+            if subscription.closed and not was_closed:
+                with self._lock:
+                    self._stats['overflows'] += 1
+
+    def subscribe(self, statuses=None, department=None, employee_id=None, last_event_id=None, wakeup=None):
+        """
+        Register a viewer. Returns (subscription, replay, complete): the
+        history events after `last_event_id` that match, and whether that id
+        was still in the history (when it is not, the caller backfills from
+        the database). Returns (None, [], True) when max_clients are open.
+        """
+        subscription = Subscription(statuses, department, employee_id, self.client_buffer, wakeup)
+
+        with self._lock:
+            if self.max_clients and len(self._subscriptions) >= self.max_clients:
+                self._stats['rejected'] += 1
+                return None, [], True
+
+            replay, complete = [], True
+            if last_event_id is not None:
+                position = next(
+                    (i for i in range(len(self._history) - 1, -1, -1) if self._history[i]['id'] == last_event_id),
+                    None
+                )
+                if position is None:
+                    complete = False
+                else:
+                    replay = [e for e in list(self._history)[position + 1:] if subscription.matches(e)]
+
+            self._subscriptions.add(subscription)
+            self._stats['subscriptions'] += 1
+
+        return subscription, replay, complete
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'clients': len(self._subscriptions),
+                'max_clients': self.max_clients,
+                'history': len(self._history),
+                'history_size': self._history.maxlen,
+                'client_buffer': self.client_buffer,
+            })
+        return stats
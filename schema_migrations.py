@@ -0,0 +1,197 @@
+"""
+Versioned schema migrations.
+
+Migrations live in migrations/ as NNNN_description.sql or
+NNNN_description.py (the latter defining upgrade(cursor)). Each one runs
+in its own transaction and is recorded in the schema_migrations table.
+A session advisory lock, taken before any DDL (including creating
+schema_migrations itself), makes concurrent callers wait for whoever is
+already migrating instead of running DDL twice.
+"""
+import hashlib
+import importlib.util
+import os
+import re
+import time
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+_FILENAME_PATTERN = re.compile(r'^(\d{4})_(\w+)\.(sql|py)$')
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Migration:
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+        with open(path, 'rb') as f:
+            self.checksum = hashlib.sha256(f.read()).hexdigest()
+
+    def apply(self, cursor):
+        if self.path.endswith('.sql'):
+            with open(self.path, encoding='utf-8') as f:
+                cursor.execute(f.read())
+            return
+
+        spec = importlib.util.spec_from_file_location(f'migration_{self.version:04d}', self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.upgrade(cursor)
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    migrations = {}
+
+    for filename in sorted(os.listdir(directory)):
+        match = _FILENAME_PATTERN.match(filename)
+        if not match:
+            continue
+
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f'duplicate migration version {version:04d}: {filename}')
+        migrations[version] = Migration(version, match.group(2), os.path.join(directory, filename))
+
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def current_version(cursor):
+    cursor.execute("SELECT to_regclass('schema_migrations') IS NOT NULL as exists")
+    if not cursor.fetchone()['exists']:
+        return 0
+
+    cursor.execute('SELECT COALESCE(MAX(version), 0) as version FROM schema_migrations')
+    return cursor.fetchone()['version']
+
+
+def applied_versions(cursor):
+    """Versions recorded in schema_migrations (empty before the first migrate)."""
+    cursor.execute("SELECT to_regclass('schema_migrations') IS NOT NULL as exists")
+    if not cursor.fetchone()['exists']:
+        return set()
+
+    cursor.execute('SELECT version FROM schema_migrations')
+    return {row['version'] for row in cursor.fetchall()}
+
+
+def pending_migrations(cursor, migrations=None):
+    """
+    Known migrations not recorded as applied. Compared by set rather than
+    against MAX(version), so a migration numbered below one already applied
+    (merged late from another branch) is not skipped.
+    """
+    migrations = discover_migrations() if migrations is None else migrations
+    applied = applied_versions(cursor)
+    return [m for m in migrations if m.version not in applied]
+
+
+def _applied(cursor):
+    cursor.execute('SELECT version, name, checksum, applied_at, execution_ms FROM schema_migrations')
+    return {row['version']: row for row in cursor.fetchall()}
+
+
+def migrate(database_url, directory=MIGRATIONS_DIR, target=None):
+    """
+    Apply pending migrations up to `target` (default: all) and return the
+    list of versions applied. When the schema is already current this is a
+    couple of SELECTs and takes no locks.
+    """
+    migrations = discover_migrations(directory)
+    if target is not None:
+        migrations = [m for m in migrations if m.version <= target]
+
+    conn = psycopg2.connect(database_url, cursor_factory=RealDictCursor, connect_timeout=10)
+    cursor = conn.cursor()
+
+    try:
+        pending = pending_migrations(cursor, migrations)
+        conn.rollback()
+        if not pending:
+            return []
+
+        # Lock before any DDL: on a fresh database every worker migrates at
+        # boot, and concurrent CREATE TABLE IF NOT EXISTS can still fail with
+        # a unique violation in pg_type.
+        cursor.execute("SELECT pg_advisory_lock(hashtext('schema_migrations'))")
+        try:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    checksum VARCHAR(64) NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    execution_ms INTEGER
+                )
+            ''')
+            applied = _applied(cursor)
+            conn.commit()
+            done = []
+
+            for migration in migrations:
+                if migration.version in applied:
+                    continue
+
+                started = time.monotonic()
+                try:
+                    migration.apply(cursor)
+                    cursor.execute('''
+                        INSERT INTO schema_migrations (version, name, checksum, execution_ms)
+                        VALUES (%s, %s, %s, %s)
+                    ''', (
+                        migration.version,
+                        migration.name,
+                        migration.checksum,
+                        int((time.monotonic() - started) * 1000)
+                    ))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    print(f"✗ Migration {migration.version:04d}_{migration.name} failed")
+                    raise
+
+                print(f"✓ Applied migration {migration.version:04d}_{migration.name}")
+                done.append(migration.version)
+
+            return done
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(hashtext('schema_migrations'))")
+            conn.commit()
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def migration_status(database_url, directory=MIGRATIONS_DIR):
+    """Every known migration with whether it was applied and checksum drift."""
+    migrations = discover_migrations(directory)
+
+    conn = psycopg2.connect(database_url, cursor_factory=RealDictCursor, connect_timeout=10)
+    cursor = conn.cursor()
+
+    try:
+        applied = _applied(cursor) if current_version(cursor) else {}
+    finally:
+        cursor.close()
+        conn.close()
+
+    status = []
+    for migration in migrations:
+        row = applied.get(migration.version)
+        status.append({
+            'version': migration.version,
+            'name': migration.name,
+            'applied': row is not None,
+            'applied_at': row['applied_at'] if row else None,
+            'modified': row is not None and row['checksum'] != migration.checksum,
+        })
+    return status
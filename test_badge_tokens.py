@@ -0,0 +1,133 @@
+import os
+import time
+import unittest
+
+# config.py refuses to load without it; nothing here uses it
+os.environ.setdefault('SECRET_KEY', 'test')
+
+from badge_tokens import BadgeError, BadgeSigner, parse_keys
+
+OLD_KEY = 'k2024:old-secret-0123456789abcdef'
+NEW_KEY = 'k2025:new-secret-0123456789abcdef'
+
+NOW = 1760000000
+
+
+class BadgeSignerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.signer = BadgeSigner(parse_keys(NEW_KEY), accept_legacy=True, clock_skew=300)
+
+    def assertRejected(self, signer, code, reason, at=NOW):
+        with self.assertRaises(BadgeError) as raised:
+            signer.read(code, at=at)
+        self.assertEqual(raised.exception.reason, reason)
+
+    def test_issue_and_read_round_trip(self):
+        token, expires_at = self.signer.issue('emp001', ttl_days=30, issued_at=NOW)
+
+        self.assertTrue(token.startswith('QR1:k2025:EMP001:'))
+        self.assertEqual(int(expires_at.timestamp()), NOW + 30 * 86400)
+        self.assertEqual(self.signer.read(token, at=NOW + 60), 'EMP001')
+
+    def test_forged_signature(self):
+        token, _ = self.signer.issue('EMP001', ttl_days=30, issued_at=NOW)
+        message, signature = token.rsplit(':', 1)
+        forged = signature[:-1] + ('A' if signature[-1] != 'A' else 'B')
+
+        self.assertRejected(self.signer, f'{message}:{forged}', 'INVALID_BADGE')
+
+    def test_changed_payload_keeps_no_signature(self):
+        token, _ = self.signer.issue('EMP001', ttl_days=30, issued_at=NOW)
+
+        self.assertRejected(self.signer, token.replace(':EMP001:', ':EMP002:'), 'INVALID_BADGE')
+        self.assertRejected(self.signer, token.replace(f':{NOW + 30 * 86400}:', f':{NOW + 60 * 86400}:'),
+                            'INVALID_BADGE')
+
+    def test_malformed_token(self):
+        self.assertRejected(self.signer, 'QR1:k2025:EMP001', 'INVALID_BADGE')
+        self.assertRejected(self.signer, 'QR1:k2025:EMP001:1:2:3:4', 'INVALID_BADGE')
+
+    def test_expired_token(self):
+        token, _ = self.signer.issue('EMP001', ttl_days=1, issued_at=NOW)
+
+        self.assertEqual(self.signer.read(token, at=NOW + 86400 - 1), 'EMP001')
+        self.assertRejected(self.signer, token, 'BADGE_EXPIRED', at=NOW + 86400)
+
+    def test_token_from_the_future(self):
+        token, _ = self.signer.issue('EMP001', ttl_days=1, issued_at=NOW + 3600)
+
+        self.assertRejected(self.signer, token, 'INVALID_BADGE')
+        self.assertEqual(self.signer.read(token, at=NOW + 3600 - 300), 'EMP001')
+
+    def test_unknown_key_id(self):
+        other = BadgeSigner(parse_keys(OLD_KEY))
+        token, _ = other.issue('EMP001', ttl_days=30, issued_at=NOW)
+
+        self.assertRejected(self.signer, token, 'UNKNOWN_BADGE_KEY')
+
+    def test_rotation(self):
+        old = BadgeSigner(parse_keys(OLD_KEY))
+        old_token, _ = old.issue('EMP001', ttl_days=30, issued_at=NOW)
+
+        rotated = BadgeSigner(parse_keys(f'{NEW_KEY},{OLD_KEY}'))
+        new_token, _ = rotated.issue('EMP001', ttl_days=30, issued_at=NOW)
+
+        self.assertEqual(rotated.active_key_id, 'k2025')
+        self.assertTrue(new_token.startswith('QR1:k2025:'))
+        self.assertEqual(rotated.read(old_token, at=NOW), 'EMP001')
+        self.assertEqual(rotated.read(new_token, at=NOW), 'EMP001')
+
+        # Dropping the old key revokes what it signed
+        self.assertRejected(self.signer, old_token, 'UNKNOWN_BADGE_KEY')
+
+    def test_same_key_id_with_another_secret(self):
+        impostor = BadgeSigner(parse_keys('k2025:some-other-secret-0123456789'))
+        token, _ = impostor.issue('EMP001', ttl_days=30, issued_at=NOW)
+
+        self.assertRejected(self.signer, token, 'INVALID_BADGE')
+
+    def test_legacy_ids(self):
+        self.assertEqual(self.signer.read(' emp001 ', at=NOW), 'EMP001')
+
+        for code in ('', 'EMP 001', 'https://example.com/x', "EMP001' OR 1=1", '-EMP', 'X' * 51):
+            with self.subTest(code=code):
+                self.assertRejected(self.signer, code, 'INVALID_BADGE')
+
+        strict = BadgeSigner(parse_keys(NEW_KEY), accept_legacy=False)
+        self.assertRejected(strict, 'EMP001', 'LEGACY_BADGE_DISABLED')
+        token, _ = strict.issue('EMP001', ttl_days=30, issued_at=NOW)
+        self.assertEqual(strict.read(token, at=NOW), 'EMP001')
+
+    def test_issue_refuses_unusable_ids(self):
+        for employee_id in ('', 'EMP:001', 'X' * 51):
+            with self.assertRaises(ValueError):
+                self.signer.issue(employee_id, ttl_days=30, issued_at=NOW)
+
+    def test_issue_without_keys(self):
+        with self.assertRaises(ValueError):
+            BadgeSigner({}).issue('EMP001', ttl_days=30)
+
+    def test_read_defaults_to_now(self):
+        token, _ = self.signer.issue('EMP001', ttl_days=1)
+        self.assertEqual(self.signer.read(token), 'EMP001')
+
+        expired, _ = self.signer.issue('EMP001', ttl_days=1, issued_at=time.time() - 2 * 86400)
+        self.assertRejected(self.signer, expired, 'BADGE_EXPIRED', at=None)
+
+
+class ParseKeysTest(unittest.TestCase):
+
+    def test_order_is_kept(self):
+        keys = parse_keys(f' {NEW_KEY} , {OLD_KEY} ,')
+        self.assertEqual(list(keys), ['k2025', 'k2024'])
+        self.assertEqual(keys['k2024'], b'old-secret-0123456789abcdef')
+
+    def test_rejects_bad_entries(self):
+        for value in ('no-separator-0123456789abcdef', 'k1:short', 'bad id!:0123456789abcdef0'):
+            with self.assertRaises(ValueError):
+                parse_keys(value)
+
+
+if __name__ == '__main__':
+    unittest.main()
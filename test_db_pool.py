@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+import psycopg2
+import psycopg2.extensions
+
+from db_pool import ConnectionPool, PoolTimeoutError
+from psycopg2.pool import PoolError
+
+
+class FakeCursor:
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query):
+        if self.conn.broken:
+            raise psycopg2.OperationalError('server closed the connection unexpectedly')
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Just enough of a psycopg2 connection for ConnectionPool."""
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.in_transaction = False
+
+    def get_transaction_status(self):
+        if self.in_transaction:
+            return psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        return psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def rollback(self):
+        if self.broken:
+            raise psycopg2.OperationalError('server closed the connection unexpectedly')
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = 1
+
+
+class ConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.connections = []
+
+        def connect(*args, **kwargs):
+            conn = FakeConnection()
+            self.connections.append(conn)
+            return conn
+
+        patcher = mock.patch('db_pool.psycopg2.connect', side_effect=connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def pool(self, **kwargs):
+        pool = ConnectionPool('dbname=test', **kwargs)
+        self.addCleanup(pool.closeall)
+        return pool
+
+    def test_opens_min_size_up_front(self):
+        pool = self.pool(min_size=3, max_size=5)
+
+        self.assertEqual(len(self.connections), 3)
+        self.assertEqual(pool.stats()['idle'], 3)
+
+    def test_close_returns_the_connection(self):
+        pool = self.pool(min_size=1, max_size=1)
+
+        conn = pool.getconn()
+        raw = conn.raw_connection
+        conn.close()
+
+        self.assertFalse(raw.closed)
+        self.assertIs(pool.getconn().raw_connection, raw)
+        with self.assertRaises(psycopg2.InterfaceError):
+            conn.cursor()
+
+    def test_rolls_back_an_open_transaction_on_return(self):
+        pool = self.pool(min_size=1, max_size=1)
+
+        conn = pool.getconn()
+        conn.raw_connection.in_transaction = True
+        conn.close()
+
+        self.assertFalse(pool.getconn().raw_connection.in_transaction)
+
+    def test_getconn_times_out_when_exhausted(self):
+        pool = self.pool(min_size=0, max_size=1, timeout=0.1)
+        held = pool.getconn()
+
+        started = time.monotonic()
+        with self.assertRaises(PoolTimeoutError):
+            pool.getconn()
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+        self.assertEqual(pool.stats()['checkout_timeouts'], 1)
+        held.close()
+
+    def test_waiter_gets_a_returned_connection(self):
+        pool = self.pool(min_size=0, max_size=1, timeout=2)
+        held = pool.getconn()
+        threading.Timer(0.05, held.close).start()
+
+        conn = pool.getconn()
+
+        self.assertIs(conn.raw_connection, self.connections[0])
+        self.assertEqual(len(self.connections), 1)
+
+    def test_recycles_after_max_uses_and_keeps_min_size(self):
+        pool = self.pool(min_size=1, max_size=2, max_uses=2)
+        first = self.connections[0]
+
+        pool.getconn().close()
+        pool.getconn().close()
+
+        self.assertTrue(first.closed)
+        stats = pool.stats()
+        self.assertEqual(stats['recycled_max_uses'], 1)
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['idle'], 1)
+        self.assertIsNot(pool.getconn().raw_connection, first)
+
+    def test_recycles_after_max_lifetime(self):
+        pool = self.pool(min_size=1, max_size=1, max_lifetime=0.05)
+        first = self.connections[0]
+        time.sleep(0.06)
+
+        conn = pool.getconn()
+
+        self.assertIsNot(conn.raw_connection, first)
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.stats()['recycled_max_lifetime'], 1)
+
+    def test_broken_connection_is_discarded_and_replaced(self):
+        pool = self.pool(min_size=2, max_size=4)
+
+        conn = pool.getconn()
+        conn.raw_connection.broken = True
+        conn.raw_connection.in_transaction = True
+        conn.close()
+
+        stats = pool.stats()
+        self.assertEqual(stats['discarded_broken'], 1)
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['idle'], 2)
+
+    def test_failed_health_check_opens_a_new_connection(self):
+        pool = self.pool(min_size=1, max_size=1, health_check_interval=0)
+        self.connections[0].broken = True
+
+        conn = pool.getconn()
+
+        self.assertIsNot(conn.raw_connection, self.connections[0])
+        self.assertEqual(pool.stats()['health_check_failures'], 1)
+
+    def test_fork_starts_empty_without_touching_parent_connections(self):
+        pool = self.pool(min_size=2, max_size=4)
+        parent = list(self.connections)
+        held = pool.getconn()
+
+        with mock.patch('db_pool.os.getpid', return_value=os.getpid() + 1):
+            conn = pool.getconn()
+            self.assertNotIn(conn.raw_connection, parent)
+
+            # A connection borrowed before the fork is left alone
+            held.close()
+            self.assertFalse(any(c.closed for c in parent))
+
+            conn.close()
+            stats = pool.stats()
+
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['idle'], 2)
+        self.assertFalse(any(c.closed for c in parent))
+
+    def test_closeall(self):
+        pool = self.pool(min_size=2, max_size=2)
+        conn = pool.getconn()
+
+        pool.closeall()
+        with self.assertRaises(PoolError):
+            pool.getconn()
+
+        conn.close()
+        self.assertTrue(all(c.closed for c in self.connections))
+        self.assertEqual(pool.stats()['size'], 0)
+
+    def test_rejects_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool('dbname=test', min_size=3, max_size=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
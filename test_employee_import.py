@@ -0,0 +1,120 @@
+import csv
+import io
+import unittest
+
+from employee_import import EmployeeCopySource, normalize_employee, read_csv, read_json
+
+
+def copy_rows(source):
+    """Read the source the way COPY does and parse the CSV it produced."""
+    data = io.BufferedReader(source, buffer_size=7).read()
+    return list(csv.reader(io.StringIO(data.decode('utf-8'))))
+
+
+class NormalizeEmployeeTest(unittest.TestCase):
+
+    def test_cleans_up_fields(self):
+        row = {'employee_id': ' emp-001 ', 'name': ' Budi ', 'department': ' IT', 'is_active': 'No'}
+
+        self.assertEqual(normalize_employee(row), ('EMP-001', 'Budi', 'IT', '', False))
+
+    def test_is_active(self):
+        for value, expected in ((None, None), ('', None), (True, True), ('Y', True),
+                                ('1', True), ('f', False), (0, False)):
+            with self.subTest(value=value):
+                row = {'employee_id': 'EMP001', 'name': 'Budi', 'is_active': value}
+                self.assertIs(normalize_employee(row)[4], expected)
+
+    def test_rejects(self):
+        cases = {
+            'row must be an object': ['EMP001'],
+            'employee_id is required': {'employee_id': '  ', 'name': 'Budi'},
+            "invalid employee_id 'EMP 001'": {'employee_id': 'emp 001', 'name': 'Budi'},
+            "invalid employee_id '-EMP'": {'employee_id': '-emp', 'name': 'Budi'},
+            'name is required': {'employee_id': 'EMP001'},
+            'employee_id longer than 50 characters': {'employee_id': 'E' * 51, 'name': 'Budi'},
+            'department longer than 100 characters': {'employee_id': 'EMP001', 'name': 'Budi',
+                                                      'department': 'D' * 101},
+            "is_active must be true or false, got 'maybe'": {'employee_id': 'EMP001', 'name': 'Budi',
+                                                              'is_active': 'maybe'},
+        }
+        for message, row in cases.items():
+            with self.subTest(message=message):
+                with self.assertRaises(ValueError) as raised:
+                    normalize_employee(row)
+                self.assertEqual(str(raised.exception), message)
+
+
+class EmployeeCopySourceTest(unittest.TestCase):
+
+    def test_writes_accepted_rows_and_collects_rejects(self):
+        source = EmployeeCopySource(read_json([
+            {'employee_id': 'emp001', 'name': 'Budi, S.Kom', 'is_active': 'true'},
+            {'employee_id': 'EMP002'},
+            {'employee_id': 'EMP001', 'name': 'Budi again'},
+            'not an object',
+            {'employee_id': 'EMP003', 'name': 'Sari "Ayu"', 'position': 'Staff'},
+        ]))
+
+        rows = copy_rows(source)
+
+        self.assertEqual(rows, [
+            ['1', 'EMP001', 'Budi, S.Kom', '', '', 'True'],
+            ['5', 'EMP003', 'Sari "Ayu"', '', 'Staff', ''],
+        ])
+        self.assertEqual(source.accepted, 2)
+        self.assertEqual(source.rejects, [
+            {'row': 2, 'employee_id': 'EMP002', 'reason': 'name is required'},
+            {'row': 3, 'employee_id': 'EMP001', 'reason': 'duplicate employee_id in this batch'},
+            {'row': 4, 'employee_id': None, 'reason': 'row must be an object'},
+        ])
+        self.assertIsNone(source.error)
+
+    def test_streams_large_input_in_chunks(self):
+        source = EmployeeCopySource(
+            (n, {'employee_id': f'EMP{n:06d}', 'name': 'N' * 200}) for n in range(1, 2001)
+        )
+
+        first = source.read(10)
+        rest = source.read()
+
+        rows = list(csv.reader(io.StringIO((first + rest).decode('utf-8'))))
+        self.assertEqual(len(rows), 2000)
+        self.assertEqual(rows[-1][:2], ['2000', 'EMP002000'])
+        self.assertEqual(source.read(), b'')
+
+    def test_records_input_errors(self):
+        def rows():
+            yield 1, {'employee_id': 'EMP001', 'name': 'Budi'}
+            raise csv.Error('unexpected end of data')
+
+        source = EmployeeCopySource(rows())
+
+        with self.assertRaises(csv.Error):
+            source.read()
+        self.assertIsInstance(source.error, csv.Error)
+
+
+class ReadCsvTest(unittest.TestCase):
+
+    def test_reads_rows_with_line_numbers(self):
+        data = '\ufeffEmployee_ID, Name ,department\nemp001,Budi,IT\n"emp002","Sari\nAyu",HR\n'
+
+        rows = list(read_csv(io.BytesIO(data.encode('utf-8'))))
+
+        self.assertEqual(rows[0], (2, {'employee_id': 'emp001', 'name': 'Budi', 'department': 'IT'}))
+        self.assertEqual(rows[1][1]['name'], 'Sari\nAyu')
+
+    def test_requires_employee_id_and_name_columns(self):
+        with self.assertRaises(ValueError):
+            read_csv(io.BytesIO(b'id,name\n1,Budi\n'))
+        with self.assertRaises(ValueError):
+            read_csv(io.BytesIO(b''))
+
+    def test_read_json_requires_an_array(self):
+        with self.assertRaises(ValueError):
+            read_json({'employee_id': 'EMP001'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import base64
+import os
+import re
+import unittest
+
+# config.py refuses to load without it; nothing here uses it
+os.environ.setdefault('SECRET_KEY', 'test')
+
+from database import build_employee_page, decode_employee_cursor, encode_employee_cursor
+from queries import _like_escape, employee_search_query
+
+
+def like(value, pattern):
+    """PostgreSQL LIKE with the default backslash escape."""
+    regex = ''
+    tokens = iter(pattern)
+    for char in tokens:
+        if char == '\\':
+            regex += re.escape(next(tokens))
+        elif char == '%':
+            regex += '.*'
+        elif char == '_':
+            regex += '.'
+        else:
+            regex += re.escape(char)
+    return re.fullmatch(regex, value, re.DOTALL) is not None
+
+
+class LikeEscapeTest(unittest.TestCase):
+
+    def test_wildcards_match_literally(self):
+        for text in ('100%', 'EMP_01', 'a\\b', '%_\\', 'plain'):
+            with self.subTest(text=text):
+                pattern = _like_escape(text) + '%'
+                self.assertTrue(like(text + ' and more', pattern))
+
+        self.assertFalse(like('EMPX01', _like_escape('EMP_01') + '%'))
+        self.assertFalse(like('1000', _like_escape('100%')))
+        self.assertFalse(like('ab', _like_escape('a\\b')))
+
+
+class EmployeeSearchQueryTest(unittest.TestCase):
+
+    def test_defaults(self):
+        query, params = employee_search_query(50)
+
+        self.assertTrue(query.startswith('SELECT id, employee_id, name, department, position, '
+                                         'is_active, created_at, updated_at FROM employees'))
+        self.assertIn('AND is_active = %s', query)
+        self.assertTrue(query.endswith('ORDER BY name, employee_id LIMIT %s'))
+        self.assertEqual(params, [True, 51])
+
+    def test_adds_the_ordering_columns_once(self):
+        query, _ = employee_search_query(10, fields=('employee_id', 'department'))
+
+        self.assertIn('SELECT employee_id, department, name FROM employees', query)
+
+    def test_prefix_search(self):
+        query, params = employee_search_query(10, q='bu_di%', is_active=None)
+
+        self.assertNotIn('is_active = %s', query)
+        self.assertIn('(employee_id LIKE %s OR lower(name) LIKE %s)', query)
+        self.assertEqual(params, ['BU\\_DI\\%%', 'bu\\_di\\%%', 11])
+
+    def test_substring_search(self):
+        query, params = employee_search_query(10, q='a_b', match='substring', department='IT',
+                                              position='Staff', is_active=False)
+
+        self.assertIn('(employee_id ILIKE %s OR name ILIKE %s)', query)
+        self.assertEqual(params, [False, 'IT', 'Staff', '%a\\_b%', '%a\\_b%', 11])
+
+    def test_keyset(self):
+        query, params = employee_search_query(10, after_name='Budi', after_id='EMP001')
+
+        self.assertIn('AND (name, employee_id) > (%s, %s)', query)
+        self.assertEqual(params[-3:], ['Budi', 'EMP001', 11])
+
+
+class EmployeeCursorTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        token = encode_employee_cursor('Siti Nur\'aini, S.E.', 'EMP-001')
+
+        self.assertNotIn('=', token)
+        self.assertEqual(decode_employee_cursor(token), ('Siti Nur\'aini, S.E.', 'EMP-001'))
+
+    def test_rejects_bad_tokens(self):
+        def encode(raw):
+            return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+        for token in ('', '!!!', encode('["Budi"]'), encode('["Budi",1]'),
+                      encode('[null,"EMP001"]'), encode('"Budi"')):
+            with self.subTest(token=token), self.assertRaises(ValueError):
+                decode_employee_cursor(token)
+
+
+class BuildEmployeePageTest(unittest.TestCase):
+
+    rows = [{'employee_id': f'EMP00{n}', 'name': f'Name {n}', 'department': 'IT'} for n in range(1, 5)]
+
+    def test_more_rows_give_a_cursor_after_the_last_returned(self):
+        page = build_employee_page(self.rows, 3, ('employee_id', 'department'))
+
+        self.assertEqual(page['employees'], [{'employee_id': f'EMP00{n}', 'department': 'IT'}
+                                             for n in range(1, 4)])
+        self.assertEqual(decode_employee_cursor(page['next_cursor']), ('Name 3', 'EMP003'))
+
+    def test_last_page_has_no_cursor(self):
+        page = build_employee_page(self.rows, 4, ('name',))
+
+        self.assertEqual(len(page['employees']), 4)
+        self.assertIsNone(page['next_cursor'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import unittest
+from unittest import mock
+
+# config.py refuses to load without it; nothing here uses it
+os.environ.setdefault('SECRET_KEY', 'test')
+
+import api_common as api
+from config import Config
+
+
+class MakeEtagTest(unittest.TestCase):
+
+    def test_strong_and_stable(self):
+        etag = api.make_etag('employees', True, 42, '2025-03-01')
+
+        self.assertRegex(etag, r'^"[0-9a-f]{24}"$')
+        self.assertEqual(etag, api.make_etag('employees', True, 42, '2025-03-01'))
+
+    def test_changes_with_any_part(self):
+        etags = {
+            api.make_etag('employees', True, 42),
+            api.make_etag('employees', False, 42),
+            api.make_etag('employees', True, 43),
+            api.make_etag('employees', True, '42'),
+            api.make_etag('employees_search', True, 42),
+        }
+
+        self.assertEqual(len(etags), 5)
+
+
+class EtagMatchesTest(unittest.TestCase):
+
+    etag = '"abc123"'
+
+    def test_matches(self):
+        for header in ('"abc123"', 'W/"abc123"', ' "zzz", W/"abc123" ', '*'):
+            with self.subTest(header=header):
+                self.assertTrue(api.etag_matches(header, self.etag))
+
+    def test_does_not_match(self):
+        for header in (None, '', '"abc124"', 'abc123', '"abc123', '"zzz", "yyy"'):
+            with self.subTest(header=header):
+                self.assertFalse(api.etag_matches(header, self.etag))
+
+
+class CacheHeadersTest(unittest.TestCase):
+
+    def test_revalidate_only(self):
+        with mock.patch.object(Config, 'HTTP_CACHE_SHARED_MAX_AGE', 0):
+            headers = api.cache_headers('"abc"')
+
+        self.assertEqual(headers, {'ETag': '"abc"', 'Cache-Control': 'no-cache'})
+
+    def test_shared_cache(self):
+        with mock.patch.object(Config, 'HTTP_CACHE_SHARED_MAX_AGE', 30):
+            headers = api.cache_headers('"abc"')
+
+        self.assertEqual(headers['Cache-Control'], 'public, max-age=0, s-maxage=30')
+
+
+class RouteEtagTest(unittest.TestCase):
+
+    def test_statistics_etag_depends_on_the_query(self):
+        day = api.parse_statistics_args({'start_date': '2025-03-01'})
+        hour = api.parse_statistics_args({'start_date': '2025-03-01', 'granularity': 'hour'})
+        split = api.parse_statistics_args({'start_date': '2025-03-01', 'by_department': 'True'})
+
+        etags = {api.statistics_etag('10-2', day), api.statistics_etag('10-2', hour),
+                 api.statistics_etag('10-2', split), api.statistics_etag('11-2', day)}
+
+        self.assertEqual(len(etags), 4)
+        self.assertEqual(api.statistics_etag('10-2', day),
+                         api.statistics_etag('10-2', dict(reversed(list(day.items())))))
+
+    def test_employees_etag_depends_on_the_response_shape(self):
+        version = (42, '2025-03-01T08:00:00')
+
+        self.assertNotEqual(api.employees_etag(version, True), api.employees_etag(version, False))
+        with mock.patch.object(Config, 'JSON_AGG_ENABLED', not Config.JSON_AGG_ENABLED):
+            other_encoder = api.employees_etag(version, True)
+        self.assertNotEqual(api.employees_etag(version, True), other_encoder)
+
+    def test_employee_summary_etag_follows_the_refresh(self):
+        self.assertNotEqual(api.employee_summary_etag({'refreshed_at': '2025-03-01T08:00:00'}),
+                            api.employee_summary_etag({'refreshed_at': '2025-03-01T09:00:00'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import base64
+import os
+import unittest
+from datetime import datetime, timedelta
+
+# config.py refuses to load without it; nothing here uses it
+os.environ.setdefault('SECRET_KEY', 'test')
+
+import queries
+from database import build_log_page, decode_log_cursor, encode_log_cursor
+
+START = datetime(2025, 3, 1, 8, 0, 0)
+
+
+def make_rows(count):
+    # Pairs of rows share a scan_time so the id breaks the tie
+    return [{'id': i, 'scan_time': START + timedelta(seconds=i // 2)} for i in range(1, count + 1)]
+
+
+def fetch(rows, limit, direction, cursor):
+    """What scan_logs_page_query() returns from the database for `rows`."""
+    after_time = after_id = None
+    if cursor:
+        direction, after_time, after_id = decode_log_cursor(cursor)
+    key = lambda row: (row['scan_time'], row['id'])
+    if direction == 'next':
+        found = sorted(rows, key=key, reverse=True)
+        if after_id is not None:
+            found = [row for row in found if key(row) < (after_time, after_id)]
+    else:
+        found = [row for row in sorted(rows, key=key) if key(row) > (after_time, after_id)]
+    return direction, [dict(row) for row in found[:limit + 1]]
+
+
+def page(rows, limit, cursor=None):
+    direction, fetched = fetch(rows, limit, 'next', cursor)
+    return build_log_page(fetched, limit, direction, cursor)
+
+
+def ids(result):
+    return [row['id'] for row in result['logs']]
+
+
+class LogCursorTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        scan_time = datetime(2025, 3, 1, 8, 0, 0, 123456)
+        token = encode_log_cursor('prev', scan_time, 42)
+
+        self.assertNotIn('=', token)
+        self.assertEqual(decode_log_cursor(token), ('prev', scan_time, 42))
+
+    def test_rejects_bad_tokens(self):
+        def encode(raw):
+            return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+        for token in ('', 'not-a-cursor', encode('[]'), encode('{"a":1}'),
+                      encode('["up","2025-03-01T08:00:00",1]'),
+                      encode('["next","2025-03-01T08:00:00","1"]'),
+                      encode('["next","yesterday",1]'),
+                      base64.urlsafe_b64encode(b'\xff\xfe').decode()):
+            with self.subTest(token=token), self.assertRaises(ValueError):
+                decode_log_cursor(token)
+
+
+class BuildLogPageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = make_rows(7)
+
+    def test_first_page(self):
+        result = page(self.rows, 3)
+
+        self.assertEqual(ids(result), [7, 6, 5])
+        self.assertIsNotNone(result['next_cursor'])
+        self.assertIsNone(result['prev_cursor'])
+
+    def test_walks_forward_and_back(self):
+        first = page(self.rows, 3)
+        second = page(self.rows, 3, first['next_cursor'])
+        last = page(self.rows, 3, second['next_cursor'])
+
+        self.assertEqual(ids(second), [4, 3, 2])
+        self.assertEqual(ids(last), [1])
+        self.assertIsNone(last['next_cursor'])
+        self.assertIsNotNone(last['prev_cursor'])
+
+        back = page(self.rows, 3, last['prev_cursor'])
+        self.assertEqual(ids(back), [4, 3, 2])
+        self.assertIsNotNone(back['next_cursor'])
+        self.assertIsNotNone(back['prev_cursor'])
+
+        start = page(self.rows, 3, back['prev_cursor'])
+        self.assertEqual(ids(start), [7, 6, 5])
+        self.assertIsNone(start['prev_cursor'])
+        self.assertEqual(start['next_cursor'], first['next_cursor'])
+
+    def test_exact_multiple_has_no_next_page(self):
+        result = page(make_rows(3), 3)
+
+        self.assertEqual(ids(result), [3, 2, 1])
+        self.assertIsNone(result['next_cursor'])
+
+    def test_empty(self):
+        result = page([], 3)
+
+        self.assertEqual(result, {'logs': [], 'next_cursor': None, 'prev_cursor': None})
+
+    def test_rows_added_between_pages_do_not_shift_later_pages(self):
+        first = page(self.rows, 3)
+        self.rows.append({'id': 8, 'scan_time': START + timedelta(seconds=10)})
+
+        self.assertEqual(ids(page(self.rows, 3, first['next_cursor'])), [4, 3, 2])
+
+
+class ScanLogsPageQueryTest(unittest.TestCase):
+
+    def test_first_page_has_no_keyset_condition(self):
+        query, params = queries.scan_logs_page_query(50)
+
+        self.assertNotIn('(sl.scan_time, sl.id) <', query)
+        self.assertIn('ORDER BY sl.scan_time DESC, sl.id DESC LIMIT %s', query)
+        self.assertEqual(params, [51])
+
+    def test_prev_page_is_fetched_ascending(self):
+        query, params = queries.scan_logs_page_query(50, 'prev', START, 9, employee_id='EMP001')
+
+        self.assertIn('(sl.scan_time, sl.id) > (%s, %s)', query)
+        self.assertIn('ORDER BY sl.scan_time ASC, sl.id ASC', query)
+        self.assertEqual(params[-3:], [START, 9, 51])
+        self.assertIn('EMP001', params)
+
+
+if __name__ == '__main__':
+    unittest.main()
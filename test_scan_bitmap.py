@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from scan_bitmap import ScannedTodayBitmap
+
+DAY = date(2025, 3, 1).toordinal()
+
+
+class ScannedTodayBitmapTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'scanned-today')
+
+    def bitmap(self, today=DAY, **kwargs):
+        bitmap = ScannedTodayBitmap(self.path, capacity=64, **kwargs)
+        self.addCleanup(bitmap.close)
+        if today is not None:
+            patcher = mock.patch.object(bitmap, '_today', return_value=today)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return bitmap
+
+    def test_add_and_contains(self):
+        bitmap = self.bitmap()
+
+        bitmap.add_many([0, 9, 63, 64, -1, None], DAY)
+
+        self.assertTrue(bitmap.contains(0))
+        self.assertTrue(bitmap.contains(9))
+        self.assertTrue(bitmap.contains(63))
+        self.assertFalse(bitmap.contains(8))
+        self.assertFalse(bitmap.contains(64))
+        self.assertFalse(bitmap.contains(None))
+        self.assertEqual(bitmap.stats()['population'], 3)
+
+    def test_ignores_a_day_other_than_today(self):
+        bitmap = self.bitmap()
+
+        bitmap.add(5, DAY - 1)
+        bitmap.add(6, DAY + 1)
+
+        self.assertFalse(bitmap.contains(5))
+        self.assertFalse(bitmap.contains(6))
+        self.assertEqual(bitmap.stats()['adds'], 0)
+
+    def test_reads_empty_after_the_day_changes(self):
+        bitmap = self.bitmap()
+        bitmap.add(5, DAY)
+
+        bitmap._today.return_value = DAY + 1
+
+        self.assertFalse(bitmap.contains(5))
+        stats = bitmap.stats()
+        self.assertFalse(stats['current'])
+        self.assertEqual(stats['population'], 0)
+        self.assertEqual(stats['day'], '2025-03-01')
+
+    def test_first_add_of_the_new_day_clears_yesterday(self):
+        bitmap = self.bitmap()
+        bitmap.add_many([5, 6], DAY)
+        rollovers = bitmap.stats()['rollovers']
+
+        bitmap._today.return_value = DAY + 1
+        bitmap.add(7, DAY + 1)
+
+        self.assertFalse(bitmap.contains(5))
+        self.assertFalse(bitmap.contains(6))
+        self.assertTrue(bitmap.contains(7))
+        stats = bitmap.stats()
+        self.assertEqual(stats['rollovers'], rollovers + 1)
+        self.assertEqual(stats['day'], '2025-03-02')
+        self.assertEqual(stats['population'], 1)
+
+    def test_shared_between_instances(self):
+        writer = self.bitmap()
+        reader = self.bitmap()
+
+        writer.add(12, DAY)
+
+        self.assertTrue(reader.contains(12))
+        writer._today.return_value = reader._today.return_value = DAY + 1
+        reader.add(13, DAY + 1)
+        self.assertFalse(writer.contains(12))
+        self.assertTrue(writer.contains(13))
+
+    def test_today_follows_the_database_timezone(self):
+        # 26 hours apart, so the two zones never share a date
+        ahead = self.bitmap(today=None, timezone='Pacific/Kiritimati')
+        behind = self.bitmap(today=None, timezone='Etc/GMT+12')
+
+        ahead_day = datetime.now(ZoneInfo('Pacific/Kiritimati')).date().toordinal()
+        ahead.add(3, ahead_day)
+
+        self.assertTrue(ahead.contains(3))
+        self.assertFalse(behind.contains(3))
+        self.assertEqual(ahead.stats()['timezone'], 'Pacific/Kiritimati')
+
+    def test_rejects_a_capacity_not_a_multiple_of_8(self):
+        with self.assertRaises(ValueError):
+            ScannedTodayBitmap(self.path, capacity=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+
+from scan_debounce import ScanDebouncer
+
+
+class ScanDebouncerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('scan_debounce.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeat_within_the_window_gets_the_first_answer(self):
+        debouncer = ScanDebouncer(window=2.0)
+        scan = {'status': 'SUCCESS'}
+
+        self.assertIsNone(debouncer.get('EMP001', 'gate-1'))
+        self.assertIs(debouncer.remember('EMP001', 'gate-1', scan), scan)
+        self.now += 1.9
+
+        self.assertIs(debouncer.get('EMP001', 'gate-1'), scan)
+        stats = debouncer.stats()
+        self.assertEqual(stats['suppressed'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_window_is_not_extended_by_repeats(self):
+        debouncer = ScanDebouncer(window=2.0)
+        debouncer.remember('EMP001', 'gate-1', {'status': 'SUCCESS'})
+
+        for _ in range(3):
+            self.now += 0.5
+            self.assertIsNotNone(debouncer.get('EMP001', 'gate-1'))
+        self.now += 0.5
+
+        self.assertIsNone(debouncer.get('EMP001', 'gate-1'))
+
+    def test_after_the_window_a_new_decision_is_stored(self):
+        debouncer = ScanDebouncer(window=2.0)
+        debouncer.remember('EMP001', 'gate-1', {'status': 'SUCCESS'})
+        self.now += 2.0
+
+        again = {'status': 'ALREADY_SCANNED'}
+        self.assertIs(debouncer.remember('EMP001', 'gate-1', again), again)
+        self.assertIs(debouncer.get('EMP001', 'gate-1'), again)
+
+    def test_first_decision_wins_a_race(self):
+        debouncer = ScanDebouncer(window=2.0)
+        first = {'status': 'SUCCESS'}
+
+        debouncer.remember('EMP001', 'gate-1', first)
+
+        self.assertIs(debouncer.remember('EMP001', 'gate-1', {'status': 'ALREADY_SCANNED'}), first)
+
+    def test_sources_are_separate(self):
+        debouncer = ScanDebouncer(window=2.0)
+        debouncer.remember('EMP001', 'gate-1', {'status': 'SUCCESS'})
+
+        self.assertIsNone(debouncer.get('EMP001', 'gate-2'))
+        self.assertIsNone(debouncer.get('EMP002', 'gate-1'))
+
+    def test_expired_entries_are_pruned(self):
+        debouncer = ScanDebouncer(window=2.0)
+        debouncer.remember('EMP001', 'gate-1', {})
+        self.now += 1.0
+        debouncer.remember('EMP002', 'gate-1', {})
+        self.now += 1.5
+
+        debouncer.remember('EMP003', 'gate-1', {})
+
+        stats = debouncer.stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['evictions'], 0)
+
+    def test_oldest_entry_is_evicted_when_full(self):
+        debouncer = ScanDebouncer(window=2.0, max_size=2)
+        for employee_id in ('EMP001', 'EMP002', 'EMP003'):
+            debouncer.remember(employee_id, 'gate-1', {'employee_id': employee_id})
+
+        self.assertIsNone(debouncer.get('EMP001', 'gate-1'))
+        self.assertIsNotNone(debouncer.get('EMP002', 'gate-1'))
+        self.assertIsNotNone(debouncer.get('EMP003', 'gate-1'))
+        self.assertEqual(debouncer.stats()['evictions'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import threading
+import unittest
+from unittest import mock
+
+import psycopg2
+
+from scan_log_writer import ScanLogWriter
+
+
+class FakeDatabase:
+    """Records the batches written through execute_values."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = 0
+        self.lock = threading.Lock()
+
+    def get_connection(self):
+        return FakeConnection(self)
+
+    def execute_values(self, cursor, query, rows, template=None, page_size=None):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                raise psycopg2.OperationalError('connection lost')
+            self.batches.append(list(rows))
+
+
+class FakeConnection:
+
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return mock.Mock()
+
+    def commit(self):
+        self.db.commits += 1
+
+    def rollback(self):
+        self.db.rollbacks += 1
+
+    def close(self):
+        self.db.closed += 1
+
+
+class ScanLogWriterTest(unittest.TestCase):
+
+    def writer(self, db, **kwargs):
+        patcher = mock.patch('scan_log_writer.execute_values', side_effect=db.execute_values)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # No real backoff between retries
+        sleep = mock.patch('scan_log_writer.time.sleep')
+        sleep.start()
+        self.addCleanup(sleep.stop)
+
+        writer = ScanLogWriter(db.get_connection, **kwargs)
+        self.addCleanup(writer.close)
+        return writer
+
+    def test_close_drains_the_queue(self):
+        db = FakeDatabase()
+        writer = self.writer(db, batch_size=3, flush_interval=60)
+
+        for i in range(7):
+            self.assertTrue(writer.submit(f'EMP{i:03d}', 'SUCCESS'))
+        writer.close()
+
+        self.assertEqual([len(batch) for batch in db.batches], [3, 3, 1])
+        written = [row[0] for batch in db.batches for row in batch]
+        self.assertEqual(written, [f'EMP{i:03d}' for i in range(7)])
+        stats = writer.stats()
+        self.assertEqual(stats['written'], 7)
+        self.assertEqual(stats['batches'], 3)
+        self.assertFalse(stats['running'])
+        self.assertEqual(db.closed, 3)
+
+    def test_flushes_a_partial_batch_after_the_interval(self):
+        db = FakeDatabase()
+        writer = self.writer(db, batch_size=100, flush_interval=0.05)
+
+        writer.submit('EMP001', 'SUCCESS', ip_address='10.0.0.1')
+        for _ in range(100):
+            if db.batches:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual(len(db.batches), 1)
+        self.assertEqual(db.batches[0][0][:3], ('EMP001', 'SUCCESS', '10.0.0.1'))
+        self.assertTrue(writer.stats()['running'])
+
+    def test_retries_a_failed_batch(self):
+        db = FakeDatabase(failures=2)
+        writer = self.writer(db, batch_size=10, flush_interval=60, max_retries=3)
+
+        writer.submit('EMP001', 'SUCCESS')
+        writer.close()
+
+        self.assertEqual(len(db.batches), 1)
+        self.assertEqual(db.rollbacks, 2)
+        stats = writer.stats()
+        self.assertEqual(stats['flush_errors'], 2)
+        self.assertEqual(stats['written'], 1)
+        self.assertEqual(stats['dropped'], 0)
+
+    def test_drops_a_batch_after_max_retries(self):
+        db = FakeDatabase(failures=3)
+        writer = self.writer(db, batch_size=10, flush_interval=60, max_retries=3)
+
+        writer.submit('EMP001', 'SUCCESS')
+        writer.submit('EMP002', 'SUCCESS')
+        writer.close()
+
+        self.assertEqual(db.batches, [])
+        stats = writer.stats()
+        self.assertEqual(stats['dropped'], 2)
+        self.assertEqual(stats['written'], 0)
+        # Every attempt gives its connection back
+        self.assertEqual(db.closed, 3)
+
+    def test_submit_returns_false_when_the_queue_stays_full(self):
+        db = FakeDatabase()
+        release = threading.Event()
+        get_connection = db.get_connection
+
+        def blocked_connection():
+            release.wait(5)
+            return get_connection()
+
+        db.get_connection = blocked_connection
+        writer = self.writer(db, max_queue_size=1, batch_size=1, flush_interval=60,
+                             enqueue_timeout=0.01)
+
+        # The writer thread takes the first row and blocks on the connection
+        self.assertTrue(writer.submit('EMP001', 'SUCCESS'))
+        for _ in range(100):
+            if writer.stats()['queue_depth'] == 0:
+                break
+            threading.Event().wait(0.01)
+        self.assertTrue(writer.submit('EMP002', 'SUCCESS'))
+        self.assertFalse(writer.submit('EMP003', 'SUCCESS'))
+
+        release.set()
+        writer.close()
+        self.assertEqual(writer.stats()['queue_full'], 1)
+        self.assertEqual([row[0] for batch in db.batches for row in batch], ['EMP001', 'EMP002'])
+
+    def test_close_is_idempotent(self):
+        db = FakeDatabase()
+        writer = self.writer(db)
+
+        writer.close()
+        writer.close()
+
+        self.assertFalse(writer.stats()['running'])
+
+
+if __name__ == '__main__':
+    unittest.main()
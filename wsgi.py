@@ -0,0 +1,50 @@
+"""
+WSGI entry point for production servers, e.g.
+
+    gunicorn -c gunicorn.conf.py
+
+Importing this module loads the Flask app without touching the database,
+so a preloading master can fork workers that share no sockets or
+threads. Each worker opens its own DatabaseManager in init_worker(),
+called from gunicorn's post_worker_init hook, and flushes and closes it in
+shutdown_worker() on exit. Servers without such hooks get the same
+initialization on the first request.
+"""
+import os
+import threading
+
+from config import Config
+
+Config.DB_DEFER_INIT = True
+
+import app as flask_app
+
+app = flask_app.app
+
+_init_lock = threading.Lock()
+_worker_pid = None
+
+def init_worker():
+    """Open the database resources for the current process, once."""
+    global _worker_pid
+    
+    with _init_lock:
+        if _worker_pid == os.getpid():
+            return
+        flask_app.init_database()
+        _worker_pid = os.getpid()
+
+def shutdown_worker():
+    """Flush queued scan logs and release this worker's connections."""
+    global _worker_pid
+    
+    with _init_lock:
+        if _worker_pid != os.getpid():
+            return
+        flask_app.close_database()
+        _worker_pid = None
+
+def application(environ, start_response):
+    if _worker_pid != os.getpid():
+        init_worker()
+    return app(environ, start_response)